@@ -1,39 +1,124 @@
 import os
 import re
+import json
+import time
+import uuid
+import hashlib
+import hmac
+import threading
+import base64
+import binascii
+import gzip
 import logging
-from datetime import datetime, timezone
-from flask import Flask, render_template, request, jsonify, session
+import logging.handlers
+import mimetypes
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from flask import (Flask, Blueprint, current_app, g, has_request_context, render_template, request, jsonify,
+                   session, stream_with_context, url_for, send_from_directory)
 from flask_sqlalchemy import SQLAlchemy
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import escape
+from sqlalchemy import event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import selectinload
 from flask_cors import CORS
 # safe_str_cmp was removed in newer Werkzeug versions, not needed for our use case
 from functools import wraps
-import requests
+import click
 from dotenv import load_dotenv
+import structured_logging
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def path_setting(name, default):
+    """
+    A file or directory path from the environment. Relative paths are taken
+    from the app directory, so the web process and the CLI scripts agree
+    whatever directory they were started from. Empty stays empty.
+    """
+    path = os.getenv(name, default)
+    return os.path.join(BASE_DIR, path) if path and not os.path.isabs(path) else path
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FILE = os.getenv('LOG_FILE', 'app.log')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')                         # text or json
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))    # rotate at this size; 0 never rotates
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))          # records waiting to be written
+LOG_REQUESTS = os.getenv('LOG_REQUESTS', 'false').lower() == 'true'  # one record per request with its timing
+
+def current_log_context():
+    """Fields added to every log record: the request ID, or '-' outside a request"""
+    return {'request_id': g.get('request_id', '-') if has_request_context() else '-'}
+
+def configure_logging():
+    """
+    Log to LOG_FILE and the console through a queue, so requests never wait
+    on a disk write. Does nothing if logging is already configured.
+    """
+    if logging.getLogger().handlers:
+        return
+    if LOG_FORMAT == 'json':
+        formatter = structured_logging.JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s',
+                                      defaults={'request_id': '-'})
+    handlers = [
+        logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    structured_logging.QueueLogging(handlers, level=LOG_LEVEL, max_queued=LOG_QUEUE_SIZE,
+                                    filters=[structured_logging.ContextFilter(current_log_context)]).start()
+    # Reduce logging verbosity
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+# Routes, request hooks and CLI commands; create_app() registers them on the app
+main = Blueprint('main', __name__, cli_group=None)
+
+# Request IDs: taken from X-Request-ID when a proxy sets one, echoed back and added to every log record
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+@main.before_app_request
+def assign_request_id():
+    incoming = request.headers.get('X-Request-ID', '')
+    g.request_id = incoming if REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+    g.request_started = time.perf_counter()
+
+@main.after_app_request
+def add_request_id_header(response):
+    g.response_status = response.status_code
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    return response
 
-# Security configuration
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
-app.config['SESSION_COOKIE_SECURE'] = os.getenv('FLASK_ENV') == 'production'
-app.config['SESSION_COOKIE_HTTPONLY'] = True
-app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+@main.teardown_app_request
+def log_request(exc):
+    """With LOG_REQUESTS, log each finished request (including streamed bodies) with its timing"""
+    if not LOG_REQUESTS or 'request_started' not in g:
+        return
+    duration_ms = round((time.perf_counter() - g.request_started) * 1000, 2)
+    status = 500 if exc is not None else g.get('response_status', 500)
+    logger.info("%s %s %s %.2f ms", request.method, request.path, status, duration_ms,
+                extra={'method': request.method, 'path': request.path, 'status': status,
+                       'duration_ms': duration_ms})
 
 # Security headers middleware
-@app.after_request
+@main.after_app_request
 def add_security_headers(response):
     """Add security headers to all responses"""
     response.headers['X-Content-Type-Options'] = 'nosniff'
@@ -43,44 +128,350 @@ def add_security_headers(response):
     response.headers['Content-Security-Policy'] = "default-src 'self'; script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://cdnjs.cloudflare.com; style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://cdnjs.cloudflare.com https://fonts.googleapis.com; img-src 'self' data:; font-src 'self' data: https://fonts.gstatic.com https://cdnjs.cloudflare.com;"
     return response
 
+# Response compression
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))          # bytes; smaller bodies go as is
+COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))                   # gzip 1-9, 0 disables compression
+COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))  # brotli 0-11
+COMPRESS_MIMETYPES = ('application/json', 'text/html')
+
+@main.after_app_request
+def compress_response(response):
+    """Compress large JSON/HTML bodies with brotli or gzip, as negotiated by Accept-Encoding"""
+    if (COMPRESS_LEVEL <= 0
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        encoding, data = 'br', brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY)
+    elif accepted['gzip']:
+        encoding, data = 'gzip', gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    # A strong ETag must differ between encodings of the same resource
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}')
+        return response.make_conditional(request)
+    return response
+
+# Request profiling: opt in with PROFILER_ENABLED, then send X-Profile-Token on the requests to profile
+import request_profiler
+
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'false').lower() == 'true'
+PROFILER_TOKEN = os.getenv('PROFILER_TOKEN', '')
+PROFILER_REPORT_DIR = path_setting('PROFILER_REPORT_DIR', os.path.join(BASE_DIR, 'instance', 'profiles'))
+PROFILER_TOP_FUNCTIONS = int(os.getenv('PROFILER_TOP_FUNCTIONS', 40))
+
+def has_admin_token():
+    """True if the request sends the admin token (PROFILER_TOKEN) in X-Profile-Token"""
+    if not PROFILER_TOKEN:
+        return False
+    token = request.headers.get('X-Profile-Token', '')
+    return hmac.compare_digest(token.encode('utf-8'), PROFILER_TOKEN.encode('utf-8'))
+
+@main.before_app_request
+def start_request_profile():
+    """Profile this request if profiling is enabled and the admin token matches"""
+    if not (PROFILER_ENABLED and has_admin_token()):
+        return
+    profile = request_profiler.RequestProfile(request.method, request.full_path.rstrip('?'))
+    if profile.start():
+        g.request_profile = profile
+    else:
+        logger.warning("Not profiling %s %s: another profiler is running", request.method, request.path)
+
+@main.after_app_request
+def tag_request_profile(response):
+    profile = g.get('request_profile')
+    if profile is not None:
+        profile.status = response.status_code
+        response.headers['X-Profile-Id'] = profile.id
+    return response
+
+@main.teardown_app_request
+def finish_request_profile(exc):
+    """Write the report once the response (including a streamed body) is done"""
+    profile = g.pop('request_profile', None)
+    if profile is None:
+        return
+    profile.stop()
+    if exc is not None:
+        profile.error = repr(exc)
+    try:
+        path = profile.write(PROFILER_REPORT_DIR, top=PROFILER_TOP_FUNCTIONS)
+    except OSError as e:
+        logger.error("Error writing request profile %s: %s", profile.id, e)
+        return
+    logger.info("Profiled %s %s: %.1f ms, %s SQL statements in %.1f ms -> %s", profile.method, profile.path,
+                profile.elapsed * 1000, len(profile.queries), profile.sql_seconds * 1000, path)
+
+# Prometheus metrics, served from /metrics
+import metrics
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+# Shared by all workers on the host (e.g. instance/metrics); empty keeps per-process metrics
+METRICS_MULTIPROC_DIR = path_setting('METRICS_MULTIPROC_DIR', '')
+METRICS_FLUSH_INTERVAL = int(os.getenv('METRICS_FLUSH_INTERVAL', 5))  # seconds
+
+metrics_registry = metrics.Registry(METRICS_MULTIPROC_DIR or None, METRICS_FLUSH_INTERVAL)
+http_requests_total = metrics_registry.counter(
+    'callrep_http_requests_total', 'HTTP requests by route, method and status', ('route', 'method', 'status'))
+http_request_duration = metrics_registry.histogram(
+    'callrep_http_request_duration_seconds', 'Time to handle a request, including streamed bodies',
+    ('route', 'method'))
+http_request_db_duration = metrics_registry.histogram(
+    'callrep_http_request_db_duration_seconds', 'Time spent executing SQL per request', ('route',))
+db_statements_total = metrics_registry.counter(
+    'callrep_db_statements_total', 'SQL statements executed by requests', ('route',))
+rate_limit_decisions_total = metrics_registry.counter(
+    'callrep_rate_limit_decisions_total', 'Rate limiter decisions (error means the limiter failed open)',
+    ('route', 'decision'))
+openrouter_request_duration = metrics_registry.histogram(
+    'callrep_openrouter_request_duration_seconds', 'OpenRouter chat completion requests (time to response headers)',
+    ('call', 'status'), buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0))
+
+# Per-thread timing of the request being handled
+metrics_state = threading.local()
+
+def metrics_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(metrics_state, 'active', False) and context is not None:
+        context._metrics_started = time.perf_counter()
+
+def metrics_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is not None and getattr(metrics_state, 'active', False):
+        metrics_state.db_seconds += time.perf_counter() - started
+        metrics_state.db_statements += 1
+
+@main.before_app_request
+def start_request_metrics():
+    if METRICS_ENABLED:
+        metrics_state.started = time.perf_counter()
+        metrics_state.status = 500
+        metrics_state.db_seconds = 0.0
+        metrics_state.db_statements = 0
+        metrics_state.active = True
+
+@main.after_app_request
+def record_response_status(response):
+    metrics_state.status = response.status_code
+    return response
+
+def metrics_route(current_request):
+    """The route label: the URL rule (e.g. /api/representatives/<zip_code>), never the raw path"""
+    return current_request.url_rule.rule if current_request.url_rule is not None else 'unmatched'
+
+@main.teardown_app_request
+def record_request_metrics(exc):
+    """Record the request once it is done, so streamed responses count their whole body"""
+    if not getattr(metrics_state, 'active', False):
+        return
+    metrics_state.active = False
+    elapsed = time.perf_counter() - metrics_state.started
+    # Resolve the request proxy once; each proxied attribute lookup costs more than a metric update
+    current_request = request._get_current_object()
+    route = metrics_route(current_request)
+    method = current_request.method
+    status = 500 if exc is not None else metrics_state.status
+    http_requests_total.inc(route, method, str(status))
+    http_request_duration.observe(elapsed, route, method)
+    http_request_db_duration.observe(metrics_state.db_seconds, route)
+    if metrics_state.db_statements:
+        db_statements_total.inc(route, amount=metrics_state.db_statements)
+    metrics_registry.ensure_flusher()
+
 # CORS configuration
-CORS(app, origins=os.getenv('ALLOWED_ORIGINS', 'http://localhost:8080').split(','))
+ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', 'http://localhost:8080').split(',')
 
 # Database configuration
-import os.path
-db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'rep_contacts.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', f'sqlite:///{db_path}')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+db_path = os.path.join(BASE_DIR, 'instance', 'rep_contacts.db')
+DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{db_path}')
+
+# Engine profile: pool sized for threaded workers plus the script job pool
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+# SQLite pragmas applied to every new connection. WAL lets readers run while
+# a write is in flight; NORMAL sync is durable across app crashes in WAL mode.
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))          # milliseconds
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))   # bytes
+SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64000))            # negative = KiB
+
+def database_engine_options(uri):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database URL"""
+    url = make_url(uri)
+    if url.get_backend_name() != 'sqlite':
+        return {'pool_size': DB_POOL_SIZE, 'max_overflow': DB_MAX_OVERFLOW, 'pool_timeout': DB_POOL_TIMEOUT,
+                'pool_pre_ping': True, 'pool_recycle': DB_POOL_RECYCLE}
+    if url.database in (None, '', ':memory:'):
+        # In-memory databases live on a single connection; keep SQLAlchemy's default pool
+        return {}
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        # Pooled connections are handed between request and job threads
+        'connect_args': {'check_same_thread': False, 'timeout': SQLITE_BUSY_TIMEOUT / 1000}
+    }
 
-db = SQLAlchemy(app)
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLite engine profile to a new DBAPI connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f'PRAGMA journal_mode={SQLITE_JOURNAL_MODE}')
+    cursor.execute(f'PRAGMA synchronous={SQLITE_SYNCHRONOUS}')
+    cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}')
+    cursor.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+    cursor.execute(f'PRAGMA cache_size={SQLITE_CACHE_SIZE}')
+    cursor.close()
+
+db = SQLAlchemy()
 
 # Rate limiting
-from collections import defaultdict
-import time
+import math
+from rate_limiter import create_rate_limiter
+
+RATE_LIMIT_REQUESTS = int(os.getenv('RATE_LIMIT_REQUESTS', 100))  # requests per window
+RATE_LIMIT_WINDOW = int(os.getenv('RATE_LIMIT_WINDOW', 3600))     # 1 hour window
+# 'sqlite' shares counters across all workers on the host, 'memory' is per-process
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'sqlite')
+RATE_LIMIT_STORAGE = path_setting(
+    'RATE_LIMIT_STORAGE',
+    os.path.join(BASE_DIR, 'instance', 'rate_limit.db')
+)
+rate_limiter = None
+rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """The configured limiter backend, opened on first use"""
+    global rate_limiter
+    if rate_limiter is None:
+        with rate_limiter_lock:
+            if rate_limiter is None:
+                try:
+                    rate_limiter = create_rate_limiter(RATE_LIMIT_BACKEND, RATE_LIMIT_STORAGE)
+                except Exception as e:
+                    logger.warning("Rate limiter backend '%s' unavailable, using in-memory limiter: %s",
+                                   RATE_LIMIT_BACKEND, e)
+                    rate_limiter = create_rate_limiter('memory')
+    return rate_limiter
+
+def rate_limit(f=None, limit=None, window=None):
+    """
+    Limit requests per client IP. Use as @rate_limit for the global limit or
+    @rate_limit(limit=..., window=...) for a per-route limit. Each route keeps
+    its own counters.
+    """
+    def decorator(func):
+        @wraps(func)
+        def decorated_function(*args, **kwargs):
+            route_limit = limit if limit is not None else RATE_LIMIT_REQUESTS
+            route_window = window if window is not None else RATE_LIMIT_WINDOW
+            key = f"{func.__name__}:{request.remote_addr}"
 
-request_counts = defaultdict(list)
-RATE_LIMIT_REQUESTS = 100  # requests per window
-RATE_LIMIT_WINDOW = 3600   # 1 hour window
+            try:
+                allowed, remaining, retry_after = get_rate_limiter().hit(key, route_limit, route_window)
+                decision = 'allowed' if allowed else 'rejected'
+            except Exception as e:
+                # Never fail a request because the limiter store is busy
+                logger.error("Rate limiter error for %s: %s", key, e)
+                allowed = True
+                decision = 'error'
+            if METRICS_ENABLED:
+                # Same route label as the request metrics, so the two can be joined
+                rate_limit_decisions_total.inc(metrics_route(request), decision)
+            if not allowed:
+                response = jsonify({'error': 'Rate limit exceeded'})
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response, 429
+
+            return func(*args, **kwargs)
+        return decorated_function
+
+    if f is not None:
+        return decorator(f)
+    return decorator
+
+# Representative lookup cache
+from response_cache import ResponseCache
+
+representatives_cache = ResponseCache(
+    max_entries=int(os.getenv('REP_CACHE_MAX_ENTRIES', 4096)),
+    ttl=int(os.getenv('REP_CACHE_TTL', 300)),
+    # Shared by every worker on the host so an edit in one worker is seen by the others' next read.
+    # Set to an empty string to cache per process only, which is safe with a single worker
+    shared_path=path_setting('REP_CACHE_SHARED_PATH', os.path.join(BASE_DIR, 'instance', 'response_cache.db')) or None
+)
 
-def rate_limit(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        client_ip = request.remote_addr
-        now = time.time()
-        
-        # Clean old requests
-        request_counts[client_ip] = [req_time for req_time in request_counts[client_ip] 
-                                   if now - req_time < RATE_LIMIT_WINDOW]
-        
-        # Check rate limit
-        if len(request_counts[client_ip]) >= RATE_LIMIT_REQUESTS:
-            return jsonify({'error': 'Rate limit exceeded'}), 429
-        
-        # Add current request
-        request_counts[client_ip].append(now)
-        
-        return f(*args, **kwargs)
-    return decorated_function
+def invalidate_representatives_cache(zip_code=None):
+    """Drop the cached lookup for a zip code, or every zip code when none is given"""
+    try:
+        if zip_code is None:
+            representatives_cache.clear()
+        else:
+            representatives_cache.invalidate(zip_code)
+    except Exception as e:
+        logger.error("Error invalidating representatives cache for %s: %s", zip_code, e)
+
+# Suggestion lookup index (mmap'd file shared by every worker; empty path disables it)
+import zip_index
+
+SUGGESTION_INDEX_PATH = path_setting(
+    'SUGGESTION_INDEX_PATH',
+    os.path.join(BASE_DIR, 'instance', 'suggestion_index.bin')
+)
+suggestion_index = None
+suggestion_index_lock = threading.Lock()
+
+def get_suggestion_index():
+    """The current suggestion index, reopened after a rebuild; None until one is built"""
+    global suggestion_index
+    if not SUGGESTION_INDEX_PATH:
+        return None
+    try:
+        stat = os.stat(SUGGESTION_INDEX_PATH)
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with suggestion_index_lock:
+        if suggestion_index is None or suggestion_index.signature != signature:
+            try:
+                suggestion_index = zip_index.ZipIndex(SUGGESTION_INDEX_PATH)
+            except (OSError, ValueError) as e:
+                logger.error("Error opening suggestion index %s: %s", SUGGESTION_INDEX_PATH, e)
+                return None
+        return suggestion_index
+
+def rebuild_suggestion_index():
+    """Rebuild the suggestion index from the suggestion tables. Returns its stats"""
+    if not SUGGESTION_INDEX_PATH:
+        raise ValueError("SUGGESTION_INDEX_PATH is not set")
+    suggestions = (RepresentativeSuggestion.query
+                   .options(selectinload(RepresentativeSuggestion.phone_numbers))
+                   .order_by(RepresentativeSuggestion.id)
+                   .yield_per(2000))
+    start = time.perf_counter()
+    written, skipped = zip_index.build(SUGGESTION_INDEX_PATH, (s.to_dict() for s in suggestions))
+    logger.info("Rebuilt suggestion index: %s suggestions (%s skipped) in %.2fs",
+                written, skipped, time.perf_counter() - start)
+    return get_suggestion_index().stats()
+
+def suggestion_zip_candidates(zip_code):
+    """Zip codes to search for suggestions: a ZIP+4 falls back to its 5-digit code"""
+    return [zip_code, zip_code[:5]] if len(zip_code) > 5 else [zip_code]
 
 # Input validation functions
 def validate_zip_code(zip_code):
@@ -146,19 +537,58 @@ GOOGLE_CIVIC_API_KEY = os.getenv('GOOGLE_CIVIC_API_KEY')
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
 
 # OpenRouter API Configuration - DeepSeek V3 (FREE TIER ONLY)
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+# OPENROUTER_BASE_URL can point at a local stub server for testing
+OPENROUTER_BASE_URL = os.getenv('OPENROUTER_BASE_URL', "https://openrouter.ai/api/v1")
 DEEPSEEK_FREE_MODEL = "deepseek/deepseek-chat-v3-0324:free"
-
-app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///rep_contacts.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['TEMPLATES_AUTO_RELOAD'] = True
-app.jinja_env.cache = {}
-
-# Reduce logging verbosity
-import logging
-log = logging.getLogger('werkzeug')
-log.setLevel(logging.ERROR)
+OPENROUTER_TIMEOUT = 30
+
+openrouter_session = None
+openrouter_session_lock = threading.Lock()
+
+def get_openrouter_session():
+    """Pooled keep-alive connections to OpenRouter, shared by all threads"""
+    global openrouter_session
+    if openrouter_session is None:
+        with openrouter_session_lock:
+            if openrouter_session is None:
+                # requests is only imported once a script is actually generated
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                http = requests.Session()
+                http.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=32))
+                http.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=32))
+                openrouter_session = http
+    return openrouter_session
+
+# Script generation runs on a local worker pool, never on the request thread
+SCRIPT_JOB_WORKERS = int(os.getenv('SCRIPT_JOB_WORKERS', 4))
+SCRIPT_JOB_TIMEOUT = int(os.getenv('SCRIPT_JOB_TIMEOUT', 180))  # seconds before a pending job is abandoned
+SCRIPT_JOB_RETENTION = timedelta(days=1)
+SCRIPT_JOB_PENDING = ('queued', 'running')  # a job in these states has no outcome yet
+# The streaming endpoint holds its request for the whole completion, so the page only uses it
+# when workers can serve other requests meanwhile (gunicorn --worker-class gthread or gevent)
+SCRIPT_STREAMING_ENABLED = os.getenv('SCRIPT_STREAMING_ENABLED', 'false').lower() == 'true'
+script_job_executor = ThreadPoolExecutor(max_workers=SCRIPT_JOB_WORKERS, thread_name_prefix='script-job')
+# Script and title completions are requested concurrently
+openrouter_executor = ThreadPoolExecutor(max_workers=SCRIPT_JOB_WORKERS * 2, thread_name_prefix='openrouter')
+
+# Generated scripts are cached by normalized notes. Bump the prompt version
+# whenever the prompts in generate_ai_script change so old scripts are not reused.
+SCRIPT_PROMPT_VERSION = 'v1'
+SCRIPT_CACHE_MAX_ENTRIES = int(os.getenv('SCRIPT_CACHE_MAX_ENTRIES', 5000))
+SCRIPT_CACHE_TTL = timedelta(seconds=int(os.getenv('SCRIPT_CACHE_TTL', 7 * 24 * 3600)))
+script_cache_counters = {'hits': 0, 'misses': 0, 'saved_upstream_seconds': 0.0}
+script_cache_lock = threading.Lock()
+
+# Templates reload from disk while developing. In production they are loaded
+# once, compiled bytecode is kept on disk across restarts, and the index
+# page is rendered once per process.
+TEMPLATE_DEV_MODE = os.getenv('FLASK_ENV') == 'development'
+JINJA_BYTECODE_CACHE_DIR = path_setting(
+    'JINJA_BYTECODE_CACHE_DIR',
+    os.path.join(BASE_DIR, 'instance', 'jinja_cache')
+)
 
 # Database Models
 class Representative(db.Model):
@@ -171,8 +601,22 @@ class Representative(db.Model):
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     deleted_at = db.Column(db.DateTime, nullable=True)  # Soft delete
     
+    __table_args__ = (
+        # Lookups by zip only ever read live rows
+        db.Index('ix_representative_zip_code_live', zip_code,
+                 sqlite_where=deleted_at.is_(None), postgresql_where=deleted_at.is_(None)),
+    )
+    
     # Relationship to phone numbers
     phone_numbers = db.relationship('RepresentativePhone', backref='representative', cascade='all, delete-orphan')
+    # Live phones only, filtered in SQL. Read paths load this with selectinload()
+    live_phone_numbers = db.relationship(
+        'RepresentativePhone',
+        primaryjoin='and_(Representative.id == RepresentativePhone.representative_id, '
+                    'RepresentativePhone.deleted_at.is_(None))',
+        order_by='RepresentativePhone.id',
+        viewonly=True
+    )
     
     def to_dict(self):
         return {
@@ -184,7 +628,7 @@ class Representative(db.Model):
             'position': self.position,
             'custom_position': self.custom_position,
             'display_position': self.custom_position if self.custom_position else self.position,
-            'phone_numbers': [phone.to_dict() for phone in self.phone_numbers if not phone.deleted_at],
+            'phone_numbers': [phone.to_dict() for phone in self.live_phone_numbers],
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
@@ -197,6 +641,12 @@ class RepresentativePhone(db.Model):
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     deleted_at = db.Column(db.DateTime, nullable=True)  # Soft delete
     
+    __table_args__ = (
+        db.Index('ix_representative_phone_representative_id', representative_id),
+        db.Index('ix_representative_phone_representative_id_live', representative_id,
+                 sqlite_where=deleted_at.is_(None), postgresql_where=deleted_at.is_(None)),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -220,8 +670,13 @@ class RepresentativeSuggestion(db.Model):
     source = db.Column(db.String(50), nullable=False)  # 'congress_gov', 'google_civic', etc.
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     
+    __table_args__ = (
+        db.Index('ix_representative_suggestion_zip_code', zip_code),
+    )
+    
     # Relationship to phone numbers
-    phone_numbers = db.relationship('RepresentativeSuggestionPhone', backref='representative_suggestion', cascade='all, delete-orphan')
+    phone_numbers = db.relationship('RepresentativeSuggestionPhone', backref='representative_suggestion',
+                                    cascade='all, delete-orphan', order_by='RepresentativeSuggestionPhone.id')
     
     def to_dict(self):
         return {
@@ -247,6 +702,10 @@ class RepresentativeSuggestionPhone(db.Model):
     phone_type = db.Column(db.String(50), nullable=False, default='Main')
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     
+    __table_args__ = (
+        db.Index('ix_representative_suggestion_phone_suggestion_id', representative_suggestion_id),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -297,6 +756,15 @@ class CallLog(db.Model):
     session_id = db.Column(db.String(100))  # To group calls from same session
     is_test_data = db.Column(db.Boolean, default=False)  # Flag for test/dummy data
     
+    __table_args__ = (
+        # History, stats and exports filter by user and date range
+        db.Index('ix_call_log_user_id_call_datetime', user_id, call_datetime),
+        db.Index('ix_call_log_user_id_call_outcome_call_datetime', user_id, call_outcome, call_datetime),
+        # Same range scans with test data excluded (include_test_data=false)
+        db.Index('ix_call_log_user_id_call_datetime_real', user_id, call_datetime,
+                 sqlite_where=is_test_data == False, postgresql_where=is_test_data == False),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -314,12 +782,188 @@ class CallLog(db.Model):
             'is_test_data': self.is_test_data
         }
 
+class CallLogDailyRollup(db.Model):
+    """
+    Call counts per user, day and (outcome, representative, script), kept up
+    to date by the call log endpoints so stats never have to scan call_log.
+    `day` is the calendar date of call_datetime as stored.
+    """
+    # Clustered on the key, so a user's date range is one contiguous read on SQLite
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    user_id = db.Column(db.String(100), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    is_test_data = db.Column(db.Boolean, primary_key=True)
+    call_outcome = db.Column(db.String(50), primary_key=True)
+    representative_name = db.Column(db.String(200), primary_key=True)
+    script_title = db.Column(db.String(200), primary_key=True)  # '' when no script was used
+    call_count = db.Column(db.Integer, nullable=False, default=0)
+
+class RollupState(db.Model):
+    """Marks a rollup table as complete: backfilled from the raw rows and maintained since"""
+    name = db.Column(db.String(50), primary_key=True)
+    built_at = db.Column(db.DateTime, nullable=False)
+
+class ScriptGenerationJob(db.Model):
+    """Queued AI script generation request, shared by all workers through the database"""
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    status = db.Column(db.String(20), nullable=False, default='queued')  # 'queued', 'running', 'done', 'failed'
+    notes = db.Column(db.Text, nullable=False)
+    result = db.Column(db.Text)  # JSON payload returned once the job has finished
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        db.Index('ix_script_generation_job_created_at', created_at),
+    )
+    
+    def to_dict(self):
+        payload = json.loads(self.result) if self.result else {'success': True}
+        payload.update({
+            'job_id': self.id,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        })
+        return payload
+
+class GeneratedScriptCache(db.Model):
+    """Persistent cache of AI-generated scripts keyed by normalized notes, model and prompt version"""
+    key = db.Column(db.String(64), primary_key=True)  # sha256 hex
+    normalized_notes = db.Column(db.Text, nullable=False)
+    model = db.Column(db.String(100), nullable=False)
+    prompt_version = db.Column(db.String(20), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    generation_seconds = db.Column(db.Float, nullable=False, default=0.0)  # upstream latency of the original call
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_used_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    
+    __table_args__ = (
+        # LRU eviction and TTL expiry scan by recency
+        db.Index('ix_generated_script_cache_last_used_at', last_used_at),
+    )
+
+# Full-text search over call notes and scripts (SQLite FTS5). Each FTS table
+# indexes its source table's text columns without storing a copy of them
+# (external content), and triggers keep it in step with every insert, update
+# and delete, including bulk Core statements.
+SEARCH_INDEXES = {
+    'call_log_fts': ('call_log', ('call_notes',)),
+    'call_script_fts': ('call_script', ('title', 'content')),
+}
+
+def search_index_ddl(fts_table, table, columns):
+    column_list = ', '.join(columns)
+    insert_new = (f"INSERT INTO {fts_table}(rowid, {column_list}) "
+                  f"VALUES (new.id, {', '.join(f'new.{column}' for column in columns)});")
+    delete_old = (f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+                  f"VALUES ('delete', old.id, {', '.join(f'old.{column}' for column in columns)});")
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5({column_list}, content='{table}', "
+        f"content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {column_list} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+@event.listens_for(db.metadata, 'after_create')
+def create_search_indexes(target, connection, **kw):
+    """Add any missing FTS tables and triggers on create_all(), indexing rows that already exist"""
+    if connection.dialect.name != 'sqlite':
+        return
+    for fts_table, (table, columns) in SEARCH_INDEXES.items():
+        existed = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)).first()
+        for statement in search_index_ddl(fts_table, table, columns):
+            connection.exec_driver_sql(statement)
+        if not existed:
+            connection.exec_driver_sql(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+# Fingerprinted static assets built by build_assets.py
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+ASSET_DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+ASSET_MAX_AGE = 365 * 24 * 3600
+# Preferred first when the client accepts several
+ASSET_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+def load_asset_manifest():
+    """Source path -> built path for every built asset that is newer than its source"""
+    try:
+        with open(os.path.join(ASSET_DIST_DIR, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.error("Error reading asset manifest: %s", e)
+        return {}
+
+    fresh = {}
+    for source, built in manifest.items():
+        try:
+            if os.path.getmtime(os.path.join(STATIC_DIR, source)) <= \
+                    os.path.getmtime(os.path.join(ASSET_DIST_DIR, built)):
+                fresh[source] = built
+            else:
+                # Edited since the last build: serve the source rather than a stale bundle
+                logger.warning("Built asset for %s is older than its source; run build_assets.py", source)
+        except OSError:
+            continue
+    return fresh
+
+@main.app_template_global()
+def asset_url(filename):
+    """URL of a static asset, pointing at its fingerprinted build when there is one"""
+    built = current_app.extensions['asset_manifest'].get(filename)
+    if built:
+        return url_for('main.asset', filename=built)
+    try:
+        version = int(os.path.getmtime(os.path.join(STATIC_DIR, filename)))
+    except OSError:
+        version = None
+    return url_for('static', filename=filename, v=version)
+
+@main.route('/assets/<path:filename>')
+def asset(filename):
+    """Serve a fingerprinted asset, precompressed when the client accepts it"""
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in ASSET_ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(ASSET_DIST_DIR, filename + suffix)):
+            response = send_from_directory(ASSET_DIST_DIR, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(ASSET_DIST_DIR, filename, mimetype=mimetype)
+    # The name changes whenever the content does, so it never needs revalidating
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    response.vary.add('Accept-Encoding')
+    return response
+
+# (body, etag) of the rendered index page; production only
+index_page = None
+
 # Routes
-@app.route('/')
+@main.route('/')
 def index():
-    return render_template('index.html')
-
-@app.route('/health')
+    global index_page
+    settings = {'script_streaming': SCRIPT_STREAMING_ENABLED, 'script_job_timeout': SCRIPT_JOB_TIMEOUT}
+    if TEMPLATE_DEV_MODE:
+        return render_template('index.html', **settings)
+    # index.html has no per-request content, so it is rendered once and revalidated by ETag
+    if index_page is None:
+        body = render_template('index.html', **settings)
+        index_page = (body, hashlib.sha256(body.encode('utf-8')).hexdigest()[:16])
+    body, etag = index_page
+    response = current_app.response_class(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@main.route('/health')
 def health_check():
     """Health check endpoint for monitoring"""
     try:
@@ -333,14 +977,14 @@ def health_check():
             'build_date': '2024-01-15'
         }), 200
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         return jsonify({
             'status': 'unhealthy',
             'error': str(e),
             'timestamp': datetime.now(timezone.utc).isoformat()
         }), 500
 
-@app.route('/version')
+@main.route('/version')
 def version():
     """Version information endpoint"""
     return jsonify({
@@ -350,7 +994,43 @@ def version():
         'build_date': '2024-01-15'
     })
 
-@app.route('/api/representatives/<zip_code>')
+@main.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics, summed over every worker when METRICS_MULTIPROC_DIR is set"""
+    if not METRICS_ENABLED:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return current_app.response_class(metrics_registry.render(),
+                                      content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@main.route('/api/cache/stats')
+def cache_stats():
+    """Hit/miss counters for the representative lookup and generated script caches"""
+    return jsonify({
+        'representatives': representatives_cache.stats(),
+        'generated_scripts': script_cache_stats()
+    })
+
+@main.route('/api/suggestion-index/stats')
+def suggestion_index_stats():
+    """Size and memory footprint of the suggestion lookup index"""
+    index = get_suggestion_index()
+    if index is None:
+        return jsonify({'built': False, 'path': SUGGESTION_INDEX_PATH or None})
+    return jsonify({'built': True, **index.stats()})
+
+@main.route('/api/suggestion-index/rebuild', methods=['POST'])
+@rate_limit(limit=10)
+def rebuild_suggestion_index_endpoint():
+    """Rebuild the suggestion lookup index from the suggestion database (admin token required)"""
+    if not has_admin_token():
+        return jsonify({'error': 'Admin token required'}), 403
+    try:
+        return jsonify({'built': True, **rebuild_suggestion_index()})
+    except Exception as e:
+        logger.error("Error rebuilding suggestion index: %s", e)
+        return jsonify({'error': 'Error rebuilding suggestion index'}), 500
+
+@main.route('/api/representatives/<zip_code>')
 @rate_limit
 def get_representatives(zip_code):
     """Get representatives from the production database (human-validated only)"""
@@ -360,14 +1040,21 @@ def get_representatives(zip_code):
         return jsonify({'error': result}), 400
     
     try:
-        reps = Representative.query.filter_by(zip_code=result, deleted_at=None).all()
-        logger.info(f"Retrieved {len(reps)} representatives for zip code {result}")
-        return jsonify([rep.to_dict() for rep in reps])
+        body, version = representatives_cache.lookup(result)
+        if body is None:
+            reps = (Representative.query
+                    .options(selectinload(Representative.live_phone_numbers))
+                    .filter_by(zip_code=result, deleted_at=None)
+                    .all())
+            logger.info("Retrieved %s representatives for zip code %s", len(reps), result)
+            body = current_app.json.dumps([rep.to_dict() for rep in reps])
+            representatives_cache.set(result, body, version)
+        return current_app.response_class(f"{body}\n", mimetype=current_app.json.mimetype)
     except Exception as e:
-        logger.error(f"Error retrieving representatives for zip {result}: {e}")
+        logger.error("Error retrieving representatives for zip %s: %s", result, e)
         return jsonify({'error': 'Error retrieving representatives'}), 500
 
-@app.route('/api/representatives/<zip_code>/suggestions', methods=['POST'])
+@main.route('/api/representatives/<zip_code>/suggestions', methods=['POST'])
 @rate_limit
 def get_representative_suggestions(zip_code):
     """
@@ -381,32 +1068,44 @@ def get_representative_suggestions(zip_code):
     
     try:
         # Check if representatives already exist for this zip code in production DB
-        existing_reps = Representative.query.filter_by(zip_code=result, deleted_at=None).all()
-        if existing_reps:
+        existing_rep = Representative.query.filter_by(zip_code=result, deleted_at=None).first()
+        if existing_rep:
             return jsonify({'error': 'Representatives already exist for this zip code'}), 400
         
-        # Get suggestions from suggestion database
-        suggestions = RepresentativeSuggestion.query.filter_by(zip_code=result).all()
+        # Get suggestions from the lookup index, or the suggestion database until one is built
+        index = get_suggestion_index()
+        if index is not None:
+            suggestions = index.lookup(result)
+        else:
+            candidates = suggestion_zip_candidates(result)
+            rows = (RepresentativeSuggestion.query
+                    .options(selectinload(RepresentativeSuggestion.phone_numbers))
+                    .filter(RepresentativeSuggestion.zip_code.in_(candidates))
+                    .order_by(RepresentativeSuggestion.id)
+                    .all())
+            # Prefer an exact ZIP+4 match over the 5-digit fallback
+            matched = next((zip_code for zip_code in candidates if any(r.zip_code == zip_code for r in rows)), None)
+            suggestions = [row.to_dict() for row in rows if row.zip_code == matched]
         
         if suggestions:
-            logger.info(f"Found {len(suggestions)} suggestions for zip code {result}")
+            logger.info("Found %s suggestions for zip code %s", len(suggestions), result)
             return jsonify({
                 'success': True,
-                'suggested_representatives': [suggestion.to_dict() for suggestion in suggestions],
+                'suggested_representatives': suggestions,
                 'message': f'Found {len(suggestions)} suggested representatives for your area'
             })
         else:
-            logger.info(f"No suggestions found for zip code {result}")
+            logger.info("No suggestions found for zip code %s", result)
             return jsonify({
                 'success': False,
                 'message': 'No suggestions available for this zip code. Please add representatives manually.'
             })
             
     except Exception as e:
-        logger.error(f"Error getting suggestions for zip {result}: {e}")
+        logger.error("Error getting suggestions for zip %s: %s", result, e)
         return jsonify({'error': 'Error getting suggestions'}), 500
 
-@app.route('/api/representatives/<zip_code>/accept-suggestions', methods=['POST'])
+@main.route('/api/representatives/<zip_code>/accept-suggestions', methods=['POST'])
 @rate_limit
 def accept_suggested_representatives(zip_code):
     """
@@ -433,51 +1132,81 @@ def accept_suggested_representatives(zip_code):
         except (ValueError, TypeError):
             return jsonify({'error': 'Invalid suggestion IDs'}), 400
         
-        added_reps = []
+        # One IN query for the selected suggestions (plus one for their phones)
+        suggestions_by_id = {
+            suggestion.id: suggestion
+            for suggestion in RepresentativeSuggestion.query
+            .options(selectinload(RepresentativeSuggestion.phone_numbers))
+            .filter(RepresentativeSuggestion.id.in_(accepted_suggestion_ids),
+                    RepresentativeSuggestion.zip_code.in_(suggestion_zip_candidates(result)))
+        }
+        suggestions = [suggestions_by_id[sid] for sid in dict.fromkeys(accepted_suggestion_ids)
+                       if sid in suggestions_by_id]
+        
+        # One existence check covering every candidate name/position
+        existing_keys = set()
+        if suggestions:
+            candidate_keys = {(s.first_name, s.last_name, s.position) for s in suggestions}
+            existing_keys = set(
+                db.session.query(Representative.first_name, Representative.last_name, Representative.position)
+                .filter(Representative.zip_code == result,
+                        Representative.deleted_at.is_(None),
+                        db.tuple_(Representative.first_name, Representative.last_name,
+                                  Representative.position).in_(candidate_keys))
+                .all()
+            )
+        
+        to_add = []
         skipped_reps = []
+        for suggestion in suggestions:
+            key = (suggestion.first_name, suggestion.last_name, suggestion.position)
+            if key in existing_keys:
+                # Representative already exists, skip it
+                skipped_reps.append(f"{suggestion.first_name} {suggestion.last_name}")
+                continue
+            existing_keys.add(key)
+            to_add.append(suggestion)
         
-        for suggestion_id in accepted_suggestion_ids:
-            suggestion = RepresentativeSuggestion.query.get(suggestion_id)
-            if suggestion and suggestion.zip_code == result:
-                # Check if this specific representative already exists
-                existing_rep = Representative.query.filter_by(
-                    zip_code=result,
-                    first_name=suggestion.first_name,
-                    last_name=suggestion.last_name,
-                    position=suggestion.position,
-                    deleted_at=None
-                ).first()
-                
-                if existing_rep:
-                    # Representative already exists, skip it
-                    skipped_reps.append(f"{suggestion.first_name} {suggestion.last_name}")
-                    continue
-                
-                # Create representative in production database
-                new_rep = Representative(
-                    zip_code=result,
-                    first_name=suggestion.first_name,
-                    last_name=suggestion.last_name,
-                    position=suggestion.position,
-                    custom_position=None
-                )
-                db.session.add(new_rep)
-                db.session.flush()  # Get the ID
-                
-                # Add phone numbers
-                for phone_suggestion in suggestion.phone_numbers:
-                    phone_obj = RepresentativePhone(
-                        representative_id=new_rep.id,
-                        phone=phone_suggestion.phone,
-                        extension=phone_suggestion.extension,
-                        phone_type=phone_suggestion.phone_type
-                    )
-                    db.session.add(phone_obj)
-                
-                added_reps.append(new_rep.to_dict())
+        added_reps = []
+        if to_add:
+            # Bulk insert representatives, then all of their phones. Names are
+            # unique within to_add, so returned ids are matched back by name.
+            inserted = db.session.execute(
+                insert(Representative).returning(Representative.id, Representative.first_name,
+                                                 Representative.last_name, Representative.position),
+                [{
+                    'zip_code': result,
+                    'first_name': suggestion.first_name,
+                    'last_name': suggestion.last_name,
+                    'position': suggestion.position,
+                    'custom_position': None
+                } for suggestion in to_add]
+            ).all()
+            ids_by_key = {(row.first_name, row.last_name, row.position): row.id for row in inserted}
+            new_rep_ids = [ids_by_key[(s.first_name, s.last_name, s.position)] for s in to_add]
+            
+            phone_rows = [{
+                'representative_id': rep_id,
+                'phone': phone_suggestion.phone,
+                'extension': phone_suggestion.extension,
+                'phone_type': phone_suggestion.phone_type
+            } for rep_id, suggestion in zip(new_rep_ids, to_add) for phone_suggestion in suggestion.phone_numbers]
+            if phone_rows:
+                db.session.execute(insert(RepresentativePhone), phone_rows)
         
         db.session.commit()
-        logger.info(f"Added {len(added_reps)} representatives for zip {result}, skipped {len(skipped_reps)}")
+        invalidate_representatives_cache(result)
+        logger.info("Added %s representatives for zip %s, skipped %s", len(to_add), result, len(skipped_reps))
+        
+        # Serialize the new representatives with their phones in one extra query
+        if to_add:
+            reps_by_id = {
+                rep.id: rep
+                for rep in Representative.query
+                .options(selectinload(Representative.live_phone_numbers))
+                .filter(Representative.id.in_(new_rep_ids))
+            }
+            added_reps = [reps_by_id[rep_id].to_dict() for rep_id in new_rep_ids]
         
         message = f'Successfully added {len(added_reps)} representatives'
         if skipped_reps:
@@ -490,11 +1219,11 @@ def accept_suggested_representatives(zip_code):
         })
         
     except Exception as e:
-        logger.error(f"Error accepting suggestions for zip {result}: {e}")
+        logger.error("Error accepting suggestions for zip %s: %s", result, e)
         db.session.rollback()
         return jsonify({'error': 'Error adding representatives'}), 500
 
-@app.route('/api/representatives', methods=['POST'])
+@main.route('/api/representatives', methods=['POST'])
 @rate_limit
 def add_representative():
     try:
@@ -585,22 +1314,62 @@ def add_representative():
                     db.session.add(phone_obj)
         
         db.session.commit()
-        logger.info(f"Added representative {first_name} {last_name} for zip {zip_result}")
+        invalidate_representatives_cache(zip_result)
+        logger.info("Added representative %s %s for zip %s", first_name, last_name, zip_result)
         return jsonify({'success': True, 'representative': new_rep.to_dict()}), 201
         
     except Exception as e:
-        logger.error(f"Error adding representative: {e}")
+        logger.error("Error adding representative: %s", e)
         db.session.rollback()
         return jsonify({'error': 'Error adding representative'}), 500
 
-@app.route('/api/representatives/<int:rep_id>', methods=['DELETE'])
+# Rows soft-deleted per transaction by bulk deletes, so no single write holds the database lock for long
+SOFT_DELETE_CHUNK_SIZE = int(os.getenv('SOFT_DELETE_CHUNK_SIZE', 5000))
+
+def soft_delete_representatives(*filters, chunk_size=None, dry_run=False):
+    """
+    Soft-delete the live representatives matching filters and their live
+    phones with set-based UPDATEs, committing every chunk_size representatives
+    (in id order). Returns (representatives, phones) deleted, or that would be
+    with dry_run.
+    """
+    chunk_size = chunk_size or SOFT_DELETE_CHUNK_SIZE
+    def live_reps():
+        return Representative.query.filter(Representative.deleted_at.is_(None), *filters)
+
+    def live_phones(reps):
+        return RepresentativePhone.query.filter(
+            RepresentativePhone.deleted_at.is_(None),
+            RepresentativePhone.representative_id.in_(reps.with_entities(Representative.id).scalar_subquery()))
+
+    if dry_run:
+        return live_reps().count(), live_phones(live_reps()).count()
+
+    deleted_reps = deleted_phones = 0
+    boundary = None
+    while True:
+        # Continue after the previous chunk rather than skipping over the rows it just deleted
+        remaining = live_reps() if boundary is None else live_reps().filter(Representative.id > boundary)
+        # Upper id bound of this chunk; None once fewer than chunk_size rows are left
+        boundary = (remaining.with_entities(Representative.id)
+                    .order_by(Representative.id).offset(chunk_size - 1).limit(1).scalar())
+        chunk = remaining if boundary is None else remaining.filter(Representative.id <= boundary)
+        now = datetime.now(timezone.utc)
+        # Phones first: their subquery selects representatives that are still live
+        deleted_phones += live_phones(chunk).update({'deleted_at': now}, synchronize_session=False)
+        deleted_reps += chunk.update({'deleted_at': now}, synchronize_session=False)
+        db.session.commit()
+        if boundary is None:
+            return deleted_reps, deleted_phones
+
+@main.route('/api/representatives/<int:rep_id>', methods=['DELETE'])
 def delete_representative(rep_id):
     rep = Representative.query.get_or_404(rep_id)
-    rep.deleted_at = datetime.now(timezone.utc)
-    db.session.commit()
+    soft_delete_representatives(Representative.id == rep.id)
+    invalidate_representatives_cache(rep.zip_code)
     return '', 204
 
-@app.route('/api/representatives/<int:rep_id>/phones', methods=['POST'])
+@main.route('/api/representatives/<int:rep_id>/phones', methods=['POST'])
 def add_phone_to_representative(rep_id):
     rep = Representative.query.filter_by(id=rep_id, deleted_at=None).first_or_404()
     data = request.json
@@ -623,25 +1392,27 @@ def add_phone_to_representative(rep_id):
     )
     db.session.add(phone_obj)
     db.session.commit()
+    invalidate_representatives_cache(rep.zip_code)
     return jsonify(phone_obj.to_dict()), 201
 
-@app.route('/api/representatives/<int:rep_id>/phones/<int:phone_id>', methods=['DELETE'])
+@main.route('/api/representatives/<int:rep_id>/phones/<int:phone_id>', methods=['DELETE'])
 def delete_phone_number(rep_id, phone_id):
     phone = RepresentativePhone.query.filter_by(id=phone_id, representative_id=rep_id, deleted_at=None).first_or_404()
     phone.deleted_at = datetime.now(timezone.utc)
     db.session.commit()
+    invalidate_representatives_cache(phone.representative.zip_code)
     return '', 204
 
-@app.route('/api/scripts')
+@main.route('/api/scripts')
 def get_scripts():
     try:
         scripts = CallScript.query.order_by(CallScript.created_at.desc()).all()
         return jsonify([script.to_dict() for script in scripts])
     except Exception as e:
-        logger.error(f"Error getting scripts: {e}")
+        logger.error("Error getting scripts: %s", e)
         return jsonify({'error': 'Error retrieving scripts'}), 500
 
-@app.route('/api/scripts', methods=['POST'])
+@main.route('/api/scripts', methods=['POST'])
 def add_script():
     data = request.json
     new_script = CallScript(
@@ -652,12 +1423,12 @@ def add_script():
     db.session.commit()
     return jsonify(new_script.to_dict()), 201
 
-@app.route('/api/scripts/<int:script_id>', methods=['GET'])
+@main.route('/api/scripts/<int:script_id>', methods=['GET'])
 def get_script(script_id):
     script = CallScript.query.get_or_404(script_id)
     return jsonify(script.to_dict())
 
-@app.route('/api/scripts/<int:script_id>', methods=['PUT'])
+@main.route('/api/scripts/<int:script_id>', methods=['PUT'])
 def update_script(script_id):
     script = CallScript.query.get_or_404(script_id)
     data = request.get_json()
@@ -669,40 +1440,114 @@ def update_script(script_id):
     db.session.commit()
     return jsonify({'success': True, 'script': script.to_dict()})
 
-@app.route('/api/scripts/<int:script_id>', methods=['DELETE'])
+@main.route('/api/scripts/<int:script_id>', methods=['DELETE'])
 def delete_script(script_id):
     script = CallScript.query.get_or_404(script_id)
     db.session.delete(script)
     db.session.commit()
     return '', 204
 
-@app.route('/api/generate-script', methods=['POST'])
-def generate_script():
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+SEARCH_SNIPPET_TOKENS = 16
+# Match markers for snippet()/highlight(). Control characters survive HTML escaping of the
+# user's text, so the snippet is escaped first and the markers become <mark> tags afterwards
+HIGHLIGHT_START, HIGHLIGHT_END = '\x02', '\x03'
+
+def fts_match_query(text):
+    """FTS5 query matching rows that contain every word of text, or None when text has no words"""
+    # Quoting each word keeps FTS5 operators and punctuation in user input from being parsed
+    words = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{word}"' for word in words) or None
+
+def highlight_html(text):
+    """HTML-escape a snippet and wrap its matches in <mark>"""
+    if text is None:
+        return None
+    return str(escape(text)).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+def search_args():
+    """(match query, page, page size) from the request, or raise ValueError with the message for a 400"""
+    match = fts_match_query(request.args.get('q'))
+    if match is None:
+        raise ValueError('Missing search query')
     try:
-        data = request.get_json()
-        user_notes = data.get('notes', '')
-        
-        if not user_notes.strip():
-            return jsonify({'error': 'Please provide some notes about what you want to discuss'}), 400
-        
-        # Check if we're running locally (for development/demo)
-        is_localhost = request.headers.get('Host', '').startswith('localhost') or request.headers.get('Host', '').startswith('127.0.0.1')
-        
-        if is_localhost:
-            # Local development - use actual AI generation
-            try:
-                generated_result = generate_ai_script(user_notes)
-                return jsonify({
-                    'script': generated_result['content'],
-                    'title': generated_result['title'],
-                    'success': True,
-                    'note': 'Generated using DeepSeek V3 (FREE TIER) via OpenRouter',
-                    'mode': 'local'
-                })
-            except Exception as e:
-                logger.warning(f"AI generation failed, using external tool approach: {str(e)}")
-                # Use external AI tool approach (same as production) when API fails
-                prompt_text = f"""You are a helpful assistant that creates phone call scripts for constituents calling their representatives.
+        page = int(request.args.get('page', 1))
+        page_size = int(request.args.get('limit', SEARCH_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('Invalid page or limit') from None
+    if page < 1:
+        raise ValueError('Invalid page or limit')
+    return match, page, max(1, min(page_size, SEARCH_MAX_PAGE_SIZE))
+
+class SearchIndexMissing(Exception):
+    """The FTS tables have not been created in this database yet"""
+
+def run_search(query, page, page_size):
+    """One page of (row, ...) results plus whether another page follows"""
+    try:
+        rows = query.limit(page_size + 1).offset((page - 1) * page_size).all()
+    except OperationalError as e:
+        if 'no such table' not in str(e.orig):
+            raise
+        db.session.rollback()
+        raise SearchIndexMissing(str(e.orig)) from e
+    return rows[:page_size], len(rows) > page_size
+
+def search_unavailable():
+    if db.session.get_bind().dialect.name != 'sqlite':
+        return jsonify({'error': 'Search requires the SQLite FTS5 index'}), 501
+    return None
+
+def search_index_missing(error):
+    logger.error("Search index missing (%s); run `flask --app app init-db` to build it", error)
+    return jsonify({'error': 'Search index is not built yet'}), 503
+
+@main.route('/api/scripts/search')
+def search_scripts():
+    """
+    Scripts matching every word of `q` in the title or content, best match
+    first (title matches weigh more). Paged with `page` and `limit`; each
+    result carries `highlight` with the title and a content snippet, HTML
+    escaped with matches wrapped in <mark>.
+    """
+    unavailable = search_unavailable()
+    if unavailable:
+        return unavailable
+    try:
+        match, page, page_size = search_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    fts = db.table('call_script_fts', db.column('rowid'))
+    fts_name = db.literal_column('call_script_fts')
+    rank = db.func.bm25(fts_name, 10.0, 1.0)
+    query = (db.session.query(
+                 CallScript,
+                 db.func.highlight(fts_name, 0, HIGHLIGHT_START, HIGHLIGHT_END),
+                 db.func.snippet(fts_name, 1, HIGHLIGHT_START, HIGHLIGHT_END, '…', SEARCH_SNIPPET_TOKENS),
+                 rank)
+             .select_from(fts)
+             .join(CallScript, CallScript.id == fts.c.rowid)
+             .filter(fts_name.op('MATCH')(match))
+             .order_by(rank, CallScript.id))
+    try:
+        rows, has_more = run_search(query, page, page_size)
+    except SearchIndexMissing as e:
+        return search_index_missing(e)
+    return jsonify({
+        'success': True,
+        'results': [{**script.to_dict(),
+                     'highlight': {'title': highlight_html(title), 'content': highlight_html(content)},
+                     'score': round(-score, 4)}
+                    for script, title, content, score in rows],
+        'page': page,
+        'has_more': has_more
+    })
+
+def external_prompt_payload(user_notes, note):
+    """Response asking the user to run the prompt in an external AI tool"""
+    prompt_text = f"""You are a helpful assistant that creates phone call scripts for constituents calling their representatives.
 
 User input: {user_notes}
 
@@ -724,57 +1569,250 @@ You can use these reference parameters in your script:
 Example: "I'm calling @RepType @LastName from @ZipCode to express my concern about..."
 
 Write only the script content, no additional formatting or explanations."""
-                
+    
+    return {
+        'prompt': prompt_text,
+        'user_notes': user_notes,
+        'success': True,
+        'mode': 'external',
+        'note': note
+    }
+
+@main.route('/api/generate-script', methods=['POST'])
+def generate_script():
+    """
+    Start script generation. Locally this queues a background job and returns
+    its ID straight away (poll GET /api/generate-script/<job_id>); in
+    production it returns the prompt for an external AI tool.
+    """
+    try:
+        data = request.get_json()
+        user_notes = data.get('notes', '')
+        
+        if not user_notes.strip():
+            return jsonify({'error': 'Please provide some notes about what you want to discuss'}), 400
+        
+        # Check if we're running locally (for development/demo)
+        is_localhost = request.headers.get('Host', '').startswith('localhost') or request.headers.get('Host', '').startswith('127.0.0.1')
+        
+        if is_localhost:
+            # Local development - reuse a cached script for the same notes if we have one
+            cached = get_cached_script(user_notes)
+            if cached is not None:
                 return jsonify({
-                    'prompt': prompt_text,
-                    'user_notes': user_notes,
+                    'script': cached.content,
+                    'title': cached.title,
                     'success': True,
-                    'mode': 'external',
-                    'note': 'AI service unavailable - use external AI tool (copy prompt to ChatGPT)'
+                    'note': 'Generated using DeepSeek V3 (FREE TIER) via OpenRouter',
+                    'mode': 'local',
+                    'cached': True
                 })
+            
+            # Otherwise use actual AI generation in the background
+            job = enqueue_script_job(user_notes)
+            return jsonify({
+                'success': True,
+                'mode': 'job',
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': f'/api/generate-script/{job.id}'
+            }), 202
         else:
             # Production - provide external tool guidance
-            prompt_text = f"""You are a helpful assistant that creates phone call scripts for constituents calling their representatives.
+            return jsonify(external_prompt_payload(
+                user_notes, 'Use external AI tool - copy the prompt below and paste into ChatGPT or similar'))
+        
+    except Exception as e:
+        return jsonify({'error': f'Request failed: {str(e)}'}), 500
 
-User input: {user_notes}
+@main.route('/api/generate-script/<job_id>', methods=['GET'])
+def get_script_job(job_id):
+    """Status of a script generation job; includes the result once finished"""
+    job = db.session.get(ScriptGenerationJob, job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown script generation job'}), 404
+    
+    if job.status in SCRIPT_JOB_PENDING:
+        created_at = job.created_at.replace(tzinfo=timezone.utc) if job.created_at.tzinfo is None else job.created_at
+        if datetime.now(timezone.utc) - created_at > timedelta(seconds=SCRIPT_JOB_TIMEOUT):
+            # The worker that owned this job went away; fall back to the external tool
+            finish_script_job(job, 'failed', external_prompt_payload(
+                job.notes, 'AI service unavailable - use external AI tool (copy prompt to ChatGPT)'),
+                error='Timed out')
+        else:
+            return jsonify(job.to_dict()), 202
+    
+    return jsonify(job.to_dict())
 
-Please create a professional, polite, and effective phone call script that:
-1. Is conversational and natural-sounding
-2. Clearly states the issue/concern based on the user's input
-3. Makes a specific request or asks for action
-4. Is respectful and appreciative
-5. Does NOT solicit input from the representative (they are there to listen and take notes)
-6. Is 5-10 sentences long, depending on how much detail the user provided
+def normalize_script_notes(notes):
+    """Case-fold and collapse whitespace so trivially different notes share a cache entry"""
+    return ' '.join(notes.casefold().split())
 
-IMPORTANT: Always start the script with: "Hi, I'd like to register an opinion. My name is __ and I'm a constituent from @ZipCode."
+def script_cache_key(normalized_notes):
+    raw = f"{SCRIPT_PROMPT_VERSION}\x00{DEEPSEEK_FREE_MODEL}\x00{normalized_notes}"
+    return hashlib.sha256(raw.encode()).hexdigest()
 
-You can use these reference parameters in your script:
-- @RepType: Will be replaced with "Representative" or "Senator"
-- @LastName: Will be replaced with the representative's last name
-- @ZipCode: Will be replaced with the constituent's zip code
+def get_cached_script(notes):
+    """Return a fresh cached script for these notes (marking it recently used), or None"""
+    try:
+        entry = db.session.get(GeneratedScriptCache, script_cache_key(normalize_script_notes(notes)))
+        now = datetime.now(timezone.utc)
+        if entry is not None and entry.created_at.replace(tzinfo=timezone.utc) + SCRIPT_CACHE_TTL > now:
+            entry.hit_count += 1
+            entry.last_used_at = now
+            db.session.commit()
+            with script_cache_lock:
+                script_cache_counters['hits'] += 1
+                script_cache_counters['saved_upstream_seconds'] += entry.generation_seconds
+            return entry
+    except Exception as e:
+        logger.error("Error reading generated script cache: %s", e)
+        db.session.rollback()
+        return None
+    
+    with script_cache_lock:
+        script_cache_counters['misses'] += 1
+    return None
+
+def store_cached_script(notes, generated_result, generation_seconds):
+    """Save a generated script and evict expired and least recently used entries"""
+    normalized = normalize_script_notes(notes)
+    now = datetime.now(timezone.utc)
+    try:
+        db.session.merge(GeneratedScriptCache(
+            key=script_cache_key(normalized),
+            normalized_notes=normalized,
+            model=DEEPSEEK_FREE_MODEL,
+            prompt_version=SCRIPT_PROMPT_VERSION,
+            title=generated_result['title'][:200],
+            content=generated_result['content'],
+            generation_seconds=generation_seconds,
+            hit_count=0,
+            created_at=now,
+            last_used_at=now
+        ))
+        GeneratedScriptCache.query.filter(GeneratedScriptCache.created_at < now - SCRIPT_CACHE_TTL).delete()
+        overflow = GeneratedScriptCache.query.count() - SCRIPT_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            oldest = (db.session.query(GeneratedScriptCache.key)
+                      .order_by(GeneratedScriptCache.last_used_at)
+                      .limit(overflow))
+            GeneratedScriptCache.query.filter(GeneratedScriptCache.key.in_(oldest.scalar_subquery())).delete(
+                synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        logger.error("Error storing generated script cache entry: %s", e)
+        db.session.rollback()
 
-Example: "I'm calling @RepType @LastName from @ZipCode to express my concern about..."
+def script_cache_stats():
+    """This worker's hit rate and saved upstream time, plus lifetime totals from the table"""
+    with script_cache_lock:
+        counters = dict(script_cache_counters)
+    lookups = counters['hits'] + counters['misses']
+    entries, lifetime_hits, lifetime_saved = db.session.query(
+        db.func.count(GeneratedScriptCache.key),
+        db.func.coalesce(db.func.sum(GeneratedScriptCache.hit_count), 0),
+        db.func.coalesce(db.func.sum(GeneratedScriptCache.hit_count * GeneratedScriptCache.generation_seconds), 0.0)
+    ).one()
+    return {
+        'entries': entries,
+        'max_entries': SCRIPT_CACHE_MAX_ENTRIES,
+        'ttl': int(SCRIPT_CACHE_TTL.total_seconds()),
+        'prompt_version': SCRIPT_PROMPT_VERSION,
+        'hits': counters['hits'],
+        'misses': counters['misses'],
+        'hit_rate': round(counters['hits'] / lookups, 4) if lookups else 0.0,
+        'saved_upstream_seconds': round(counters['saved_upstream_seconds'], 3),
+        'lifetime_hits': lifetime_hits,
+        'lifetime_saved_upstream_seconds': round(lifetime_saved, 3)
+    }
 
-Write only the script content, no additional formatting or explanations."""
+def enqueue_script_job(notes):
+    """Record a job and hand it to the local worker pool"""
+    now = datetime.now(timezone.utc)
+    # Finished jobs are only polled briefly; drop old ones as new ones arrive
+    ScriptGenerationJob.query.filter(ScriptGenerationJob.created_at < now - SCRIPT_JOB_RETENTION).delete()
+    job = ScriptGenerationJob(id=uuid.uuid4().hex, notes=notes, status='queued', created_at=now)
+    db.session.add(job)
+    db.session.commit()
+    script_job_executor.submit(run_script_job, current_app._get_current_object(), job.id)
+    return job
+
+def finish_script_job(job, status, payload, error=None):
+    """
+    Store a job's outcome unless it already has one: a job that timed out
+    stays failed when its worker finishes late. Returns True if stored.
+    """
+    # Compare-and-set in one UPDATE, since the poller and the worker can race
+    stored = ScriptGenerationJob.query.filter(
+        ScriptGenerationJob.id == job.id,
+        ScriptGenerationJob.status.in_(SCRIPT_JOB_PENDING)
+    ).update({
+        'status': status,
+        'result': json.dumps(payload),
+        'error': error,
+        'finished_at': datetime.now(timezone.utc)
+    }, synchronize_session=False)
+    db.session.commit()  # expires job, so it is reloaded with whichever outcome won
+    return stored == 1
+
+def run_script_job(app, job_id):
+    """Worker pool entry point: generate the script and store the outcome"""
+    with app.app_context():
+        try:
+            job = db.session.get(ScriptGenerationJob, job_id)
+            if job is None or job.status != 'queued':
+                return
+            notes = job.notes
+            # Claim the job only if it is still queued (it may have timed out meanwhile)
+            claimed = ScriptGenerationJob.query.filter(
+                ScriptGenerationJob.id == job_id,
+                ScriptGenerationJob.status == 'queued'
+            ).update({'status': 'running', 'started_at': datetime.now(timezone.utc)}, synchronize_session=False)
+            db.session.commit()
+            if not claimed:
+                return
             
-            return jsonify({
-                'prompt': prompt_text,
-                'user_notes': user_notes,
+            try:
+                started = time.perf_counter()
+                generated_result = generate_ai_script(notes)
+                store_cached_script(notes, generated_result, time.perf_counter() - started)
+            except Exception as e:
+                logger.warning("AI generation failed, using external tool approach: %s", e)
+                # Use external AI tool approach (same as production) when API fails
+                if not finish_script_job(job, 'failed', external_prompt_payload(
+                        notes, 'AI service unavailable - use external AI tool (copy prompt to ChatGPT)'), error=str(e)):
+                    logger.info("Script generation job %s had already timed out", job_id)
+                return
+            
+            # The script is cached above either way, so a retry of a timed-out job is instant
+            if not finish_script_job(job, 'done', {
+                'script': generated_result['content'],
+                'title': generated_result['title'],
                 'success': True,
-                'mode': 'external',
-                'note': 'Use external AI tool - copy the prompt below and paste into ChatGPT or similar'
-            })
-        
-    except Exception as e:
-        return jsonify({'error': f'Request failed: {str(e)}'}), 500
+                'note': 'Generated using DeepSeek V3 (FREE TIER) via OpenRouter',
+                'mode': 'local'
+            }):
+                logger.info("Discarding the result of script generation job %s: it had already timed out", job_id)
+        except Exception as e:
+            logger.error("Script generation job %s failed: %s", job_id, e)
+            db.session.rollback()
+        finally:
+            db.session.remove()
 
-def generate_ai_script(notes):
-    """Generate a script using OpenRouter API with DeepSeek V3 (FREE TIER ONLY)"""
-    
+def openrouter_headers():
     if OPENROUTER_API_KEY == 'your-openrouter-api-key-here' or OPENROUTER_API_KEY == 'invalid-key-for-testing':
         raise Exception("OpenRouter API key not configured")
     
-    prompt = f"""You are a helpful assistant that creates phone call scripts for constituents calling their representatives. Follow these best practices for effective advocacy:
+    return {
+        'Authorization': f'Bearer {OPENROUTER_API_KEY}',
+        'Content-Type': 'application/json',
+        'HTTP-Referer': 'http://localhost:8080',
+        'X-Title': 'Contact Your Representatives App'
+    }
+
+def script_prompt(notes):
+    return f"""You are a helpful assistant that creates phone call scripts for constituents calling their representatives. Follow these best practices for effective advocacy:
 
 User input: {notes}
 
@@ -810,14 +1848,16 @@ TONE GUIDELINES:
 
 Write only the script content, no additional formatting or explanations."""
 
-    headers = {
-        'Authorization': f'Bearer {OPENROUTER_API_KEY}',
-        'Content-Type': 'application/json',
-        'HTTP-Referer': 'http://localhost:8080',
-        'X-Title': 'Contact Your Representatives App'
-    }
-    
-    data = {
+def title_prompt(notes):
+    return f"""Based on this user input: "{notes}"
+
+Generate a brief, professional title for a phone call script (3-8 words). The title should capture the main topic or issue.
+
+Write only the title, no additional text."""
+
+def request_completion(headers, prompt, max_tokens, stream=False, call='script'):
+    """POST one chat completion to OpenRouter over the pooled session; `call` labels its metrics"""
+    payload = {
         'model': DEEPSEEK_FREE_MODEL,
         'messages': [
             {
@@ -825,17 +1865,79 @@ Write only the script content, no additional formatting or explanations."""
                 'content': prompt
             }
         ],
-        'max_tokens': 300,
+        'max_tokens': max_tokens,
         'temperature': 0.7
     }
+    if stream:
+        payload['stream'] = True
     
+    started = time.perf_counter()
+    status = 'error'
     try:
-        response = requests.post(
+        response = get_openrouter_session().post(
             f'{OPENROUTER_BASE_URL}/chat/completions',
             headers=headers,
-            json=data,
-            timeout=30
+            json=payload,
+            timeout=OPENROUTER_TIMEOUT,
+            stream=stream
         )
+        status = str(response.status_code)
+        return response
+    finally:
+        if METRICS_ENABLED:
+            openrouter_request_duration.observe(time.perf_counter() - started, call, status)
+
+def stream_completion(headers, prompt, max_tokens):
+    """Yield content deltas from a streamed OpenRouter chat completion as they arrive"""
+    response = request_completion(headers, prompt, max_tokens, stream=True, call='script_stream')
+    with response:
+        if response.status_code != 200:
+            raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
+        
+        for line in response.iter_lines(decode_unicode=True):
+            # Skip blank separators and keep-alive comments (": OPENROUTER PROCESSING")
+            if not line or not line.startswith('data:'):
+                continue
+            data = line[len('data:'):].strip()
+            if data == '[DONE]':
+                break
+            choices = json.loads(data).get('choices') or []
+            if choices:
+                delta = (choices[0].get('delta') or {}).get('content')
+                if delta:
+                    yield delta
+
+def generate_script_title(headers, notes):
+    """Ask for a short title, falling back to one built from the notes"""
+    # Fallback title if API fails
+    from requests.exceptions import RequestException
+
+    fallback_title = f"Script about {notes[:30]}..."
+    try:
+        title_response = request_completion(headers, title_prompt(notes), 50, call='title')
+    except RequestException as e:
+        logger.warning("Title request failed: %s", e)
+        return fallback_title
+    
+    if title_response.status_code != 200:
+        return fallback_title
+    
+    title_result = title_response.json()
+    if 'choices' in title_result and title_result['choices'] and 'message' in title_result['choices'][0] and 'content' in title_result['choices'][0]['message']:
+        return title_result['choices'][0]['message']['content'].strip()
+    return fallback_title
+
+def generate_ai_script(notes):
+    """Generate a script using OpenRouter API with DeepSeek V3 (FREE TIER ONLY)"""
+    from requests.exceptions import RequestException
+
+    headers = openrouter_headers()
+    
+    # The title only depends on the notes, so request it alongside the script
+    title_future = openrouter_executor.submit(generate_script_title, headers, notes)
+    
+    try:
+        response = request_completion(headers, script_prompt(notes), 300)
         
         if response.status_code != 200:
             raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
@@ -851,90 +1953,318 @@ Write only the script content, no additional formatting or explanations."""
         
         script_content = result['choices'][0]['message']['content'].strip()
         
-        # Generate a title based on the user's input
-        title_prompt = f"""Based on this user input: "{notes}"
-
-Generate a brief, professional title for a phone call script (3-8 words). The title should capture the main topic or issue.
-
-Write only the title, no additional text."""
-        
-        title_data = {
-            'model': DEEPSEEK_FREE_MODEL,
-            'messages': [
-                {
-                    'role': 'user',
-                    'content': title_prompt
-                }
-            ],
-            'max_tokens': 50,
-            'temperature': 0.7
-        }
-        
-        title_response = requests.post(
-            f'{OPENROUTER_BASE_URL}/chat/completions',
-            headers=headers,
-            json=title_data,
-            timeout=30
-        )
-        
-        if title_response.status_code == 200:
-            title_result = title_response.json()
-            if 'choices' in title_result and title_result['choices'] and 'message' in title_result['choices'][0] and 'content' in title_result['choices'][0]['message']:
-                script_title = title_result['choices'][0]['message']['content'].strip()
-            else:
-                script_title = f"Script about {notes[:30]}..."
-        else:
-            # Fallback title if API fails
-            script_title = f"Script about {notes[:30]}..."
-        
         return {
-            'title': script_title,
+            'title': title_future.result(),
             'content': script_content
         }
         
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request exception: {e}")
+    except RequestException as e:
+        logger.error("Request exception: %s", e)
         raise Exception(f"Network error: {str(e)}")
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         raise
 
+def sse_event(event, payload):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
 
-
-@app.route('/api/call-logs', methods=['POST'])
-def create_call_log():
-    data = request.get_json()
+@main.route('/api/generate-script/stream', methods=['POST'])
+def generate_script_stream():
+    """
+    Stream a generated script as Server-Sent Events: `token` events carry
+    script text as the model produces it, `title` arrives once the parallel
+    title request finishes, and `done` carries the same payload as the
+    non-streaming endpoint. On failure an `error` event carries the
+    external-tool fallback. Outside local mode this returns that fallback as
+    plain JSON, like /api/generate-script. Without SCRIPT_STREAMING_ENABLED
+    it behaves exactly like /api/generate-script (a background job).
+    """
+    if not SCRIPT_STREAMING_ENABLED:
+        return generate_script()
+    
+    data = request.get_json(silent=True) or {}
+    user_notes = data.get('notes', '')
+    
+    if not user_notes.strip():
+        return jsonify({'error': 'Please provide some notes about what you want to discuss'}), 400
     
+    is_localhost = request.headers.get('Host', '').startswith('localhost') or request.headers.get('Host', '').startswith('127.0.0.1')
+    if not is_localhost:
+        return jsonify(external_prompt_payload(
+            user_notes, 'Use external AI tool - copy the prompt below and paste into ChatGPT or similar'))
+    
+    note = 'Generated using DeepSeek V3 (FREE TIER) via OpenRouter'
+    cached = get_cached_script(user_notes)
+    cached = {'title': cached.title, 'content': cached.content} if cached is not None else None
+    
+    def generate():
+        if cached is not None:
+            yield sse_event('title', {'title': cached['title']})
+            yield sse_event('token', {'text': cached['content']})
+            yield sse_event('done', {'script': cached['content'], 'title': cached['title'], 'success': True,
+                                     'note': note, 'mode': 'local', 'cached': True})
+            return
+        
+        started = time.perf_counter()
+        first_token_at = None
+        parts = []
+        title_sent = False
+        try:
+            headers = openrouter_headers()
+            title_future = openrouter_executor.submit(generate_script_title, headers, user_notes)
+            
+            for delta in stream_completion(headers, script_prompt(user_notes), 300):
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    logger.info("Script stream time to first token: %.0f ms", (first_token_at - started) * 1000)
+                parts.append(delta)
+                yield sse_event('token', {'text': delta})
+                if not title_sent and title_future.done():
+                    yield sse_event('title', {'title': title_future.result()})
+                    title_sent = True
+            
+            script_content = ''.join(parts).strip()
+            if not script_content:
+                raise Exception("API stream returned no content")
+            script_title = title_future.result()
+        except Exception as e:
+            logger.warning("AI streaming failed, using external tool approach: %s", e)
+            yield sse_event('error', external_prompt_payload(
+                user_notes, 'AI service unavailable - use external AI tool (copy prompt to ChatGPT)'))
+            return
+        
+        if not title_sent:
+            yield sse_event('title', {'title': script_title})
+        
+        elapsed = time.perf_counter() - started
+        logger.info("Script stream finished in %.0f ms (time to first token %.0f ms)",
+                    elapsed * 1000, (first_token_at - started) * 1000)
+        store_cached_script(user_notes, {'title': script_title, 'content': script_content}, elapsed)
+        yield sse_event('done', {'script': script_content, 'title': script_title, 'success': True,
+                                 'note': note, 'mode': 'local'})
+    
+    return current_app.response_class(stream_with_context(generate()), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+CALL_LOG_BATCH_MAX_SIZE = 500
+CALL_LOG_REQUIRED_FIELDS = ('representative_name', 'phone_number', 'phone_type', 'call_datetime', 'call_outcome')
+
+def call_log_values(data):
+    """Column values for a CallLog from a request payload"""
     # Parse datetime
     call_datetime = datetime.fromisoformat(data['call_datetime'].replace('Z', '+00:00'))
     
-    call_log = CallLog(
-        user_id=data.get('user_id', 'default_user'),
-        representative_name=data['representative_name'],
-        phone_number=data['phone_number'],
-        phone_type=data['phone_type'],
-        call_datetime=call_datetime,
-        call_outcome=data['call_outcome'],
-        call_notes=data.get('call_notes', ''),
-        script_id=data.get('script_id'),
-        script_title=data.get('script_title', ''),
-        session_id=data.get('session_id', ''),
-        is_test_data=data.get('is_test_data', False)
+    return {
+        'user_id': data.get('user_id', 'default_user'),
+        'representative_name': data['representative_name'],
+        'phone_number': data['phone_number'],
+        'phone_type': data['phone_type'],
+        'call_datetime': call_datetime,
+        'call_outcome': data['call_outcome'],
+        'call_notes': data.get('call_notes', ''),
+        'script_id': data.get('script_id'),
+        'script_title': data.get('script_title', ''),
+        'session_id': data.get('session_id', ''),
+        'is_test_data': data.get('is_test_data') or False  # validate_call_log allows only booleans or null
+    }
+
+CALL_LOG_OPTIONAL_STRING_FIELDS = ('user_id', 'call_notes', 'script_title', 'session_id')
+
+def validate_call_log(data):
+    """Validate a call log payload. Returns (True, values) or (False, error message)"""
+    if not isinstance(data, dict):
+        return False, "Call log must be an object"
+    
+    missing = [field for field in CALL_LOG_REQUIRED_FIELDS if not data.get(field)]
+    if missing:
+        return False, f"Missing required fields: {', '.join(missing)}"
+    
+    # Check types here so a bad item is rejected on its own instead of failing the whole insert
+    for field in CALL_LOG_REQUIRED_FIELDS + CALL_LOG_OPTIONAL_STRING_FIELDS:
+        if field not in data:
+            continue
+        value = data[field]
+        column = CallLog.__table__.c[field]
+        if value is None and column.nullable:
+            continue
+        if not isinstance(value, str):
+            return False, f"{field} must be a string"
+        max_length = getattr(column.type, 'length', None)
+        if max_length and len(value) > max_length:
+            return False, f"{field} must be at most {max_length} characters"
+    script_id = data.get('script_id')
+    if script_id is not None and (isinstance(script_id, bool) or not isinstance(script_id, int)):
+        return False, "script_id must be an integer"
+    # bool("false") is True, so only JSON booleans are accepted
+    if data.get('is_test_data') is not None and not isinstance(data['is_test_data'], bool):
+        return False, "is_test_data must be true or false"
+    
+    try:
+        return True, call_log_values(data)
+    except ValueError:
+        return False, "Invalid call_datetime. Use ISO 8601 format"
+
+# Daily rollup of call counts behind /api/call-logs/stats
+CALL_ROLLUP = 'call_log_daily'
+CALL_ROLLUP_KEY = ('user_id', 'day', 'is_test_data', 'call_outcome', 'representative_name', 'script_title')
+DIALECT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+call_rollup_ready = False
+
+def add_to_call_rollup(rows):
+    """Count new call logs (call_log_values() dicts) into the rollup, in the caller's transaction"""
+    counts = Counter(
+        (values['user_id'], values['call_datetime'].date(), bool(values['is_test_data']),
+         values['call_outcome'], values['representative_name'], values['script_title'] or '')
+        for values in rows
     )
+    params = [dict(zip(CALL_ROLLUP_KEY, key), call_count=count) for key, count in counts.items()]
+    dialect_insert = DIALECT_INSERTS.get(db.session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(CallLogDailyRollup.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=CALL_ROLLUP_KEY,
+            set_={'call_count': CallLogDailyRollup.call_count + statement.excluded.call_count}
+        )
+        db.session.execute(statement, params)
+        return
+    for values in params:
+        rollup = db.session.get(CallLogDailyRollup, tuple(values[key] for key in CALL_ROLLUP_KEY))
+        if rollup is None:
+            db.session.add(CallLogDailyRollup(**values))
+        else:
+            rollup.call_count += values['call_count']
+
+def backfill_call_rollup(user_id=None):
+    """
+    Rebuild the rollup (for one user, or everyone) from call_log with one
+    INSERT ... SELECT. Only a full rebuild marks the rollup complete; a
+    per-user rebuild repairs rows of a rollup that is already in use. Needs
+    an app context. Returns the number of rollup rows written.
+    """
+    rollup = CallLogDailyRollup.__table__
+    delete = rollup.delete()
+    key = (CallLog.user_id, db.func.date(CallLog.call_datetime), db.func.coalesce(CallLog.is_test_data, False),
+           CallLog.call_outcome, CallLog.representative_name, db.func.coalesce(CallLog.script_title, ''))
+    source = db.select(*key, db.func.count(CallLog.id)).group_by(*key)
+    if user_id is not None:
+        delete = delete.where(rollup.c.user_id == user_id)
+        source = source.where(CallLog.user_id == user_id)
+    db.session.execute(delete)
+    written = db.session.execute(rollup.insert().from_select([*CALL_ROLLUP_KEY, 'call_count'], source)).rowcount
+    if user_id is None:
+        state = db.session.get(RollupState, CALL_ROLLUP) or RollupState(name=CALL_ROLLUP)
+        state.built_at = datetime.now(timezone.utc)
+        db.session.add(state)
+    db.session.commit()
+    return written
+
+def call_rollup_is_ready():
+    """True once the rollup has been backfilled (remembered for the life of the process)"""
+    global call_rollup_ready
+    if not call_rollup_ready:
+        call_rollup_ready = db.session.get(RollupState, CALL_ROLLUP) is not None
+    return call_rollup_ready
+
+@main.route('/api/call-logs', methods=['POST'])
+def create_call_log():
+    is_valid, result = validate_call_log(request.get_json(silent=True))
+    if not is_valid:
+        return jsonify({'error': result}), 400
+    
+    values = result
+    call_log = CallLog(**values)
     
     db.session.add(call_log)
+    add_to_call_rollup([values])
     db.session.commit()
     
     return jsonify({'success': True, 'call_log': call_log.to_dict()})
 
-@app.route('/api/call-logs', methods=['GET'])
+@main.route('/api/call-logs/batch', methods=['POST'])
+def create_call_logs_batch():
+    """
+    Log many calls at once (e.g. an offline queue being replayed).
+    
+    Every item is validated first; the valid ones are inserted together in a
+    single transaction and the response reports a result per input item.
+    """
+    data = request.get_json(silent=True)
+    call_logs = data.get('call_logs') if isinstance(data, dict) else data
+    if not isinstance(call_logs, list) or not call_logs:
+        return jsonify({'error': 'Provide a non-empty list of call logs'}), 400
+    if len(call_logs) > CALL_LOG_BATCH_MAX_SIZE:
+        return jsonify({'error': f'At most {CALL_LOG_BATCH_MAX_SIZE} call logs per batch'}), 400
+    
+    results = []
+    rows = []
+    for index, item in enumerate(call_logs):
+        is_valid, result = validate_call_log(item)
+        if is_valid:
+            rows.append((index, result))
+            results.append(None)
+        else:
+            results.append({'index': index, 'success': False, 'error': result})
+    
+    if rows:
+        try:
+            # One multi-row INSERT ... RETURNING inside one transaction. Ids are
+            # assigned in VALUES order, so sorting by id restores input order
+            # (asking SQLAlchemy to sort would fall back to one INSERT per row).
+            inserted = db.session.scalars(
+                insert(CallLog).returning(CallLog),
+                [values for _, values in rows]
+            ).all()
+            inserted.sort(key=lambda call_log: call_log.id)
+            add_to_call_rollup([values for _, values in rows])
+            # Serialize before commit expires the freshly returned rows
+            for (index, _), call_log in zip(rows, inserted):
+                results[index] = {'index': index, 'success': True, 'call_log': call_log.to_dict()}
+            db.session.commit()
+        except Exception as e:
+            logger.error("Error inserting call log batch: %s", e)
+            db.session.rollback()
+            return jsonify({'error': 'Error saving call logs'}), 500
+    
+    created = len(rows)
+    return jsonify({
+        'success': created == len(call_logs),
+        'created': created,
+        'failed': len(call_logs) - created,
+        'results': results
+    }), 201 if created else 400
+
+CALL_LOG_PAGE_SIZE = 100
+CALL_LOG_MAX_PAGE_SIZE = 1000
+
+def encode_call_log_cursor(call_log):
+    """Opaque keyset cursor pointing just past call_log in (call_datetime, id) desc order"""
+    raw = f"{call_log.call_datetime.isoformat()}|{call_log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_call_log_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    call_datetime, call_log_id = raw.rsplit('|', 1)
+    return datetime.fromisoformat(call_datetime), int(call_log_id)
+
+@main.route('/api/call-logs', methods=['GET'])
 def get_call_logs():
+    """
+    List call logs, most recent first.
+    
+    Without `limit`/`cursor` the full result is returned as before. With them
+    the response is one keyset page plus `next_cursor`. `format=ndjson`
+    streams one JSON object per line from a server-side cursor instead.
+    """
     # Get query parameters for filtering
     user_id = request.args.get('user_id', 'default_user')
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     outcome = request.args.get('outcome')
     include_test_data = request.args.get('include_test_data', 'true').lower() == 'true'
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    stream = request.args.get('format') == 'ndjson'
     
     query = CallLog.query.filter_by(user_id=user_id)
     
@@ -951,17 +2281,214 @@ def get_call_logs():
     
     # Filter out test data unless explicitly requested
     if not include_test_data:
-        query = query.filter(CallLog.is_test_data == False)
+        query = query.filter(not_test_data())
+    
+    if cursor:
+        try:
+            cursor_datetime, cursor_id = decode_call_log_cursor(cursor)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(db.or_(
+            CallLog.call_datetime < cursor_datetime,
+            db.and_(CallLog.call_datetime == cursor_datetime, CallLog.id < cursor_id)
+        ))
+    
+    # Order by most recent first (id breaks ties so pages never overlap)
+    query = query.order_by(CallLog.call_datetime.desc(), CallLog.id.desc())
     
-    # Order by most recent first
-    call_logs = query.order_by(CallLog.call_datetime.desc()).all()
+    if limit is not None or cursor:
+        try:
+            page_size = int(limit) if limit is not None else CALL_LOG_PAGE_SIZE
+        except ValueError:
+            return jsonify({'error': 'Invalid limit'}), 400
+        page_size = max(1, min(page_size, CALL_LOG_MAX_PAGE_SIZE))
+    else:
+        page_size = None
+    
+    if stream:
+        if page_size is not None:
+            query = query.limit(page_size)
+        
+        def generate():
+            # yield_per keeps memory flat: rows are fetched from the DB cursor in batches
+            for log in query.yield_per(500):
+                yield current_app.json.dumps(log.to_dict()) + '\n'
+        return current_app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    if page_size is not None:
+        # Fetch one extra row to learn whether another page exists
+        query = query.limit(page_size + 1)
+    call_logs = query.all()
     
+    if page_size is None:
+        return jsonify({
+            'success': True,
+            'call_logs': [log.to_dict() for log in call_logs]
+        })
+    
+    has_more = len(call_logs) > page_size
+    call_logs = call_logs[:page_size]
     return jsonify({
         'success': True,
-        'call_logs': [log.to_dict() for log in call_logs]
+        'call_logs': [log.to_dict() for log in call_logs],
+        'next_cursor': encode_call_log_cursor(call_logs[-1]) if has_more else None
     })
 
-@app.route('/api/call-logs/stats')
+@main.route('/api/call-logs/search')
+def search_call_logs():
+    """
+    A user's call logs whose notes contain every word of `q`, best match
+    first, or by call_datetime newest first with `sort=recent`. Accepts `include_test_data` like the list
+    endpoint and is paged with `page` and `limit`; each result carries
+    `highlight`, a snippet of the notes, HTML escaped with matches wrapped
+    in <mark>.
+    """
+    unavailable = search_unavailable()
+    if unavailable:
+        return unavailable
+    try:
+        match, page, page_size = search_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    sort = request.args.get('sort', 'rank')
+    if sort not in ('rank', 'recent'):
+        return jsonify({'error': 'Invalid sort'}), 400
+    user_id = request.args.get('user_id', 'default_user')
+    include_test_data = request.args.get('include_test_data', 'true').lower() == 'true'
+
+    fts = db.table('call_log_fts', db.column('rowid'))
+    fts_name = db.literal_column('call_log_fts')
+    rank = db.func.bm25(fts_name)
+    query = (db.session.query(
+                 CallLog,
+                 db.func.snippet(fts_name, 0, HIGHLIGHT_START, HIGHLIGHT_END, '…', SEARCH_SNIPPET_TOKENS),
+                 rank)
+             .select_from(fts)
+             .join(CallLog, CallLog.id == fts.c.rowid)
+             .filter(fts_name.op('MATCH')(match), CallLog.user_id == user_id))
+    if sort == 'recent':
+        query = query.order_by(CallLog.call_datetime.desc(), CallLog.id.desc())
+    else:
+        query = query.order_by(rank, CallLog.id)
+    if not include_test_data:
+        query = query.filter(not_test_data())
+    try:
+        rows, has_more = run_search(query, page, page_size)
+    except SearchIndexMissing as e:
+        return search_index_missing(e)
+    return jsonify({
+        'success': True,
+        'results': [{**log.to_dict(), 'highlight': highlight_html(snippet), 'score': round(-score, 4)}
+                    for log, snippet, score in rows],
+        'page': page,
+        'has_more': has_more
+    })
+
+def call_counts(model, count, day, filters):
+    """
+    Counts by outcome, date, representative and script, computed in SQL.
+    `count` is what to add up per row (1 per call_log row, call_count per rollup row).
+    """
+    def grouped_counts(column, *extra_filters):
+        rows = (db.session.query(column, count)
+                .filter(*filters, *extra_filters)
+                .group_by(column)
+                .all())
+        return Counter({key: total for key, total in rows})
+
+    return {
+        'calls_by_outcome': grouped_counts(model.call_outcome),
+        'calls_by_date': Counter({
+            # SQLite returns 'YYYY-MM-DD' strings for date(), other backends return dates
+            date if isinstance(date, str) else date.isoformat(): total
+            for date, total in grouped_counts(day).items()
+        }),
+        'calls_by_rep': grouped_counts(model.representative_name),
+        'calls_by_script': grouped_counts(model.script_title, model.script_title.isnot(None),
+                                          model.script_title != '')
+    }
+
+def not_test_data():
+    """Filter for real calls; rows from before is_test_data (NULL) count as real, as in the rollup"""
+    return db.func.coalesce(CallLog.is_test_data, False) == False
+
+def raw_call_counts(user_id, include_test_data, *filters):
+    filters = [CallLog.user_id == user_id, *filters]
+    # Filter out test data unless explicitly requested
+    if not include_test_data:
+        filters.append(not_test_data())
+    return call_counts(CallLog, db.func.count(CallLog.id), db.func.date(CallLog.call_datetime), filters)
+
+def call_log_stats(user_id, start=None, end=None, include_test_data=True, use_rollup=True):
+    """
+    Call statistics for call_datetime in [start, end] (either may be None).
+
+    Whole days in the range are read from the daily rollup; only the partial
+    days at either end, if any, are counted from call_log rows. Falls back to
+    call_log entirely until the rollup has been backfilled.
+    """
+    # Stored datetimes are compared by wall-clock value, so day boundaries are too
+    start = start.replace(tzinfo=None) if start else None
+    end = end.replace(tzinfo=None) if end else None
+    if not use_rollup or not call_rollup_is_ready():
+        filters = []
+        if start:
+            filters.append(CallLog.call_datetime >= start)
+        if end:
+            filters.append(CallLog.call_datetime <= end)
+        counts = raw_call_counts(user_id, include_test_data, *filters)
+    else:
+        # Days entirely inside the range; end is inclusive, so a day is whole once end reaches its last microsecond
+        first_day = None if start is None else (start + timedelta(days=1, microseconds=-1)).date()
+        last_day = None if end is None else (end + timedelta(microseconds=1)).date() - timedelta(days=1)
+        counts = {}
+        edges = []
+        if first_day is not None and last_day is not None and first_day > last_day:
+            # Less than a whole day
+            edges.append(db.and_(CallLog.call_datetime >= start, CallLog.call_datetime <= end))
+        else:
+            rollup_filters = [CallLogDailyRollup.user_id == user_id]
+            if first_day is not None:
+                rollup_filters.append(CallLogDailyRollup.day >= first_day)
+                first_midnight = datetime(first_day.year, first_day.month, first_day.day)
+                if start < first_midnight:
+                    edges.append(db.and_(CallLog.call_datetime >= start, CallLog.call_datetime < first_midnight))
+            if last_day is not None:
+                rollup_filters.append(CallLogDailyRollup.day <= last_day)
+                after_last = datetime(last_day.year, last_day.month, last_day.day) + timedelta(days=1)
+                if after_last <= end:
+                    edges.append(db.and_(CallLog.call_datetime >= after_last, CallLog.call_datetime <= end))
+            if not include_test_data:
+                rollup_filters.append(CallLogDailyRollup.is_test_data == False)
+            counts = call_counts(CallLogDailyRollup, db.func.sum(CallLogDailyRollup.call_count),
+                                 CallLogDailyRollup.day, rollup_filters)
+
+        # Partial days at the edges of the range: few rows, so one grouped query
+        # that stays on the (user_id, call_datetime) index, folded in Python
+        if edges:
+            filters = [CallLog.user_id == user_id, db.or_(*edges)]
+            if not include_test_data:
+                filters.append(not_test_data())
+            key = (CallLog.call_outcome, db.func.date(CallLog.call_datetime),
+                   CallLog.representative_name, CallLog.script_title)
+            edge_counts = {name: Counter() for name in
+                           ('calls_by_outcome', 'calls_by_date', 'calls_by_rep', 'calls_by_script')}
+            for outcome, day, rep, script, total in (db.session.query(*key, db.func.count(CallLog.id))
+                                                     .filter(*filters).group_by(*key)):
+                edge_counts['calls_by_outcome'][outcome] += total
+                edge_counts['calls_by_date'][day if isinstance(day, str) else day.isoformat()] += total
+                edge_counts['calls_by_rep'][rep] += total
+                if script:
+                    edge_counts['calls_by_script'][script] += total
+            counts = {name: counts.get(name, Counter()) + edge_counts[name] for name in edge_counts}
+
+    return {
+        'total_calls': sum(counts['calls_by_outcome'].values()) if counts else 0,
+        **{key: dict(sorted(counts.get(key, {}).items()))
+           for key in ('calls_by_outcome', 'calls_by_date', 'calls_by_rep', 'calls_by_script')}
+    }
+
+@main.route('/api/call-logs/stats')
 def get_call_stats():
     """Get call statistics"""
     start_date = request.args.get('start_date')
@@ -969,218 +2496,278 @@ def get_call_stats():
     user_id = request.args.get('user_id', 'default_user')
     include_test_data = request.args.get('include_test_data', 'true').lower() == 'true'
     
-    query = CallLog.query.filter(CallLog.user_id == user_id)
-    
-    if start_date:
-        query = query.filter(CallLog.call_datetime >= datetime.fromisoformat(start_date.replace('Z', '+00:00')))
-    if end_date:
-        query = query.filter(CallLog.call_datetime <= datetime.fromisoformat(end_date.replace('Z', '+00:00')))
-    
-    # Filter out test data unless explicitly requested
-    if not include_test_data:
-        query = query.filter(CallLog.is_test_data == False)
-    
-    call_logs = query.all()
-    
-    # Calculate statistics
-    total_calls = len(call_logs)
-    calls_by_outcome = {}
-    calls_by_date = {}
-    calls_by_rep = {}
-    calls_by_script = {}
-    
-    for log in call_logs:
-        # Outcome stats
-        outcome = log.call_outcome
-        calls_by_outcome[outcome] = calls_by_outcome.get(outcome, 0) + 1
-        
-        # Date stats
-        date_str = log.call_datetime.strftime('%Y-%m-%d')
-        calls_by_date[date_str] = calls_by_date.get(date_str, 0) + 1
-        
-        # Representative stats
-        rep_name = log.representative_name
-        calls_by_rep[rep_name] = calls_by_rep.get(rep_name, 0) + 1
-        
-        # Script stats
-        script_title = log.script_title
-        if script_title:
-            calls_by_script[script_title] = calls_by_script.get(script_title, 0) + 1
-    
-    return jsonify({
-        'total_calls': total_calls,
-        'calls_by_outcome': calls_by_outcome,
-        'calls_by_date': calls_by_date,
-        'calls_by_rep': calls_by_rep,
-        'calls_by_script': calls_by_script
-    })
+    start = datetime.fromisoformat(start_date.replace('Z', '+00:00')) if start_date else None
+    end = datetime.fromisoformat(end_date.replace('Z', '+00:00')) if end_date else None
+    return jsonify(call_log_stats(user_id, start, end, include_test_data))
+
+# Zip codes whose representatives /api/clear-database keeps (comma-separated)
+CLEAR_DATABASE_KEEP_ZIPS = [zip_code.strip() for zip_code in os.getenv('CLEAR_DATABASE_KEEP_ZIPS', '94102').split(',')
+                            if zip_code.strip()]
 
-@app.route('/api/clear-database', methods=['POST'])
+@main.route('/api/clear-database', methods=['POST'])
 def clear_database():
     """
-    Clear all representative data except for zip code 94102.
-    This removes auto-populated data that was added without user approval.
+    Clear all representative data except for the allow-listed zip codes
+    (CLEAR_DATABASE_KEEP_ZIPS, or `keep_zip_codes` in the request body, which
+    needs the admin token). This removes auto-populated data that was added
+    without user approval. With `dry_run` only counts what would be removed.
     """
+    data = request.get_json(silent=True) or {}
+    if 'keep_zip_codes' in data and not has_admin_token():
+        return jsonify({'error': 'Admin token required to override keep_zip_codes'}), 403
+    keep_zip_codes = data.get('keep_zip_codes', CLEAR_DATABASE_KEEP_ZIPS)
+    if not isinstance(keep_zip_codes, list) or not all(isinstance(zip_code, str) for zip_code in keep_zip_codes):
+        return jsonify({'error': 'keep_zip_codes must be a list of zip codes'}), 400
+    # An empty allow-list would delete every representative
+    if not keep_zip_codes:
+        return jsonify({'error': 'keep_zip_codes must name at least one zip code'}), 400
+    dry_run = data.get('dry_run', False)
+    if not isinstance(dry_run, bool):
+        return jsonify({'error': 'dry_run must be true or false'}), 400
+    dry_run = dry_run or request.args.get('dry_run', 'false').lower() == 'true'
+    
     try:
-        # Delete all representatives except those with zip code 94102
-        representatives_to_delete = Representative.query.filter(
-            Representative.zip_code != '94102',
-            Representative.deleted_at.is_(None)
-        ).all()
-        
-        deleted_count = 0
-        for rep in representatives_to_delete:
-            rep.deleted_at = datetime.now(timezone.utc)
-            deleted_count += 1
-        
-        db.session.commit()
+        deleted_count, deleted_phone_count = soft_delete_representatives(
+            Representative.zip_code.notin_(keep_zip_codes), dry_run=dry_run)
+        if dry_run:
+            return jsonify({
+                'success': True,
+                'dry_run': True,
+                'message': f'Would clear {deleted_count} representatives from database',
+                'deleted_count': deleted_count,
+                'deleted_phone_count': deleted_phone_count,
+                'keep_zip_codes': keep_zip_codes
+            })
+        invalidate_representatives_cache()
         
         return jsonify({
             'success': True,
             'message': f'Successfully cleared {deleted_count} representatives from database',
-            'deleted_count': deleted_count
+            'deleted_count': deleted_count,
+            'deleted_phone_count': deleted_phone_count,
+            'keep_zip_codes': keep_zip_codes
         })
         
     except Exception as e:
-        logger.error(f"Error clearing database: {e}")
+        logger.error("Error clearing database: %s", e)
         db.session.rollback()
+        # Chunks committed before the failure stay cleared
+        invalidate_representatives_cache()
         return jsonify({'error': 'Error clearing database'}), 500
 
 # Initialize database with some sample data
 def init_db():
-    with app.app_context():
-        # Create all tables
-        db.create_all()
+    """Create missing tables and add sample data to an empty database (needs an app context)"""
+    # Create all tables
+    db.create_all()
+    
+    # Check if we already have data
+    if Representative.query.first() is None:
+        # Add sample representatives for 94102 (San Francisco)
+        nancy_pelosi = Representative(
+            zip_code='94102',
+            first_name='Nancy',
+            last_name='Pelosi',
+            position='Representative',
+            custom_position=None
+        )
+        db.session.add(nancy_pelosi)
+        db.session.flush()
         
-        # Check if we already have data
-        if Representative.query.first() is None:
-            # Add sample representatives for 94102 (San Francisco)
-            nancy_pelosi = Representative(
-                zip_code='94102',
-                first_name='Nancy',
-                last_name='Pelosi',
-                position='Representative',
-                custom_position=None
-            )
-            db.session.add(nancy_pelosi)
-            db.session.flush()
-            
-            # Add phone numbers for Nancy Pelosi
-            pelosi_dc_phone = RepresentativePhone(
-                representative_id=nancy_pelosi.id,
-                phone='(202) 225-4965',
-                extension='1',
-                phone_type='DC Office'
-            )
-            pelosi_district_phone = RepresentativePhone(
-                representative_id=nancy_pelosi.id,
-                phone='(415) 556-4862',
-                extension='5',
-                phone_type='District Office'
-            )
-            db.session.add(pelosi_dc_phone)
-            db.session.add(pelosi_district_phone)
-            
-            # Add Alex Padilla (Senator)
-            alex_padilla = Representative(
-                zip_code='94102',
-                first_name='Alex',
-                last_name='Padilla',
-                position='Senator',
-                custom_position=None
-            )
-            db.session.add(alex_padilla)
-            db.session.flush()
-            
-            # Add phone numbers for Alex Padilla
-            padilla_dc_phone = RepresentativePhone(
-                representative_id=alex_padilla.id,
-                phone='(202) 224-3553',
-                extension='2',
-                phone_type='DC Office'
-            )
-            padilla_district_phone = RepresentativePhone(
-                representative_id=alex_padilla.id,
-                phone='(415) 981-9369',
-                extension='',
-                phone_type='District Office'
-            )
-            db.session.add(padilla_dc_phone)
-            db.session.add(padilla_district_phone)
-            
-            # Add Adam Schiff (Senator)
-            adam_schiff = Representative(
-                zip_code='94102',
-                first_name='Adam',
-                last_name='Schiff',
-                position='Senator',
-                custom_position=None
-            )
-            db.session.add(adam_schiff)
-            db.session.flush()
-            
-            # Add phone numbers for Adam Schiff
-            schiff_dc_phone = RepresentativePhone(
-                representative_id=adam_schiff.id,
-                phone='(202) 224-3841',
-                extension='1',
-                phone_type='DC Office'
-            )
-            schiff_district_phone = RepresentativePhone(
-                representative_id=adam_schiff.id,
-                phone='(310) 914-7300',
-                extension='',
-                phone_type='District Office'
+        # Add phone numbers for Nancy Pelosi
+        pelosi_dc_phone = RepresentativePhone(
+            representative_id=nancy_pelosi.id,
+            phone='(202) 225-4965',
+            extension='1',
+            phone_type='DC Office'
+        )
+        pelosi_district_phone = RepresentativePhone(
+            representative_id=nancy_pelosi.id,
+            phone='(415) 556-4862',
+            extension='5',
+            phone_type='District Office'
+        )
+        db.session.add(pelosi_dc_phone)
+        db.session.add(pelosi_district_phone)
+        
+        # Add Alex Padilla (Senator)
+        alex_padilla = Representative(
+            zip_code='94102',
+            first_name='Alex',
+            last_name='Padilla',
+            position='Senator',
+            custom_position=None
+        )
+        db.session.add(alex_padilla)
+        db.session.flush()
+        
+        # Add phone numbers for Alex Padilla
+        padilla_dc_phone = RepresentativePhone(
+            representative_id=alex_padilla.id,
+            phone='(202) 224-3553',
+            extension='2',
+            phone_type='DC Office'
+        )
+        padilla_district_phone = RepresentativePhone(
+            representative_id=alex_padilla.id,
+            phone='(415) 981-9369',
+            extension='',
+            phone_type='District Office'
+        )
+        db.session.add(padilla_dc_phone)
+        db.session.add(padilla_district_phone)
+        
+        # Add Adam Schiff (Senator)
+        adam_schiff = Representative(
+            zip_code='94102',
+            first_name='Adam',
+            last_name='Schiff',
+            position='Senator',
+            custom_position=None
+        )
+        db.session.add(adam_schiff)
+        db.session.flush()
+        
+        # Add phone numbers for Adam Schiff
+        schiff_dc_phone = RepresentativePhone(
+            representative_id=adam_schiff.id,
+            phone='(202) 224-3841',
+            extension='1',
+            phone_type='DC Office'
+        )
+        schiff_district_phone = RepresentativePhone(
+            representative_id=adam_schiff.id,
+            phone='(310) 914-7300',
+            extension='',
+            phone_type='District Office'
+        )
+        db.session.add(schiff_dc_phone)
+        db.session.add(schiff_district_phone)
+        
+        db.session.commit()
+        logger.info("Added sample representatives for 94102")
+    
+    # Initialize call scripts if they don't exist
+    if CallScript.query.first() is None:
+        scripts = [
+            CallScript(
+                title="General Support",
+                content="Hello, I'm calling to express my support for [issue/topic]. I believe this is important for our community and I hope you'll consider supporting it. Thank you for your time."
+            ),
+            CallScript(
+                title="Opposition",
+                content="Hello, I'm calling to express my opposition to [issue/topic]. I have concerns about how this might affect our community and I hope you'll reconsider your position. Thank you for listening."
+            ),
+            CallScript(
+                title="Request Information",
+                content="Hello, I'm calling to request more information about [issue/topic]. I'd like to understand your position and what you're doing to address this issue. Thank you for your time."
+            ),
+            CallScript(
+                title="Thank You",
+                content="Hello, I'm calling to thank you for your work on [issue/topic]. I appreciate your efforts and wanted to let you know that your constituents are paying attention. Keep up the good work!"
+            ),
+            CallScript(
+                title="Custom Issue",
+                content="Hello, I'm calling about [describe your issue]. This is important to me because [explain why]. I hope you'll consider [what you want them to do]. Thank you for your time and consideration."
             )
-            db.session.add(schiff_dc_phone)
-            db.session.add(schiff_district_phone)
-            
-            db.session.commit()
-            logger.info("Added sample representatives for 94102")
+        ]
         
-        # Initialize call scripts if they don't exist
-        if CallScript.query.first() is None:
-            scripts = [
-                CallScript(
-                    title="General Support",
-                    content="Hello, I'm calling to express my support for [issue/topic]. I believe this is important for our community and I hope you'll consider supporting it. Thank you for your time."
-                ),
-                CallScript(
-                    title="Opposition",
-                    content="Hello, I'm calling to express my opposition to [issue/topic]. I have concerns about how this might affect our community and I hope you'll reconsider your position. Thank you for listening."
-                ),
-                CallScript(
-                    title="Request Information",
-                    content="Hello, I'm calling to request more information about [issue/topic]. I'd like to understand your position and what you're doing to address this issue. Thank you for your time."
-                ),
-                CallScript(
-                    title="Thank You",
-                    content="Hello, I'm calling to thank you for your work on [issue/topic]. I appreciate your efforts and wanted to let you know that your constituents are paying attention. Keep up the good work!"
-                ),
-                CallScript(
-                    title="Custom Issue",
-                    content="Hello, I'm calling about [describe your issue]. This is important to me because [explain why]. I hope you'll consider [what you want them to do]. Thank you for your time and consideration."
-                )
-            ]
-            
-            for script in scripts:
-                db.session.add(script)
-            
-            db.session.commit()
-            logger.info("Added sample call scripts")
+        for script in scripts:
+            db.session.add(script)
+        
+        db.session.commit()
+        logger.info("Added sample call scripts")
+
+@main.cli.command('init-db')
+@click.option('--seed/--no-seed', default=True, help='Add sample representatives and call scripts if empty')
+def init_db_command(seed):
+    """Create missing tables and optionally seed sample data"""
+    if seed:
+        init_db()
+    else:
+        db.create_all()
+    if db.session.get(RollupState, CALL_ROLLUP) is None:
+        written = backfill_call_rollup()
+        click.echo(f"Built call statistics rollup ({written} rows)")
+    click.echo(f"Database ready at {db.engine.url.render_as_string(hide_password=True)}")
+
+@main.cli.command('backfill-call-rollup')
+@click.option('--user-id', help="Only rebuild this user's rows")
+@click.option('--if-missing', is_flag=True, help='Do nothing if the rollup has already been built')
+def backfill_call_rollup_command(user_id, if_missing):
+    """Rebuild the daily call statistics rollup from call_log"""
+    if if_missing and db.session.get(RollupState, CALL_ROLLUP) is not None:
+        click.echo("Call statistics rollup already built")
+        return
+    start = time.perf_counter()
+    written = backfill_call_rollup(user_id)
+    click.echo(f"Built call statistics rollup: {written} rows in {time.perf_counter() - start:.2f}s")
+    if user_id is not None and db.session.get(RollupState, CALL_ROLLUP) is None:
+        click.echo("The rollup is not used until it has been built for all users (run without --user-id)")
+
+def create_app(config=None):
+    """
+    Build the application. Nothing touches the database, the network or the
+    outbound HTTP stack here; run `flask --app app init-db` to create tables.
+    """
+    configure_logging()
+    app = Flask(__name__)
+    app.config.update(
+        SECRET_KEY=os.getenv('SECRET_KEY', 'your-secret-key-change-in-production'),
+        SESSION_COOKIE_SECURE=os.getenv('FLASK_ENV') == 'production',
+        SESSION_COOKIE_HTTPONLY=True,
+        SESSION_COOKIE_SAMESITE='Lax',
+        SQLALCHEMY_DATABASE_URI=DATABASE_URL,
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        TEMPLATES_AUTO_RELOAD=TEMPLATE_DEV_MODE
+    )
+    if config:
+        app.config.update(config)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS',
+                          database_engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+
+    CORS(app, origins=ALLOWED_ORIGINS)
+
+    db.init_app(app)
+    with app.app_context():
+        if db.engine.url.get_backend_name() == 'sqlite':
+            event.listen(db.engine, 'connect', set_sqlite_pragmas)
+        if PROFILER_ENABLED:
+            request_profiler.install_sql_timing(db.engine)
+        if METRICS_ENABLED and not event.contains(db.engine, 'before_cursor_execute',
+                                                  metrics_before_cursor_execute):
+            event.listen(db.engine, 'before_cursor_execute', metrics_before_cursor_execute)
+            event.listen(db.engine, 'after_cursor_execute', metrics_after_cursor_execute)
+    if PROFILER_ENABLED and not PROFILER_TOKEN:
+        logger.warning("PROFILER_ENABLED is set but PROFILER_TOKEN is empty; no requests will be profiled")
+
+    if TEMPLATE_DEV_MODE:
+        app.jinja_env.cache = {}
+    else:
+        os.makedirs(JINJA_BYTECODE_CACHE_DIR, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_BYTECODE_CACHE_DIR)
+    app.extensions['asset_manifest'] = load_asset_manifest()
+
+    app.register_blueprint(main)
+    return app
+
+default_app = None
+default_app_lock = threading.Lock()
+
+def __getattr__(name):
+    """`from app import app` (wsgi.py and the maintenance scripts) builds the app on first use"""
+    global default_app
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with default_app_lock:
+        if default_app is None:
+            default_app = create_app()
+    return default_app
 
 if __name__ == '__main__':
     # Production configuration
     port = int(os.getenv('PORT', 8080))
     debug = os.getenv('FLASK_ENV') == 'development'
     
-    with app.app_context():
-        try:
-            db.create_all()
-            init_db()
-        except Exception as e:
-            logger.warning(f"Database initialization warning: {e}")
-            # Continue anyway - tables might already exist
-    
-    logger.info(f"Starting CallRep app on port {port} (debug={debug})")
-    app.run(host='0.0.0.0', port=port, debug=debug) 
\ No newline at end of file
+    logger.info("Starting CallRep app on port %s (debug=%s)", port, debug)
+    create_app().run(host='0.0.0.0', port=port, debug=debug)
@@ -0,0 +1,5 @@
+"""
+Local, network-free benchmarks and query-count checks for CallRep.
+
+Run from the repository root, e.g. `python -m benchmarks.query_counts`.
+"""
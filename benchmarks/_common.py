@@ -0,0 +1,115 @@
+"""
+Shared helpers for the benchmark scripts: a throwaway app/database and SQL
+statement counting.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app(db_path=None):
+    """Import app.py against a throwaway SQLite file with rate limiting relaxed"""
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='callrep-bench-'), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ['SUGGESTION_INDEX_PATH'] = os.path.join(os.path.dirname(db_path), 'suggestion_index.bin')
+    os.environ.setdefault('REP_CACHE_SHARED_PATH', os.path.join(os.path.dirname(db_path), 'response_cache.db'))
+    os.environ.setdefault('RATE_LIMIT_BACKEND', 'memory')
+    os.environ.setdefault('RATE_LIMIT_REQUESTS', str(10 ** 9))
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    import app as app_module
+    with app_module.app.app_context():
+        app_module.db.create_all()
+    return app_module
+
+
+class StatementCounter:
+    """Count SQL statements issued through an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        from sqlalchemy import event
+        event.listen(self.engine, 'before_cursor_execute', self._before_execute)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, 'before_cursor_execute', self._before_execute)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def timer(results, name):
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
+
+
+OUTCOMES = ('person', 'voicemail', 'failed')
+REP_NAMES = tuple(f'Rep {chr(65 + i)} Example' for i in range(20))
+SCRIPT_TITLES = ('', 'General Support', 'Opposition', 'Request Information', 'Thank You')
+NOTE_WORDS = ('budget', 'healthcare', 'housing', 'climate', 'transit', 'schools', 'veterans',
+              'infrastructure', 'immigration', 'taxes', 'voicemail', 'staffer', 'callback')
+
+
+def call_log_rows(count, user_id='default_user', start=None, seed=0):
+    """Yield deterministic call_log row dicts spread over roughly two years"""
+    import random
+    from datetime import datetime, timedelta
+
+    rng = random.Random(seed)
+    start = start or datetime(2024, 1, 1)
+    now = datetime(2026, 1, 1)
+    for i in range(count):
+        yield {
+            'user_id': user_id,
+            'representative_name': rng.choice(REP_NAMES),
+            'phone_number': '(202) 555-0100',
+            'phone_type': 'DC Office',
+            'call_datetime': start + timedelta(minutes=rng.randrange(0, 2 * 365 * 24 * 60)),
+            'call_outcome': rng.choice(OUTCOMES),
+            'call_notes': ' '.join(rng.choice(NOTE_WORDS) for _ in range(rng.randrange(3, 15))),
+            'script_id': None,
+            'script_title': rng.choice(SCRIPT_TITLES),
+            'created_at': now,
+            'session_id': f'session-{i // 10}',
+            'is_test_data': i % 10 == 0,
+        }
+
+
+def seed_call_logs(m, count, user_id='default_user', chunk_size=50000, seed=0):
+    """Bulk insert `count` synthetic call logs with Core executemany"""
+    insert = m.CallLog.__table__.insert()
+    batch = []
+    with m.db.engine.begin() as conn:
+        for row in call_log_rows(count, user_id=user_id, seed=seed):
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                conn.execute(insert, batch)
+                batch = []
+        if batch:
+            conn.execute(insert, batch)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,51 @@
+"""
+Throughput of logging calls one request at a time (POST /api/call-logs)
+versus the batch endpoint (POST /api/call-logs/batch).
+
+    python -m benchmarks.call_log_ingest [--count 2000] [--batch-sizes 10 50 500]
+"""
+
+import argparse
+import time
+
+from benchmarks._common import call_log_rows, load_app
+
+
+def payloads(count, seed):
+    for row in call_log_rows(count, seed=seed):
+        row = dict(row)
+        row['call_datetime'] = row['call_datetime'].isoformat() + 'Z'
+        del row['created_at']
+        yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 50, 500])
+    args = parser.parse_args()
+
+    m = load_app()
+    client = m.app.test_client()
+    items = list(payloads(args.count, seed=1))
+
+    print(f"{'mode':<16} {'total (s)':>10} {'rows/s':>10} {'commits':>8}")
+
+    start = time.perf_counter()
+    for item in items:
+        assert client.post('/api/call-logs', json=item).status_code == 200
+    elapsed = time.perf_counter() - start
+    print(f"{'single-row':<16} {elapsed:>10.2f} {args.count / elapsed:>10.0f} {args.count:>8}")
+
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        for offset in range(0, len(items), batch_size):
+            response = client.post('/api/call-logs/batch', json=items[offset:offset + batch_size])
+            assert response.status_code == 201 and response.get_json()['failed'] == 0
+        elapsed = time.perf_counter() - start
+        commits = -(-args.count // batch_size)
+        print(f"{f'batch of {batch_size}':<16} {elapsed:>10.2f} {args.count / elapsed:>10.0f} {commits:>8}")
+
+
+if __name__ == '__main__':
+    main()
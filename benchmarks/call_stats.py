@@ -0,0 +1,103 @@
+"""
+Latency of GET /api/call-logs/stats at increasing history sizes, compared
+with the previous implementation that loaded every CallLog and counted in
+Python.
+
+    python -m benchmarks.call_stats [--sizes 10000 100000 1000000] [--repeat 5]
+
+"sql agg" aggregates call_log rows directly. "rollup" reads the daily
+rollup for the whole history, and "rollup+edges" uses a range that starts
+and ends mid-day, so two partial days come from call_log rows. Both rollup
+results are checked against the direct aggregation.
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks._common import load_app, seed_call_logs
+
+
+def legacy_stats(m, user_id):
+    """The pre-aggregation implementation: query.all() and dictionaries in Python"""
+    call_logs = m.CallLog.query.filter(m.CallLog.user_id == user_id).all()
+    calls_by_outcome, calls_by_date, calls_by_rep, calls_by_script = {}, {}, {}, {}
+    for log in call_logs:
+        calls_by_outcome[log.call_outcome] = calls_by_outcome.get(log.call_outcome, 0) + 1
+        date_str = log.call_datetime.strftime('%Y-%m-%d')
+        calls_by_date[date_str] = calls_by_date.get(date_str, 0) + 1
+        calls_by_rep[log.representative_name] = calls_by_rep.get(log.representative_name, 0) + 1
+        if log.script_title:
+            calls_by_script[log.script_title] = calls_by_script.get(log.script_title, 0) + 1
+    return {
+        'total_calls': len(call_logs),
+        'calls_by_outcome': calls_by_outcome,
+        'calls_by_date': calls_by_date,
+        'calls_by_rep': calls_by_rep,
+        'calls_by_script': calls_by_script
+    }
+
+
+def measure(func, repeat):
+    timings = []
+    tracemalloc.start()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, statistics.median(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-legacy-above', type=int, default=100000,
+                        help='skip the legacy run for histories larger than this')
+    args = parser.parse_args()
+
+    m = load_app()
+    client = m.app.test_client()
+
+    print(f"{'rows':>9} {'rollup rows':>12} {'sql agg (ms)':>13} {'rollup (ms)':>12} {'rollup+edges (ms)':>18} "
+          f"{'peak MB':>8} {'legacy (ms)':>12} {'peak MB':>8}")
+    with m.app.app_context():
+        # Mark the (empty) rollup complete; each size then rebuilds only its own user's rows
+        m.backfill_call_rollup()
+        for size in args.sizes:
+            user_id = f'bench-{size}'
+            seed_call_logs(m, size, user_id=user_id)
+            rollup_rows = m.backfill_call_rollup(user_id)
+
+            def endpoint():
+                response = client.get(f'/api/call-logs/stats?user_id={user_id}')
+                return response.get_json()
+
+            new_result, new_latency, new_peak = measure(
+                lambda: m.call_log_stats(user_id, use_rollup=False), args.repeat)
+            rollup_result, rollup_latency, _ = measure(endpoint, args.repeat)
+            assert rollup_result == new_result, 'rollup stats differ from call_log aggregation'
+
+            start, end = datetime(2024, 3, 15, 12, 30), datetime(2025, 9, 10, 8, 15)
+            edge_result, edge_latency, _ = measure(lambda: m.call_log_stats(user_id, start, end), args.repeat)
+            assert edge_result == m.call_log_stats(user_id, start, end, use_rollup=False), \
+                'rollup stats with partial days differ from call_log aggregation'
+
+            if size <= args.skip_legacy_above:
+                old_result, old_latency, old_peak = measure(lambda: legacy_stats(m, user_id), args.repeat)
+                assert old_result == new_result, 'aggregated stats differ from the legacy implementation'
+                m.db.session.expunge_all()
+                legacy = f'{old_latency * 1000:>12.1f} {old_peak / 2 ** 20:>8.1f}'
+            else:
+                legacy = f"{'skipped':>12} {'-':>8}"
+
+            print(f'{size:>9} {rollup_rows:>12} {new_latency * 1000:>13.1f} {rollup_latency * 1000:>12.1f} '
+                  f'{edge_latency * 1000:>18.1f} {new_peak / 2 ** 20:>8.1f} {legacy}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+POST /api/clear-database on a national-sized representative table, compared
+with the previous implementation that loaded every representative outside
+the allow-list and set deleted_at one object at a time.
+
+    python -m benchmarks.clear_database [--sizes 10000 100000 500000] [--chunk-sizes 1000 5000 50000]
+
+Each run starts from a fresh table of `size` representatives (three per
+zip, two phones each). Reports total time, the longest time the SQLite
+write lock was held by one transaction (how long other workers can be kept
+waiting), Python peak memory and the SQL statement count.
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from benchmarks._common import StatementCounter, load_app
+
+REPS_PER_ZIP = 3
+PHONES_PER_REP = 2
+
+
+def legacy_clear(m):
+    """The pre-bulk implementation: ORM objects and one attribute change each; phones left live"""
+    representatives_to_delete = m.Representative.query.filter(
+        m.Representative.zip_code != '94102',
+        m.Representative.deleted_at.is_(None)
+    ).all()
+    for rep in representatives_to_delete:
+        rep.deleted_at = datetime.now(timezone.utc)
+    m.db.session.commit()
+    return len(representatives_to_delete), 0
+
+
+def reseed(m, size):
+    tables = (m.RepresentativePhone.__table__, m.Representative.__table__)
+    with m.db.engine.begin() as conn:
+        for table in tables:
+            conn.execute(table.delete())
+        conn.execute(m.Representative.__table__.insert(), [
+            {'id': i + 1, 'zip_code': '94102' if i < REPS_PER_ZIP else f'{10000 + i // REPS_PER_ZIP:05d}',
+             'first_name': 'Rep', 'last_name': f'Number{i}', 'position': 'Representative'}
+            for i in range(size)])
+        conn.execute(m.RepresentativePhone.__table__.insert(), [
+            {'representative_id': i // PHONES_PER_REP + 1, 'phone': '(202) 555-0100', 'phone_type': 'DC Office'}
+            for i in range(size * PHONES_PER_REP)])
+
+
+class WriteLockTimer:
+    """Longest time from a transaction's first write statement to its commit (SQLite write lock held)"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.longest = 0.0
+        self._started = None
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._started is None and statement.lstrip().split(None, 1)[0].upper() in ('INSERT', 'UPDATE', 'DELETE'):
+            self._started = time.perf_counter()
+
+    def _commit(self, conn):
+        if self._started is not None:
+            self.longest = max(self.longest, time.perf_counter() - self._started)
+            self._started = None
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._before_execute)
+        event.listen(self.engine, 'commit', self._commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before_execute)
+        event.remove(self.engine, 'commit', self._commit)
+
+
+def run(m, clear):
+    m.db.session.expunge_all()
+    tracemalloc.start()
+    with StatementCounter(m.db.engine) as statements, WriteLockTimer(m.db.engine) as write_lock:
+        start = time.perf_counter()
+        deleted = clear()
+        elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return deleted, elapsed, write_lock.longest, peak, statements.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 500000])
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[1000, 5000, 50000])
+    args = parser.parse_args()
+
+    m = load_app()
+    client = m.app.test_client()
+
+    def endpoint(query=''):
+        body = client.post(f'/api/clear-database{query}').get_json()
+        return body['deleted_count'], body['deleted_phone_count']
+
+    print(f"{'reps':>8} {'mode':<14} {'deleted':>8} {'phones':>8} {'total s':>8} "
+          f"{'write lock ms':>14} {'peak MB':>8} {'SQL':>5}")
+    with m.app.app_context():
+        for size in args.sizes:
+            modes = [('legacy', lambda: legacy_clear(m))]
+            modes += [(f'bulk/{chunk}', endpoint, chunk) for chunk in args.chunk_sizes]
+            modes.append(('dry run', lambda: endpoint('?dry_run=true')))
+            for name, clear, *chunk in modes:
+                reseed(m, size)
+                if chunk:
+                    m.SOFT_DELETE_CHUNK_SIZE = chunk[0]
+                (reps, phones), elapsed, longest, peak, count = run(m, clear)
+                print(f"{size:>8} {name:<14} {reps:>8} {phones:>8} {elapsed:>8.2f} {longest * 1000:>14.1f} "
+                      f"{peak / 2 ** 20:>8.1f} {count:>5}")
+
+
+if __name__ == '__main__':
+    main()
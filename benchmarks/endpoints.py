@@ -0,0 +1,327 @@
+"""
+Latency, SQL statement count and peak memory for every route in app.py,
+against a seeded SQLite database. Runs locally with no network access:
+script generation talks to the in-process OpenRouter stub.
+
+    python -m benchmarks.endpoints [--size small|medium|large] [--iterations 50]
+    python -m benchmarks.endpoints --size medium --json bench/1.2.0.json
+    python -m benchmarks.endpoints --size medium --compare bench/1.2.0.json
+
+Sizes (override any of them individually):
+
+    small   1k call logs,    1k zips of representatives,  500 scripts
+    medium  100k call logs, 10k zips,                    2000 scripts
+    large   1M call logs,   40k zips,                    5000 scripts
+
+Each endpoint gets one warm-up request, --iterations timed requests (p50 /
+p95 / p99, median and max SQL statements) and one request under
+tracemalloc for peak Python memory. Mutating endpoints work through their
+own pool of seeded rows, so every timed request does real work.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks._common import REPO_ROOT, StatementCounter, load_app, percentile, seed_call_logs
+from benchmarks.openrouter_stub import start_stub
+
+SIZES = {
+    'small': {'call_logs': 1000, 'zips': 1000, 'scripts': 500},
+    'medium': {'call_logs': 100000, 'zips': 10000, 'scripts': 2000},
+    'large': {'call_logs': 1000000, 'zips': 40000, 'scripts': 5000},
+}
+REPS_PER_ZIP = 3
+SUGGESTIONS_PER_ZIP = 3
+# Returning every call log as one JSON array is skipped above this size
+FULL_HISTORY_LIMIT = 100000
+
+
+def insert_rows(conn, table, rows, chunk_size=50000):
+    rows = iter(rows)
+    while True:
+        chunk = [row for _, row in zip(range(chunk_size), rows)]
+        if not chunk:
+            return
+        conn.execute(table.insert(), chunk)
+
+
+def seed_dataset(m, call_logs, zips, scripts, pool):
+    """
+    Seed representatives (REPS_PER_ZIP per zip, two phones each), the same
+    number of suggestion zips, scripts and call logs. Returns the ids each
+    benchmark case draws from.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rep_count = zips * REPS_PER_ZIP
+    suggestion_zips = max(zips, pool)
+
+    with m.db.engine.begin() as conn:
+        insert_rows(conn, m.Representative.__table__, (
+            {'id': i + 1, 'zip_code': f'{10000 + i // REPS_PER_ZIP:05d}', 'first_name': 'Bench',
+             'last_name': f'Rep{i}', 'position': 'Representative', 'created_at': now}
+            for i in range(rep_count)))
+        insert_rows(conn, m.RepresentativePhone.__table__, (
+            {'id': i + 1, 'representative_id': i // 2 + 1, 'phone': f'(202) 555-{i % 10000:04d}',
+             'extension': '', 'phone_type': 'DC Office' if i % 2 == 0 else 'District Office', 'created_at': now}
+            for i in range(rep_count * 2)))
+        insert_rows(conn, m.RepresentativeSuggestion.__table__, (
+            {'id': i + 1, 'zip_code': f'{60000 + i // SUGGESTIONS_PER_ZIP:05d}', 'first_name': 'Bench',
+             'last_name': f'Suggestion{i}', 'position': 'Senator', 'state': 'CA', 'district': '',
+             'source': 'benchmark', 'created_at': now}
+            for i in range(suggestion_zips * SUGGESTIONS_PER_ZIP)))
+        insert_rows(conn, m.RepresentativeSuggestionPhone.__table__, (
+            {'id': i + 1, 'representative_suggestion_id': i + 1, 'phone': '(202) 224-3121', 'extension': '',
+             'phone_type': 'DC Office', 'created_at': now}
+            for i in range(suggestion_zips * SUGGESTIONS_PER_ZIP)))
+        insert_rows(conn, m.CallScript.__table__, (
+            {'id': i + 1, 'title': f'Benchmark script {i}', 'content': 'Hello, I am calling about [issue]. ' * 8,
+             'created_at': now, 'updated_at': now}
+            for i in range(scripts)))
+    seed_call_logs(m, call_logs)
+    m.backfill_call_rollup()
+    m.rebuild_suggestion_index()
+
+    # The last `pool` representatives, suggestion zips and scripts are consumed by mutating cases
+    pool_reps = list(range(rep_count - pool + 1, rep_count + 1))
+    return {
+        'zips': [f'{10000 + i:05d}' for i in range(zips - pool // REPS_PER_ZIP - 1)],
+        'suggestion_zips': [f'{60000 + i:05d}' for i in range(suggestion_zips)],
+        'pool_reps': pool_reps,
+        # Each pool representative's second (District Office) phone
+        'pool_phones': [(rep_id, rep_id * 2) for rep_id in pool_reps],
+        'scripts': list(range(1, scripts - pool + 1)),
+        'pool_scripts': list(range(scripts - pool + 1, scripts + 1)),
+    }
+
+
+def call_log_payload(i):
+    return {'representative_name': 'Rep A Example', 'phone_number': '(202) 555-0100', 'phone_type': 'DC Office',
+            'call_datetime': f'2026-01-01T12:{i % 60:02d}:00Z', 'call_outcome': 'voicemail',
+            'call_notes': f'benchmark call {i}'}
+
+
+def build_cases(m, data, client, call_logs):
+    """(name, method, url(i), json(i) or None, expected statuses, max iterations or None)"""
+    zips = data['zips']
+    suggestion_zips = data['suggestion_zips']
+    # Suggestions are accepted for zips that the suggestions case does not use
+    accept_zips = suggestion_zips[len(suggestion_zips) // 2:]
+    with m.app.app_context():
+        suggestion_ids = {}
+        for suggestion_id, zip_code in m.db.session.query(m.RepresentativeSuggestion.id,
+                                                          m.RepresentativeSuggestion.zip_code):
+            suggestion_ids.setdefault(zip_code, []).append(suggestion_id)
+    job = client.post('/api/generate-script', json={'notes': 'benchmark job status'}).get_json()
+    built_assets = sorted(m.load_asset_manifest().values())
+
+    cases = [
+        ('GET /', 'GET', lambda i: '/', None, (200,), None),
+        ('GET /health', 'GET', lambda i: '/health', None, (200,), None),
+        ('GET /version', 'GET', lambda i: '/version', None, (200,), None),
+        ('GET /metrics', 'GET', lambda i: '/metrics', None, (200,), None),
+        ('GET /api/cache/stats', 'GET', lambda i: '/api/cache/stats', None, (200,), None),
+        ('GET /api/suggestion-index/stats', 'GET', lambda i: '/api/suggestion-index/stats', None, (200,), None),
+        # Rate limited to 10 per window
+        ('POST /api/suggestion-index/rebuild', 'POST', lambda i: '/api/suggestion-index/rebuild', None,
+         (200,), 5),
+        ('GET /api/representatives/<zip> (miss)', 'GET', lambda i: f'/api/representatives/{zips[i % len(zips)]}',
+         None, (200,), None),
+        ('GET /api/representatives/<zip> (cached)', 'GET', lambda i: f'/api/representatives/{zips[0]}',
+         None, (200,), None),
+        ('POST /api/representatives/<zip>/suggestions', 'POST',
+         lambda i: f'/api/representatives/{suggestion_zips[i % len(accept_zips)]}/suggestions', None, (200,), None),
+        ('POST /api/representatives/<zip>/accept-suggestions', 'POST',
+         lambda i: f'/api/representatives/{accept_zips[i]}/accept-suggestions',
+         lambda i: {'suggestion_ids': suggestion_ids[accept_zips[i]]}, (200,), len(accept_zips) - 2),
+        ('POST /api/representatives', 'POST', lambda i: '/api/representatives',
+         lambda i: {'zip_code': f'{90000 + i % 9999:05d}', 'name': 'Bench Added', 'position': 'Senator',
+                    'phones': [{'phone': '2025550100', 'phone_type': 'DC Office'}]}, (201,), None),
+        ('POST /api/representatives/<id>/phones', 'POST',
+         lambda i: f"/api/representatives/{data['pool_reps'][0]}/phones",
+         lambda i: {'phone': '4155550100', 'phone_type': 'District Office'}, (201,), None),
+        ('DELETE /api/representatives/<id>/phones/<id>', 'DELETE',
+         lambda i: '/api/representatives/{}/phones/{}'.format(*data['pool_phones'][i]), None, (204,), None),
+        ('DELETE /api/representatives/<id>', 'DELETE',
+         lambda i: f"/api/representatives/{data['pool_reps'][i]}", None, (204,), None),
+        ('GET /api/scripts', 'GET', lambda i: '/api/scripts', None, (200,), None),
+        ('POST /api/scripts', 'POST', lambda i: '/api/scripts',
+         lambda i: {'title': f'New script {i}', 'content': 'Hello, I am calling about [issue].'}, (201,), None),
+        ('GET /api/scripts/<id>', 'GET', lambda i: f"/api/scripts/{data['scripts'][i % len(data['scripts'])]}",
+         None, (200,), None),
+        ('PUT /api/scripts/<id>', 'PUT', lambda i: f"/api/scripts/{data['scripts'][0]}",
+         lambda i: {'title': f'Updated {i}'}, (200,), None),
+        ('DELETE /api/scripts/<id>', 'DELETE', lambda i: f"/api/scripts/{data['pool_scripts'][i]}", None,
+         (204,), None),
+        ('GET /api/scripts/search', 'GET', lambda i: '/api/scripts/search?q=calling+issue', None, (200,), None),
+        ('POST /api/generate-script', 'POST', lambda i: '/api/generate-script',
+         lambda i: {'notes': f'benchmark notes {i}'}, (202,), None),
+        ('POST /api/generate-script (cached)', 'POST', lambda i: '/api/generate-script',
+         lambda i: {'notes': 'benchmark job status'}, (200,), None),
+        ('GET /api/generate-script/<job_id>', 'GET', lambda i: job['status_url'], None, (200, 202), None),
+        ('POST /api/generate-script/stream', 'POST', lambda i: '/api/generate-script/stream',
+         lambda i: {'notes': f'benchmark stream {i}'}, (200,), None),
+        ('POST /api/call-logs', 'POST', lambda i: '/api/call-logs', call_log_payload, (200,), None),
+        ('POST /api/call-logs/batch (50)', 'POST', lambda i: '/api/call-logs/batch',
+         lambda i: {'call_logs': [call_log_payload(i * 50 + j) for j in range(50)]}, (200, 201), None),
+        ('GET /api/call-logs?limit=100', 'GET', lambda i: '/api/call-logs?limit=100', None, (200,), None),
+        ('GET /api/call-logs?format=ndjson&limit=1000', 'GET',
+         lambda i: '/api/call-logs?format=ndjson&limit=1000', None, (200,), None),
+        ('GET /api/call-logs/stats', 'GET', lambda i: '/api/call-logs/stats', None, (200,), None),
+        ('GET /api/call-logs/search', 'GET', lambda i: '/api/call-logs/search?q=housing+budget', None, (200,), None),
+        ('GET /api/call-logs/search?sort=recent', 'GET',
+         lambda i: '/api/call-logs/search?q=housing+budget&sort=recent', None, (200,), None),
+    ]
+    if call_logs <= FULL_HISTORY_LIMIT:
+        cases.append(('GET /api/call-logs (full)', 'GET', lambda i: '/api/call-logs', None, (200,), 10))
+    if built_assets:
+        cases.append(('GET /assets/<file>', 'GET', lambda i: f'/assets/{built_assets[0]}', None, (200,), None))
+    # Destructive: runs last
+    cases.append(('POST /api/clear-database', 'POST', lambda i: '/api/clear-database', None, (200,), 3))
+    return cases
+
+
+def run_case(engine, client, method, url, body, statuses, iterations):
+    def send(i):
+        kwargs = {'json': body(i)} if body else {}
+        response = client.open(url(i), method=method, headers={'Accept-Encoding': 'gzip, br', 'X-Profile-Token': 'bench-admin'}, **kwargs)
+        response.get_data()  # drain streamed bodies
+        if response.status_code not in statuses:
+            raise AssertionError(f'{method} {url(i)} -> {response.status_code}: {response.get_data()[:200]!r}')
+        return response
+
+    send(0)
+    latencies = []
+    statements = []
+    for i in range(1, iterations + 1):
+        with StatementCounter(engine) as counter:
+            start = time.perf_counter()
+            send(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+        statements.append(counter.count)
+
+    tracemalloc.start()
+    send(iterations + 1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'statements': percentile(statements, 50),
+        'statements_max': max(statements),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    header = f"{'endpoint':<52} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'SQL':>5} {'peak KiB':>9}"
+    if baseline:
+        header += f" {'p50 vs base':>12} {'SQL vs base':>12}"
+    print(header)
+    for name, result in results.items():
+        line = (f"{name:<52} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['statements']:>5} {result['peak_kib']:>9.1f}")
+        before = (baseline or {}).get(name)
+        if before:
+            change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+            line += f" {change:>+11.0f}% {result['statements'] - before['statements']:>+12}"
+        elif baseline:
+            line += f" {'new':>12}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', choices=SIZES, default='small')
+    parser.add_argument('--call-logs', type=int)
+    parser.add_argument('--zips', type=int)
+    parser.add_argument('--scripts', type=int)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--only', help='run endpoints whose name contains this text')
+    parser.add_argument('--json', metavar='PATH', help='write results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='show changes against an earlier --json run')
+    args = parser.parse_args()
+
+    sizes = dict(SIZES[args.size])
+    for key in sizes:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+    pool = args.iterations + 2
+
+    stub, base_url = start_stub(delay=0)
+    os.environ['OPENROUTER_BASE_URL'] = base_url
+    os.environ.setdefault('OPENROUTER_API_KEY', 'stub-key')
+    os.environ.setdefault('SCRIPT_STREAMING_ENABLED', 'true')
+    os.environ['PROFILER_TOKEN'] = 'bench-admin'  # the index rebuild needs the admin token
+    m = load_app()
+    client = m.app.test_client()
+
+    start = time.perf_counter()
+    with m.app.app_context():
+        data = seed_dataset(m, sizes['call_logs'], sizes['zips'], max(sizes['scripts'], pool * 2), pool)
+    print(f"seeded {sizes['call_logs']:,} call logs, {sizes['zips']:,} zips x {REPS_PER_ZIP} representatives, "
+          f"{len(data['suggestion_zips']):,} suggestion zips, {sizes['scripts']:,} scripts "
+          f"in {time.perf_counter() - start:.1f}s\n")
+
+    cases = build_cases(m, data, client, sizes['call_logs'])
+    with m.app.app_context():
+        engine = m.db.engine
+    adapter = m.app.url_map.bind('localhost')
+    covered = set()
+    results = {}
+    for name, method, url, body, statuses, max_iterations in cases:
+        covered.add(adapter.match(url(0).split('?')[0], method=method)[0])
+        if args.only and args.only not in name:
+            continue
+        iterations = min(args.iterations, max_iterations) if max_iterations else args.iterations
+        results[name] = run_case(engine, client, method, url, body, statuses, iterations)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['endpoints']
+    print_results(results, baseline)
+
+    uncovered = sorted(rule.endpoint for rule in m.app.url_map.iter_rules()
+                       if rule.endpoint != 'static' and rule.endpoint not in covered)
+    if uncovered:
+        print(f"\nnot benchmarked: {', '.join(uncovered)}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w') as f:
+            json.dump({
+                'meta': {
+                    'revision': git_revision(),
+                    'created_at': datetime.now(timezone.utc).isoformat(),
+                    'python': platform.python_version(),
+                    'sqlite': sqlite3.sqlite_version,
+                    'sizes': sizes,
+                    'iterations': args.iterations,
+                },
+                'endpoints': results,
+            }, f, indent=2)
+        print(f'\nwrote {args.json}')
+    stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
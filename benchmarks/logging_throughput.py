@@ -0,0 +1,127 @@
+"""
+Request throughput with the legacy synchronous log handlers versus the
+queue-based pipeline in app.py (text and JSON records).
+
+    python -m benchmarks.logging_throughput [--threads 4] [--seconds 5] [--write-delay-ms 0]
+
+Every request is a representative lookup that misses the cache, and
+LOG_REQUESTS is on, so each request writes two records. --write-delay-ms
+adds a sleep to every file write to stand in for a slow or busy disk. Each
+mode runs in its own process because logging is configured once per
+process. Also times a filtered-out debug call with an f-string versus lazy
+%-style arguments.
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+from benchmarks._common import REPO_ROOT, load_app
+
+MODES = {
+    'sync': {},
+    'queue': {'LOG_FORMAT': 'text'},
+    'queue-json': {'LOG_FORMAT': 'json'},
+}
+LOOKUP_ZIPS = 10000  # more than REP_CACHE_MAX_ENTRIES, so lookups keep missing the cache
+
+
+def run_mode(mode, threads, seconds, write_delay_ms):
+    directory = tempfile.mkdtemp(prefix='callrep-logging-')
+    os.environ['LOG_FILE'] = os.path.join(directory, 'app.log')
+    os.environ['LOG_REQUESTS'] = 'true'
+    if write_delay_ms:
+        emit = logging.FileHandler.emit
+
+        def slow_emit(self, record):
+            time.sleep(write_delay_ms / 1000)
+            emit(self, record)
+        logging.FileHandler.emit = slow_emit
+    if mode == 'sync':
+        # What configure_logging() used to set up
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                            handlers=[logging.FileHandler(os.environ['LOG_FILE']), logging.StreamHandler()])
+    m = load_app(os.path.join(directory, 'bench.db'))
+
+    stop = threading.Event()
+    counts = []
+
+    def worker(offset):
+        client = m.app.test_client()
+        count = 0
+        while not stop.is_set():
+            client.get(f'/api/representatives/{10000 + (offset + count * threads) % LOOKUP_ZIPS:05d}')
+            count += 1
+        counts.append(count)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in workers:
+        thread.join()
+
+    # Records still waiting for the listener thread, and how long it takes to write them
+    queues = [handler.queue for handler in logging.getLogger().handlers if hasattr(handler, 'queue')]
+    backlog = sum(q.qsize() for q in queues)
+    start = time.perf_counter()
+    while any(q.qsize() for q in queues):
+        time.sleep(0.01)
+    return {'requests_per_second': sum(counts) / seconds, 'backlog': backlog,
+            'drain_seconds': time.perf_counter() - start}
+
+
+def lazy_formatting_ns():
+    logger = logging.getLogger('benchmarks.filtered')
+    logger.setLevel(logging.INFO)
+    values = {'zip_code': '94102', 'count': 3, 'elapsed': 0.0123}
+    eager = min(timeit.repeat(
+        lambda: logger.debug(f"Found {values['count']} for {values['zip_code']} in {values['elapsed'] * 1000:.1f} ms"),
+        number=100000, repeat=5)) / 100000 * 1e9
+    lazy = min(timeit.repeat(
+        lambda: logger.debug("Found %s for %s in %.1f ms", values['count'], values['zip_code'],
+                             values['elapsed'] * 1000),
+        number=100000, repeat=5)) / 100000 * 1e9
+    return eager, lazy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-delay-ms', type=float, default=0)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        result = run_mode(args.mode, args.threads, args.seconds, args.write_delay_ms)
+        print('RESULT ' + json.dumps(result))
+        return
+
+    print(f"{args.threads} threads, {args.seconds:g}s per mode, file write delay {args.write_delay_ms:g} ms")
+    print(f"{'mode':<11} {'requests/s':>11} {'queued at end':>14} {'drain s':>8}")
+    for name, overrides in MODES.items():
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.logging_throughput', '--mode', name,
+             '--threads', str(args.threads), '--seconds', str(args.seconds),
+             '--write-delay-ms', str(args.write_delay_ms)],
+            cwd=REPO_ROOT, env=dict(os.environ, **overrides), capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(next(line for line in output.splitlines() if line.startswith('RESULT '))[7:])
+        print(f"{name:<11} {result['requests_per_second']:>11.0f} {result['backlog']:>14,} "
+              f"{result['drain_seconds']:>8.2f}")
+
+    eager, lazy = lazy_formatting_ns()
+    print(f"\nfiltered debug call: f-string {eager:.0f} ns, lazy %-args {lazy:.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
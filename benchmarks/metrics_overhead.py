@@ -0,0 +1,122 @@
+"""
+Cost of the /metrics instrumentation.
+
+    python -m benchmarks.metrics_overhead [--requests 20000] [--workers 8]
+
+Measures a single Counter.inc / Histogram.observe, the per-request hooks
+(start, status, record with three metric updates) called directly inside
+a request context, the end-to-end difference on GET /version with
+METRICS_ENABLED on and off, the time to render /metrics when merging
+the files of several workers, and the first render after as many workers
+exited (which folds their files into the cumulative file).
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from benchmarks._common import load_app, percentile
+
+
+def per_call_ns(stmt, number):
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def request_us(client, path, count):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        client.get(path)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    m = load_app()
+    import metrics
+
+    registry = metrics.Registry()
+    counter = registry.counter('bench_total', 'bench', ('route', 'method', 'status'))
+    histogram = registry.histogram('bench_seconds', 'bench', ('route', 'method'))
+    # Reference point for reading the numbers below on a slower or faster machine
+    print(f"empty call       {per_call_ns(lambda: None, 200000):7.0f} ns")
+    print(f"Counter.inc      {per_call_ns(lambda: counter.inc('/version', 'GET', '200'), 200000):7.0f} ns")
+    print(f"Histogram.observe {per_call_ns(lambda: histogram.observe(0.0042, '/version', 'GET'), 200000):6.0f} ns")
+
+    response = m.app.response_class('ok')
+    with m.app.test_request_context('/version'):
+        def hooks():
+            m.start_request_metrics()
+            m.record_response_status(response)
+            m.record_request_metrics(None)
+        print(f"request hooks    {per_call_ns(hooks, 50000) / 1000:7.2f} µs per request")
+
+    client = m.app.test_client()
+    request_us(client, '/version', 500)  # warm up
+    rounds = {True: [], False: []}
+    for _ in range(5):
+        for enabled in (False, True):
+            m.METRICS_ENABLED = enabled
+            rounds[enabled].append(request_us(client, '/version', args.requests // 10))
+    m.METRICS_ENABLED = True
+    off, on = min(rounds[False]), min(rounds[True])
+    print(f"GET /version p50 {off:7.1f} µs off, {on:.1f} µs on ({on - off:+.1f} µs)")
+
+    # Multiprocess render: every worker has seen every route
+    routes = sorted(rule.rule for rule in m.app.url_map.iter_rules())
+    directory = tempfile.mkdtemp(prefix='callrep-metrics-')
+    worker = metrics.Registry(directory)
+    worker_requests = worker.counter('callrep_http_requests_total', '', ('route', 'method', 'status'))
+    worker_duration = worker.histogram('callrep_http_request_duration_seconds', '', ('route', 'method'))
+    for route in routes:
+        worker_requests.inc(route, 'GET', '200', amount=100)
+        worker_duration.observe(0.01, route, 'GET')
+    worker.flush()
+    path = os.path.join(directory, worker._process_file())
+    # Live workers: named after this (running) process so they are not folded
+    for n in range(1, args.workers):
+        os.link(path, os.path.join(directory, f'{os.getpid()}-worker{n}.json'))
+
+    reader = metrics.Registry(directory)
+    reader.counter('callrep_http_requests_total', '', ('route', 'method', 'status'))
+    reader.histogram('callrep_http_request_duration_seconds', '', ('route', 'method'))
+    start = time.perf_counter()
+    body = reader.render()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"render           {elapsed:7.2f} ms for {args.workers} workers x {len(routes)} routes "
+          f"({len(body):,} bytes)")
+
+    # The same files, left behind by a process that has exited
+    exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                            capture_output=True, text=True, check=True)
+    dead_pid = int(exited.stdout)
+    for filename in os.listdir(directory):
+        if filename.endswith('.json'):
+            os.rename(os.path.join(directory, filename),
+                      os.path.join(directory, f"{dead_pid}-{filename.split('-', 1)[1]}"))
+    start = time.perf_counter()
+    folded = reader.render()
+    fold_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    reader.render()
+    after_ms = (time.perf_counter() - start) * 1000
+    assert folded == body, 'folding exited workers changed the totals'
+    left = sorted(filename for filename in os.listdir(directory) if filename.endswith('.json'))
+    print(f"render           {fold_ms:7.2f} ms folding {args.workers} exited workers, then {after_ms:.2f} ms "
+          f"(files left: {', '.join(left)})")
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
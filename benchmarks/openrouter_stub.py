@@ -0,0 +1,123 @@
+"""
+Minimal local stand-in for the OpenRouter chat completions API.
+
+    python -m benchmarks.openrouter_stub [--port 8765] [--delay 1.0]
+
+Then run the app with OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1.
+Every request to /api/v1/chat/completions takes `delay` seconds and answers
+with a canned completion. Requests whose prompt asks for a title get a short
+title back, everything else gets a script. Requests with "stream": true get
+Server-Sent Events in OpenRouter's format: the first word after
+`first_token_delay` seconds and the rest spread over the remaining delay.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCRIPT_TEXT = ("Hi, I'd like to register an opinion. My name is __ and I'm a constituent from @ZipCode. "
+               "I'm calling @RepType @LastName to ask you to support funding for public transit. "
+               "Reliable buses and trains matter to working families in our district. "
+               "Thank you and have a great day.")
+TITLE_TEXT = "Support Public Transit Funding"
+
+
+def completion_text(payload):
+    prompt = payload['messages'][-1]['content']
+    return TITLE_TEXT if 'title for a phone call script' in prompt else SCRIPT_TEXT
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    delay = 1.0
+    first_token_delay = 0.1
+    status = 200
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.endswith('/chat/completions'):
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        if self.status != 200:
+            time.sleep(self.delay)
+            self._send_json(self.status, {'error': {'message': 'stub failure'}})
+            return
+
+        if payload.get('stream'):
+            self._send_stream(completion_text(payload))
+            return
+
+        time.sleep(self.delay)
+        self._send_json(200, {
+            'id': 'stub-completion',
+            'model': payload.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': completion_text(payload)},
+                         'finish_reason': 'stop'}]
+        })
+
+    def _send_stream(self, text):
+        words = text.split(' ')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        self.wfile.write(b': OPENROUTER PROCESSING\n\n')
+        time.sleep(self.first_token_delay)
+        per_word = max(self.delay - self.first_token_delay, 0) / max(len(words) - 1, 1)
+        for index, word in enumerate(words):
+            if index:
+                time.sleep(per_word)
+            chunk = {'choices': [{'index': 0, 'delta': {'content': word if index == 0 else ' ' + word}}]}
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+            self.wfile.flush()
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_stub(port=0, delay=1.0, status=200, first_token_delay=None):
+    """Start the stub in a daemon thread. Returns (server, base_url)"""
+    if first_token_delay is None:
+        first_token_delay = delay / 10
+    handler = type('ConfiguredStubHandler', (StubHandler,),
+                   {'delay': delay, 'status': status, 'first_token_delay': first_token_delay})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/api/v1'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=1.0)
+    parser.add_argument('--status', type=int, default=200, help='HTTP status to answer with')
+    args = parser.parse_args()
+
+    server, base_url = start_stub(args.port, args.delay, args.status)
+    print(f'OpenRouter stub listening on {base_url} (delay {args.delay}s)')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Check that the representative lookup, suggestion and accept-suggestion paths
+issue a constant number of SQL statements no matter how many representatives
+a zip code has.
+
+    python -m benchmarks.query_counts
+
+Exits non-zero if any endpoint's statement count grows with the number of
+representatives.
+"""
+
+import sys
+from datetime import datetime, timezone
+
+from benchmarks._common import StatementCounter, load_app
+
+SIZES = (1, 5, 25)
+
+
+def seed(m, zip_code, count):
+    """Add `count` representatives and suggestions for zip_code, each with a live and a deleted phone"""
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        rep = m.Representative(zip_code=zip_code, first_name='Rep', last_name=f'Number{i}',
+                               position='Representative')
+        rep.phone_numbers = [
+            m.RepresentativePhone(phone='(202) 555-0100', phone_type='DC Office'),
+            m.RepresentativePhone(phone='(202) 555-0199', phone_type='Old Office', deleted_at=now),
+        ]
+        suggestion = m.RepresentativeSuggestion(zip_code=zip_code, first_name='Sug', last_name=f'Number{i}',
+                                                position='Senator', state='CA', source='benchmark')
+        suggestion.phone_numbers = [
+            m.RepresentativeSuggestionPhone(phone='(202) 555-0101', phone_type='DC Office'),
+            m.RepresentativeSuggestionPhone(phone='(415) 555-0101', phone_type='District Office'),
+        ]
+        m.db.session.add_all([rep, suggestion])
+    m.db.session.commit()
+
+
+def count_statements(m, client, method, url, **kwargs):
+    m.representatives_cache.clear()
+    with StatementCounter(m.db.engine) as counter:
+        response = getattr(client, method)(url, **kwargs)
+    assert response.status_code < 400, (url, response.status_code, response.data[:200])
+    return counter.count, response
+
+
+def main():
+    m = load_app()
+    client = m.app.test_client()
+    results = {}
+
+    with m.app.app_context():
+        for size in SIZES:
+            rep_zip = f'{10000 + size:05d}'
+            suggestion_zip = f'{20000 + size:05d}'
+            seed(m, rep_zip, size)
+            seed(m, suggestion_zip, size)
+            # Suggestions are only offered for zips without representatives
+            m.Representative.query.filter_by(zip_code=suggestion_zip).delete()
+            m.db.session.commit()
+
+            get_count, response = count_statements(m, client, 'get', f'/api/representatives/{rep_zip}')
+            assert all(len(rep['phone_numbers']) == 1 for rep in response.get_json())
+
+            suggest_count, response = count_statements(
+                m, client, 'post', f'/api/representatives/{suggestion_zip}/suggestions')
+            suggestion_ids = [s['id'] for s in response.get_json()['suggested_representatives']]
+
+            accept_count, response = count_statements(
+                m, client, 'post', f'/api/representatives/{suggestion_zip}/accept-suggestions',
+                json={'suggestion_ids': suggestion_ids})
+            assert len(response.get_json()['representatives']) == size
+
+            results[size] = {
+                'get_representatives': get_count,
+                'get_representative_suggestions': suggest_count,
+                'accept_suggested_representatives': accept_count,
+            }
+
+    print(f"{'endpoint':<36}" + ''.join(f'{f"k={size}":>8}' for size in SIZES))
+    failed = False
+    for endpoint in results[SIZES[0]]:
+        counts = [results[size][endpoint] for size in SIZES]
+        print(f'{endpoint:<36}' + ''.join(f'{count:>8}' for count in counts))
+        if len(set(counts)) != 1:
+            failed = True
+            print(f'  FAIL: {endpoint} statement count grows with representatives')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
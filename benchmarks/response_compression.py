@@ -0,0 +1,76 @@
+"""
+Bytes on the wire and CPU cost of compressing JSON API responses.
+
+    python -m benchmarks.response_compression [--sizes 100 1000 10000] [--repeat 20]
+
+For each call-log history size, fetches GET /api/call-logs uncompressed and
+with the configured gzip/brotli settings, then compresses the same body at
+several levels to show the size/CPU trade-off behind COMPRESS_LEVEL and
+COMPRESS_BROTLI_QUALITY.
+"""
+
+import argparse
+import gzip
+import time
+
+from benchmarks._common import load_app, seed_call_logs
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 11)
+
+
+def cpu_ms(func, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        result = func()
+    return (time.process_time() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    m = load_app()
+    client = m.app.test_client()
+    seeded = 0
+
+    print(f'configured: gzip level {m.COMPRESS_LEVEL}, brotli quality {m.COMPRESS_BROTLI_QUALITY}, '
+          f'threshold {m.COMPRESS_MIN_SIZE} bytes')
+    for size in sorted(args.sizes):
+        with m.app.app_context():
+            seed_call_logs(m, size - seeded, seed=size)
+        seeded = size
+
+        print(f'\n{size:,} call logs (GET /api/call-logs)')
+        print(f"   {'Accept-Encoding':<16} {'bytes':>11} {'request ms':>11}")
+        body = None
+        for accept in ('identity', 'gzip', 'br'):
+            elapsed, response = cpu_ms(lambda: client.get('/api/call-logs', headers={'Accept-Encoding': accept}),
+                                       max(1, args.repeat // 4))
+            assert response.status_code == 200
+            if accept == 'identity':
+                body = response.data
+            print(f"   {accept:<16} {len(response.data):>11,} {elapsed:>11.1f}  "
+                  f"({response.headers.get('Content-Encoding', 'none')})")
+
+        print(f"   {'codec':<16} {'bytes':>11} {'ratio':>7} {'cpu ms':>8}")
+        codecs = [(f'gzip -{level}', lambda level=level: gzip.compress(body, compresslevel=level))
+                  for level in GZIP_LEVELS]
+        if brotli is not None:
+            codecs += [(f'brotli q{quality}', lambda quality=quality: brotli.compress(body, quality=quality))
+                       for quality in BROTLI_QUALITIES]
+        for name, compress in codecs:
+            repeat = 1 if name == 'brotli q11' else args.repeat
+            elapsed, compressed = cpu_ms(compress, repeat)
+            print(f'   {name:<16} {len(compressed):>11,} {len(body) / len(compressed):>6.1f}x {elapsed:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
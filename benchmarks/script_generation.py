@@ -0,0 +1,108 @@
+"""
+Exercise AI script generation end to end against the local OpenRouter stub.
+
+    python -m benchmarks.script_generation [--jobs 8] [--delay 1.0]
+
+Reports how long POST /api/generate-script holds the request thread, how
+long each job takes to finish (script and title are requested concurrently,
+so roughly one upstream delay rather than two), how fast repeated notes are
+answered from the generated script cache, time to first token on the
+streaming endpoint, and checks the failure paths fall back to the
+external-tool prompt.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks._common import load_app
+from benchmarks.openrouter_stub import SCRIPT_TEXT, TITLE_TEXT, start_stub
+
+
+def wait_for(client, status_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = client.get(status_url)
+        if response.status_code != 202:
+            return response.get_json()
+        time.sleep(0.02)
+    raise TimeoutError(status_url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=8)
+    parser.add_argument('--delay', type=float, default=1.0)
+    args = parser.parse_args()
+
+    stub, base_url = start_stub(delay=args.delay)
+    failing_stub, failing_url = start_stub(delay=0, status=503)
+    os.environ['OPENROUTER_BASE_URL'] = base_url
+    os.environ.setdefault('OPENROUTER_API_KEY', 'stub-key')
+    os.environ.setdefault('SCRIPT_STREAMING_ENABLED', 'true')
+    m = load_app()
+    client = m.app.test_client()
+
+    enqueue_times = []
+    submitted = []
+    start = time.perf_counter()
+    for i in range(args.jobs):
+        t0 = time.perf_counter()
+        response = client.post('/api/generate-script', json={'notes': f'transit funding #{i}'})
+        enqueue_times.append(time.perf_counter() - t0)
+        assert response.status_code == 202, response.data
+        submitted.append(response.get_json()['status_url'])
+
+    results = [wait_for(client, url) for url in submitted]
+    total = time.perf_counter() - start
+    assert all(r['status'] == 'done' and r['script'] == SCRIPT_TEXT and r['title'] == TITLE_TEXT for r in results)
+
+    print(f'upstream delay per completion: {args.delay:.2f}s, workers: {m.SCRIPT_JOB_WORKERS}')
+    print(f'enqueue latency   median {statistics.median(enqueue_times) * 1000:.1f} ms, '
+          f'max {max(enqueue_times) * 1000:.1f} ms')
+    print(f'{args.jobs} jobs finished in {total:.2f}s '
+          f'(sequential blocking calls would take {args.jobs * 2 * args.delay:.2f}s)')
+
+    # Same notes modulo case and whitespace: served from the script cache
+    t0 = time.perf_counter()
+    response = client.post('/api/generate-script', json={'notes': '  Transit   FUNDING #0 '})
+    cached_latency = time.perf_counter() - t0
+    cached = response.get_json()
+    assert response.status_code == 200 and cached['cached'] and cached['script'] == SCRIPT_TEXT
+    stats = client.get('/api/cache/stats').get_json()['generated_scripts']
+    print(f'repeat notes served from cache in {cached_latency * 1000:.1f} ms '
+          f'(hit rate {stats["hit_rate"]:.0%}, saved {stats["saved_upstream_seconds"]:.2f}s upstream)')
+
+    # Streaming: time to first token event vs the full script
+    t0 = time.perf_counter()
+    response = client.post('/api/generate-script/stream', json={'notes': 'streaming transit funding'},
+                           buffered=False)
+    first_token = None
+    events = []
+    for line in response.response:
+        line = line.decode() if isinstance(line, bytes) else line
+        for event_line in line.splitlines():
+            if event_line.startswith('event: '):
+                events.append(event_line[len('event: '):])
+                if events[-1] == 'token' and first_token is None:
+                    first_token = time.perf_counter() - t0
+    streamed_total = time.perf_counter() - t0
+    assert events[-1] == 'done' and 'title' in events, events
+    print(f'streamed script: first token after {first_token * 1000:.0f} ms, '
+          f'complete after {streamed_total * 1000:.0f} ms ({events.count("token")} token events)')
+
+    m.OPENROUTER_BASE_URL = failing_url
+    response = client.post('/api/generate-script', json={'notes': 'upstream down'})
+    result = wait_for(client, response.get_json()['status_url'])
+    assert result['status'] == 'failed' and result['mode'] == 'external' and result['prompt']
+    response = client.post('/api/generate-script/stream', json={'notes': 'upstream down'})
+    assert b'event: error' in response.data
+    print('upstream failure falls back to the external-tool prompt: ok')
+
+    stub.shutdown()
+    failing_stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Full-text search over call notes at increasing history sizes.
+
+    python -m benchmarks.search [--sizes 10000 100000 1000000] [--repeat 5]
+
+For each size: insert throughput with the FTS triggers versus without
+them, the time to rebuild the index from scratch, and the p50 latency of
+GET /api/call-logs/search for a rare word (0.1% of notes), a common word
+(in about half the notes), two common words, page 10 of the common word
+and the common word newest first (sort=recent).
+The baseline is what the client had to do before: fetch every call log and
+filter the notes in Python (skipped above --skip-legacy-above rows), plus a
+server-side LIKE scan for reference.
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks._common import load_app, seed_call_logs
+
+RARE_WORD = 'filibuster'
+RARE_EVERY = 1000
+QUERIES = (
+    ('rare word', f'q={RARE_WORD}'),
+    ('common word', 'q=housing'),
+    ('two words', 'q=housing+budget'),
+    ('page 10', 'q=housing&page=10'),
+    ('recent', 'q=housing&sort=recent'),
+)
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def seed_rows_per_second(m, size, user_id, with_triggers):
+    """Insert `size` call logs, optionally with the FTS triggers dropped for the duration"""
+    with m.db.engine.begin() as conn:
+        triggers = conn.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'call_log'").fetchall()
+        if not with_triggers:
+            for name, _ in triggers:
+                conn.exec_driver_sql(f'DROP TRIGGER {name}')
+    start = time.perf_counter()
+    seed_call_logs(m, size, user_id=user_id)
+    elapsed = time.perf_counter() - start
+    if not with_triggers:
+        with m.db.engine.begin() as conn:
+            for _, sql in triggers:
+                conn.exec_driver_sql(sql)
+    return size / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-legacy-above', type=int, default=100000)
+    args = parser.parse_args()
+
+    m = load_app()
+    client = m.app.test_client()
+    with m.app.app_context():
+        for size in args.sizes:
+            user_id = f'bench-{size}'
+            # The same rows with the triggers dropped, then with them in place
+            plain_rate = seed_rows_per_second(m, size, f'{user_id}-plain', with_triggers=False)
+            fts_rate = seed_rows_per_second(m, size, user_id, with_triggers=True)
+            with m.db.engine.begin() as conn:
+                conn.execute(m.db.text(
+                    "UPDATE call_log SET call_notes = call_notes || ' ' || :word "
+                    "WHERE user_id = :user_id AND id % :every = 0"),
+                    {'word': RARE_WORD, 'user_id': user_id, 'every': RARE_EVERY})
+                start = time.perf_counter()
+                conn.exec_driver_sql("INSERT INTO call_log_fts(call_log_fts) VALUES ('rebuild')")
+                rebuild = time.perf_counter() - start
+
+            print(f"\n{size:,} call logs for the searched user ({m.CallLog.query.count():,} in total)")
+            print(f"  insert: {plain_rate:,.0f} rows/s without FTS triggers, {fts_rate:,.0f} rows/s with them "
+                  f"({plain_rate / fts_rate - 1:+.0%} time)")
+            print(f"  rebuild whole index: {rebuild:.2f}s")
+            print(f"  {'query':<12} {'matches':>9} {'FTS p50 ms':>11} {'LIKE ms':>9} {'legacy ms':>10}")
+            for name, params in QUERIES:
+                url = f'/api/call-logs/search?user_id={user_id}&{params}'
+                body = client.get(url).get_json()
+                assert body['success'] and body['results'], url
+                latency = median_ms(lambda: client.get(url), args.repeat)
+
+                words = params.split('&')[0][2:].split('+')
+                like = m.CallLog.query.filter(m.CallLog.user_id == user_id,
+                                              *(m.CallLog.call_notes.like(f'%{word}%') for word in words))
+                matches = like.count()
+                like_ms = median_ms(lambda: like.limit(20).all() and like.count(), args.repeat)
+                m.db.session.expunge_all()
+                if size <= args.skip_legacy_above:
+                    def legacy():
+                        logs = client.get(f'/api/call-logs?user_id={user_id}').get_json()['call_logs']
+                        return [log for log in logs if all(word in (log['call_notes'] or '') for word in words)]
+                    legacy_ms = f'{median_ms(legacy, 1):>10.0f}'
+                else:
+                    legacy_ms = f"{'skipped':>10}"
+                print(f"  {name:<12} {matches:>9,} {latency:>11.1f} {like_ms:>9.1f} {legacy_ms}")
+
+
+if __name__ == '__main__':
+    main()
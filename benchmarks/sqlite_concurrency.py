@@ -0,0 +1,121 @@
+"""
+Read latency while call logs are being written, with the legacy SQLite
+settings (rollback journal, synchronous=FULL, default cache) versus the
+production engine profile in app.py (WAL, synchronous=NORMAL, mmap, larger
+cache).
+
+    python -m benchmarks.sqlite_concurrency [--readers 4] [--writers 2] [--write-rate 40] [--seconds 10]
+
+Each profile runs in its own process against a fresh database, since the
+journal mode is stored in the database file.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks._common import REPO_ROOT, load_app, percentile, seed_call_logs
+
+PROFILES = {
+    'legacy': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_CACHE_SIZE': '-2000',
+    },
+    'production': {},
+}
+
+
+def run_profile(readers, writers, write_rate, seconds, seed_rows):
+    m = load_app()
+    with m.app.app_context():
+        seed_call_logs(m, seed_rows)
+    client = m.app.test_client()
+    payload = {'representative_name': 'Rep A Example', 'phone_number': '(202) 555-0100',
+               'phone_type': 'DC Office', 'call_datetime': '2026-01-01T12:00:00Z',
+               'call_outcome': 'voicemail', 'call_notes': 'benchmark write'}
+
+    stop = threading.Event()
+    latencies = []
+    counts = {'reads': 0, 'read_errors': 0, 'writes': 0, 'write_errors': 0}
+    lock = threading.Lock()
+
+    def reader():
+        while not stop.is_set():
+            start = time.perf_counter()
+            status = client.get('/api/call-logs?limit=50').status_code
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if status == 200:
+                    counts['reads'] += 1
+                    latencies.append(elapsed)
+                else:
+                    counts['read_errors'] += 1
+
+    def writer():
+        # Paced so both profiles carry the same write load
+        interval = writers / write_rate
+        next_write = time.perf_counter()
+        while not stop.is_set():
+            status = client.post('/api/call-logs', json=payload).status_code
+            with lock:
+                counts['writes' if status == 200 else 'write_errors'] += 1
+            next_write += interval
+            stop.wait(max(0, next_write - time.perf_counter()))
+
+    threads = ([threading.Thread(target=reader) for _ in range(readers)] +
+               [threading.Thread(target=writer) for _ in range(writers)])
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return dict(counts,
+                reads_per_second=counts['reads'] / seconds,
+                writes_per_second=counts['writes'] / seconds,
+                p50=percentile(latencies, 50), p95=percentile(latencies, 95), p99=percentile(latencies, 99))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--write-rate', type=float, default=40, help='target writes per second across writers')
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--seed-rows', type=int, default=20000)
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        result = run_profile(args.readers, args.writers, args.write_rate, args.seconds, args.seed_rows)
+        print('RESULT ' + json.dumps(result))
+        return
+
+    print(f'{args.readers} readers (GET /api/call-logs?limit=50), {args.writers} writers '
+          f'(POST /api/call-logs, {args.write_rate:g}/s total), {args.seconds:g}s per profile')
+    print(f"{'profile':<11} {'reads/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'writes/s':>9} {'errors':>7}")
+    for name, overrides in PROFILES.items():
+        env = dict(os.environ, **overrides)
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.sqlite_concurrency', '--profile', name,
+             '--readers', str(args.readers), '--writers', str(args.writers),
+             '--write-rate', str(args.write_rate),
+             '--seconds', str(args.seconds), '--seed-rows', str(args.seed_rows)],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(next(line for line in output.splitlines() if line.startswith('RESULT '))[7:])
+        print(f"{name:<11} {result['reads_per_second']:>8.0f} {result['p50']:>8.1f} {result['p95']:>8.1f} "
+              f"{result['p99']:>8.1f} {result['writes_per_second']:>9.0f} "
+              f"{result['read_errors'] + result['write_errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Cold start cost of a worker: import time, create_app() time and
+time-to-first-response, each measured in a fresh interpreter.
+
+    python -m benchmarks.startup [--runs 5]
+
+Also reports whether the outbound HTTP stack (requests) was imported
+before the first script generation; it should not be.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks._common import REPO_ROOT, percentile
+
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+application = app_module.create_app()
+created = time.perf_counter()
+client = application.test_client()
+health = client.get('/health')
+first_response = time.perf_counter()
+index = client.get('/')
+index_response = time.perf_counter()
+assert health.status_code == 200 and index.status_code == 200
+print('RESULT ' + json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_response_ms': (first_response - created) * 1000,
+    'index_ms': (index_response - first_response) * 1000,
+    'total_ms': (index_response - start) * 1000,
+    'requests_imported': 'requests' in sys.modules,
+}))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='callrep-startup-')
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+               RATE_LIMIT_STORAGE=os.path.join(workdir, 'rate_limit.db'),
+               JINJA_BYTECODE_CACHE_DIR=os.path.join(workdir, 'jinja_cache'),
+               SUGGESTION_INDEX_PATH=os.path.join(workdir, 'suggestion_index.bin'))
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'],
+                   cwd=REPO_ROOT, env=env, capture_output=True, check=True)
+
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-c', CHILD], cwd=REPO_ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(next(line for line in output.splitlines() if line.startswith('RESULT '))[7:]))
+
+    print(f'{args.runs} cold starts (median / max)')
+    for key, label in (('import_ms', 'import app'), ('create_app_ms', 'create_app()'),
+                       ('first_response_ms', 'first response (/health)'), ('index_ms', 'first index render'),
+                       ('total_ms', 'total')):
+        samples = [result[key] for result in results]
+        print(f'   {label:<26} {percentile(samples, 50):8.1f} ms {max(samples):8.1f} ms')
+    print(f"requests imported at startup: {any(result['requests_imported'] for result in results)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare suggestion lookups through the mmap'd ZIP index with the
+database query it replaces.
+
+    python -m benchmarks.suggestion_index [--zips 40000] [--per-zip 12] [--lookups 20000]
+
+Loads a synthetic crosswalk (with some ZIP+4 rows) through the bulk loader,
+which also builds the index, then times random lookups both ways and
+reports the index footprint.
+"""
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+
+from benchmarks._common import load_app, percentile
+from benchmarks.suggestion_load import write_crosswalk
+
+
+def db_lookup(m, zip_code):
+    """The pre-index query in get_representative_suggestions"""
+    rows = (m.RepresentativeSuggestion.query
+            .options(m.selectinload(m.RepresentativeSuggestion.phone_numbers))
+            .filter_by(zip_code=zip_code)
+            .all())
+    return [row.to_dict() for row in rows]
+
+
+def time_lookups(lookup, zip_codes):
+    samples = []
+    for zip_code in zip_codes:
+        start = time.perf_counter()
+        lookup(zip_code)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--zips', type=int, default=40000)
+    parser.add_argument('--per-zip', type=int, default=12)
+    parser.add_argument('--lookups', type=int, default=20000)
+    args = parser.parse_args()
+
+    m = load_app()
+    import load_suggestions
+
+    path = os.path.join(tempfile.mkdtemp(prefix='callrep-crosswalk-'), 'crosswalk.csv')
+    write_crosswalk(path, args.zips, args.per_zip)
+    with open(path, 'a') as f:
+        # A split zip: 10001-0001 has its own district, the rest of 10001 uses the ZIP5 rows
+        f.write('10001-0001,Split,Member,Representative,NY,99,crosswalk,(212) 555-9999,,District Office\n')
+    load_suggestions.load_suggestions(load_suggestions.read_input(path), log=lambda message: None)
+
+    with m.app.app_context():
+        index = m.get_suggestion_index()
+        stats = index.stats()
+        print(f"index: {stats['zip_codes']:,} zip codes, {stats['suggestions']:,} suggestions, "
+              f"{stats['records']:,} distinct records, {stats['bytes'] / 2**20:.1f} MiB mapped")
+        for section, size in stats['section_bytes'].items():
+            print(f'   {section:<15} {size / 2**20:8.2f} MiB')
+
+        exact = index.lookup('10001-0001')
+        fallback = index.lookup('10001-0002')
+        assert [s['last_name'] for s in exact] == ['Member'] and exact[0]['zip_code'] == '10001-0001'
+        assert len(fallback) == args.per_zip and fallback[0]['zip_code'] == '10001'
+        assert db_lookup(m, '10002') == index.lookup('10002'), 'index and database disagree'
+        print('ZIP+4 exact match and 5-digit fallback OK; results match the database')
+
+        rng = random.Random(0)
+        zip_codes = [f'{10000 + rng.randrange(args.zips):05d}' for _ in range(args.lookups)]
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        index_samples = time_lookups(index.lookup, zip_codes)
+        db_samples = time_lookups(lambda zip_code: db_lookup(m, zip_code), zip_codes[:args.lookups // 10])
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    for name, samples in (('index', index_samples), ('database', db_samples)):
+        print(f'{name:<9} p50 {percentile(samples, 50):8.1f}us  p99 {percentile(samples, 99):8.1f}us  '
+              f'({len(samples)} lookups)')
+    print(f'peak RSS grew {(rss_after - rss_before) / 1024:.1f} MiB while timing')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Time the bulk suggestion loader on a synthetic national crosswalk and compare
+with the old row-at-a-time ORM inserts from populate_suggestions.py.
+
+    python -m benchmarks.suggestion_load [--zips 40000] [--per-zip 12] [--legacy-sample 5000]
+
+Also checks that a reader polling a zip during the load only ever sees the
+complete old dataset or the complete new one.
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from benchmarks._common import load_app
+
+
+def write_crosswalk(path, zips, per_zip):
+    """One CSV row per suggestion phone: per_zip suggestions per zip, two phones each"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['zip_code', 'first_name', 'last_name', 'position', 'state', 'district', 'source',
+                         'phone', 'extension', 'phone_type'])
+        for z in range(zips):
+            zip_code = f'{10000 + z:05d}'
+            for i in range(per_zip):
+                position = 'Senator' if i < 2 else 'Representative'
+                row = [zip_code, 'Member', f'Number{i}', position, 'NY', '' if i < 2 else str(i), 'crosswalk']
+                writer.writerow(row + ['(202) 224-3121', '', 'DC Office'])
+                writer.writerow(row + [f'(212) 555-{i:04d}', str(i), 'District Office'])
+    return zips * per_zip
+
+
+def legacy_insert(m, count):
+    """populate_suggestions.py before the loader: add() + flush() per suggestion"""
+    with m.app.app_context():
+        for i in range(count):
+            suggestion = m.RepresentativeSuggestion(zip_code='99999', first_name='Legacy', last_name=f'N{i}',
+                                                    position='Senator', state='NY', district='', source='legacy')
+            m.db.session.add(suggestion)
+            m.db.session.flush()
+            m.db.session.add(m.RepresentativeSuggestionPhone(representative_suggestion_id=suggestion.id,
+                                                             phone='(202) 224-3121', extension='',
+                                                             phone_type='DC Office'))
+        m.db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--zips', type=int, default=40000)
+    parser.add_argument('--per-zip', type=int, default=12)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--legacy-sample', type=int, default=5000)
+    args = parser.parse_args()
+
+    m = load_app()
+    import load_suggestions
+
+    workdir = tempfile.mkdtemp(prefix='callrep-crosswalk-')
+    path = os.path.join(workdir, 'crosswalk.csv')
+    total = write_crosswalk(path, args.zips, args.per_zip)
+    print(f'crosswalk: {args.zips} zips, {total} suggestions, {total * 2} phones')
+
+    start = time.perf_counter()
+    legacy_insert(m, args.legacy_sample)
+    legacy_rate = args.legacy_sample / (time.perf_counter() - start)
+    print(f'legacy ORM inserts: {legacy_rate:,.0f} suggestions/s '
+          f'(~{total / legacy_rate / 60:.1f} min for the full crosswalk)')
+
+    # A reader polls one zip throughout: it must always see 0 (old data) or per_zip rows
+    db_path = load_suggestions.database_path()
+    seen = set()
+    stop = threading.Event()
+
+    def reader():
+        conn = sqlite3.connect(db_path, timeout=30)
+        while not stop.is_set():
+            try:
+                seen.add(conn.execute("SELECT COUNT(*) FROM representative_suggestion "
+                                      "WHERE zip_code = '10000'").fetchone()[0])
+            except sqlite3.OperationalError:
+                pass
+            time.sleep(0.005)
+        conn.close()
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    summary = load_suggestions.load_suggestions(load_suggestions.read_input(path), chunk_size=args.chunk_size,
+                                                log=lambda message: None)
+    stop.set()
+    thread.join()
+
+    print(f"bulk loader: {summary['suggestions']:,} suggestions and {summary['phones']:,} phones in "
+          f"{summary['seconds']:.1f}s ({summary['suggestions'] / summary['seconds']:,.0f} suggestions/s)")
+    assert seen <= {0, args.per_zip}, f'reader saw a partially loaded zip: {sorted(seen)}'
+    print(f'concurrent reader saw only complete datasets: {sorted(seen)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Build fingerprinted, precompressed static assets.
+
+Minifies static/css/style.css and static/js/app.js, writes each to
+static/dist/ under a content-hashed name (e.g. js/app.3f2a9c1d04.js) next
+to .gz and .br variants, and records the mapping in static/dist/manifest.json.
+app.py reads the manifest so templates reference the hashed names, which are
+served from /assets/ with far-future immutable caching.
+
+    python build_assets.py
+    python build_assets.py --no-minify
+
+Minification uses rjsmin/rcssmin and brotli output uses the brotli package;
+when one is not installed that step is skipped and the build still succeeds.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+ASSETS = ('css/style.css', 'js/app.js')
+HASH_LENGTH = 10
+
+
+def minify(filename, text):
+    """Minified text, or None when no minifier is installed for this file type"""
+    try:
+        if filename.endswith('.js'):
+            from rjsmin import jsmin
+            return jsmin(text)
+        if filename.endswith('.css'):
+            from rcssmin import cssmin
+            return cssmin(text)
+    except ImportError:
+        pass
+    return None
+
+
+def brotli_compress(data):
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=11)
+
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def read_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def remove_stale_builds(keep):
+    """Delete built files not referenced by the new or the previous manifest"""
+    removed = 0
+    for root, _, files in os.walk(DIST_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, DIST_DIR).replace(os.sep, '/')
+            if relative == 'manifest.json':
+                continue
+            if relative.removesuffix('.gz').removesuffix('.br') not in keep:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def build(minify_assets=True, log=print):
+    """Build every asset in ASSETS. Returns the new manifest"""
+    previous = read_manifest()
+    manifest = {}
+    for filename in ASSETS:
+        with open(os.path.join(STATIC_DIR, filename), encoding='utf-8') as f:
+            source = f.read()
+        text = minify(filename, source) if minify_assets else None
+        if minify_assets and text is None:
+            log(f"⚠️  No minifier installed for {filename}; using the source as is")
+        data = (text if text is not None else source).encode('utf-8')
+
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        stem, ext = os.path.splitext(filename)
+        built = f'{stem}.{digest}{ext}'
+        path = os.path.join(DIST_DIR, built)
+        write_file(path, data)
+        # mtime=0 keeps the .gz byte-identical across builds of the same content
+        gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+        write_file(f'{path}.gz', gzipped)
+        brotli_data = brotli_compress(data)
+        if brotli_data is not None:
+            write_file(f'{path}.br', brotli_data)
+        manifest[filename] = built
+
+        sizes = f"{len(source.encode('utf-8')):,} -> {len(data):,} bytes, gzip {len(gzipped):,}"
+        if brotli_data is not None:
+            sizes += f", brotli {len(brotli_data):,}"
+        log(f"✅ {filename} -> {built} ({sizes})")
+
+    write_file(MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    # Keep the previous build so pages rendered before a reload can still load their assets
+    removed = remove_stale_builds(set(manifest.values()) | set(previous.values()))
+    if removed:
+        log(f"🧹 Removed {removed} stale built files")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--no-minify', action='store_true', help='hash and compress the sources as is')
+    args = parser.parse_args()
+
+    print(f"📦 Building static assets into {DIST_DIR}...")
+    build(minify_assets=not args.no_minify)
+
+
+if __name__ == '__main__':
+    main()
@@ -28,6 +28,59 @@ def run_command(command, description):
         return False
     return True
 
+def model_tables():
+    """Return (table name, CREATE TABLE statement) for every model table"""
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateTable
+    from app import db
+    
+    return [(table.name, str(CreateTable(table, if_not_exists=True).compile(dialect=sqlite.dialect())).strip())
+            for table in db.metadata.sorted_tables]
+
+def find_missing_tables(cursor):
+    """Model tables (name, CREATE TABLE statement) missing from an existing database"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+    return [(name, ddl) for name, ddl in model_tables() if name not in existing]
+
+def model_indexes():
+    """Return (table, index name, CREATE INDEX statement) for every index declared on the models"""
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex
+    from app import db
+    
+    indexes = []
+    for table in db.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=sqlite.dialect()))
+            indexes.append((table.name, index.name, ddl.strip()))
+    return indexes
+
+def find_missing_indexes(cursor):
+    """Model indexes (name, CREATE INDEX statement) missing from existing tables"""
+    cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')")
+    rows = cursor.fetchall()
+    tables = {name for kind, name in rows if kind == 'table'}
+    existing = {name for kind, name in rows if kind == 'index'}
+    return [(name, ddl) for table, name, ddl in model_indexes()
+            if table in tables and name not in existing]
+
+def find_missing_search_indexes(cursor):
+    """FTS tables (name, DDL statements) whose virtual table or sync triggers are missing"""
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from app import SEARCH_INDEXES, search_index_ddl
+    
+    cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+    existing = {row[0] for row in cursor.fetchall()}
+    missing = []
+    for fts_table, (table, columns) in SEARCH_INDEXES.items():
+        objects = [fts_table] + [f'{fts_table}_{suffix}' for suffix in ('insert', 'delete', 'update')]
+        if table in existing and any(name not in existing for name in objects):
+            missing.append((fts_table, search_index_ddl(fts_table, table, columns)))
+    return missing
+
 def check_database_schema():
     """Check if database needs migration"""
     db_path = Path("instance/rep_contacts.db")
@@ -40,11 +93,24 @@ def check_database_schema():
         cursor = conn.cursor()
         cursor.execute("PRAGMA table_info(call_log)")
         columns = [column[1] for column in cursor.fetchall()]
+        missing_tables = find_missing_tables(cursor)
+        missing_indexes = find_missing_indexes(cursor)
+        missing_search_indexes = find_missing_search_indexes(cursor)
         conn.close()
         
         if 'is_test_data' not in columns:
             print("📊 Database needs migration (missing is_test_data column)")
             return "migrate"
+        elif missing_tables:
+            print(f"📊 Database needs migration (missing tables: {', '.join(name for name, _ in missing_tables)})")
+            return "migrate"
+        elif missing_indexes:
+            print(f"📊 Database needs migration (missing indexes: {', '.join(name for name, _ in missing_indexes)})")
+            return "migrate"
+        elif missing_search_indexes:
+            print("📊 Database needs migration (missing full-text search indexes: "
+                  f"{', '.join(name for name, _ in missing_search_indexes)})")
+            return "migrate"
         else:
             print("📊 Database schema is up to date")
             return "current"
@@ -53,38 +119,82 @@ def check_database_schema():
         return "error"
 
 def migrate_database():
-    """Migrate database to add is_test_data column"""
+    """Migrate database in place: add is_test_data column and any missing tables, indexes and search indexes"""
     db_path = Path("instance/rep_contacts.db")
     
     try:
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
-        # Add the new column
-        cursor.execute('ALTER TABLE call_log ADD COLUMN is_test_data BOOLEAN DEFAULT FALSE')
+        cursor.execute("PRAGMA table_info(call_log)")
+        columns = [column[1] for column in cursor.fetchall()]
+        if 'is_test_data' not in columns:
+            # Add the new column
+            cursor.execute('ALTER TABLE call_log ADD COLUMN is_test_data BOOLEAN DEFAULT FALSE')
+            
+            # Mark existing records as test data
+            cursor.execute('UPDATE call_log SET is_test_data = TRUE')
+        else:
+            # NULL flags count as real calls; store that so every query agrees
+            cursor.execute('UPDATE call_log SET is_test_data = FALSE WHERE is_test_data IS NULL')
+        
+        # Create tables added since this database was built (existing tables are untouched)
+        for name, ddl in find_missing_tables(cursor):
+            print(f"   Creating table {name}")
+            cursor.execute(ddl)
         
-        # Mark existing records as test data
-        cursor.execute('UPDATE call_log SET is_test_data = TRUE')
+        # Create missing indexes (no table rebuild; existing indexes are left alone)
+        missing_indexes = find_missing_indexes(cursor)
+        for name, ddl in missing_indexes:
+            print(f"   Creating index {name}")
+            cursor.execute(ddl)
+        if missing_indexes:
+            # Refresh planner statistics so the new indexes get used
+            cursor.execute('ANALYZE')
+        
+        # Full-text search tables and the triggers that keep them in sync; a new index is filled from existing rows
+        for fts_table, statements in find_missing_search_indexes(cursor):
+            print(f"   Creating full-text search index {fts_table}")
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,))
+            existed = cursor.fetchone() is not None
+            for statement in statements:
+                cursor.execute(statement)
+            if not existed:
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
         
         conn.commit()
         conn.close()
+        
+        # Stats read from call_log until the rollup has been built
+        build_call_rollup_if_missing()
         print("✅ Database migration completed")
         return True
     except Exception as e:
         print(f"❌ Database migration failed: {e}")
         return False
 
+def build_call_rollup_if_missing():
+    """Backfill the call statistics rollup unless it has already been built"""
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from app import app, db, RollupState, CALL_ROLLUP, backfill_call_rollup
+    
+    with app.app_context():
+        if db.session.get(RollupState, CALL_ROLLUP) is None:
+            print("📊 Building call statistics rollup from existing call logs...")
+            print(f"   {backfill_call_rollup()} rollup rows written")
+
 def create_new_database():
     """Create new database with current schema - ONLY if database doesn't exist"""
     try:
         # Import app components
         sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-        from app import app, db, Representative, RepresentativePhone, CallLog
+        from app import app, db, Representative, RepresentativePhone, CallLog, backfill_call_rollup
         from datetime import datetime, timezone
         
         with app.app_context():
             print("🗄️ Creating database tables (safe - won't overwrite existing data)...")
             db.create_all()
+            build_call_rollup_if_missing()
             
             # SAFETY CHECK: Only add data if database is completely empty
             existing_reps = Representative.query.first()
@@ -226,6 +336,7 @@ def create_new_database():
             db.session.add(test_call_3)
             
             db.session.commit()
+            backfill_call_rollup()  # include the sample calls above
             print("✅ Database created successfully with sample data")
             return True
             
@@ -238,7 +349,9 @@ def populate_suggestion_database():
     try:
         # Import app components
         sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-        from app import app, db, RepresentativeSuggestion, RepresentativeSuggestionPhone
+        from app import (app, db, RepresentativeSuggestion, RepresentativeSuggestionPhone,
+                         get_suggestion_index, SUGGESTION_INDEX_PATH)
+        from load_suggestions import rebuild_index
         from datetime import datetime, timezone
         
         with app.app_context():
@@ -247,6 +360,9 @@ def populate_suggestion_database():
             
             if existing_suggestions > 0:
                 print(f"✅ Found {existing_suggestions} existing suggestions - no changes needed")
+                if SUGGESTION_INDEX_PATH and get_suggestion_index() is None:
+                    # Not built yet, or written by an older version of the index format
+                    rebuild_index()
                 return True
             
             print("📍 Populating suggestion database with sample representative data...")
@@ -318,6 +434,8 @@ def populate_suggestion_database():
             
             db.session.commit()
             print(f"✅ Successfully added {suggestions_added} suggestions to database")
+            # Lookups are served from the index once one exists, so it must match the new rows
+            rebuild_index()
             return True
             
     except Exception as e:
@@ -492,13 +610,18 @@ def main():
     if not ensure_94102_representatives():
         print("⚠️ Warning: Failed to ensure 94102 representatives, but continuing...")
     
-    # Step 6: Set file permissions
+    # Step 6: Build fingerprinted, precompressed static assets
+    print("\n📦 Building static assets...")
+    if not run_command("python3.10 build_assets.py", "Building static assets"):
+        print("⚠️ Warning: Asset build failed; pages will use the unbuilt static files")
+    
+    # Step 7: Set file permissions
     print("\n🔐 Setting file permissions...")
     db_path = Path("instance/rep_contacts.db")
     if db_path.exists():
         run_command("chmod 666 instance/rep_contacts.db", "Setting database file permissions")
     
-    # Step 6: Clear any cached files
+    # Step 8: Clear any cached files
     print("\n🧹 Cleaning up...")
     run_command("find . -name '*.pyc' -delete", "Clearing Python cache files")
     
@@ -9,6 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import app, db, RepresentativeSuggestion, RepresentativeSuggestionPhone
+from load_suggestions import rebuild_index
 
 with app.app_context():
     # Clear existing suggestions
@@ -58,5 +59,6 @@ with app.app_context():
     db.session.add(kaine_phone)
     
     db.session.commit()
+    rebuild_index()
     print("✅ Added 22205 suggestions: Mark Warner and Tim Kaine")
     print("Now auto-populate should work for 22205")
\ No newline at end of file
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Bulk loader for the suggestion database (representative_suggestion and
+representative_suggestion_phone).
+
+Input is streamed, so a national ZIP -> district crosswalk never has to fit
+in memory:
+
+- CSV with a header row: zip_code, first_name, last_name, position, state,
+  district, source, phone, extension, phone_type. A suggestion with several
+  phones is written as adjacent rows that repeat the suggestion columns.
+- JSON Lines: one suggestion object per line with a "phones" list of
+  {"phone", "extension", "phone_type"} objects.
+
+Rows are validated in batches and written with executemany in chunked
+transactions. By default the data is loaded into staging tables and swapped
+in with table renames inside a single transaction, so live lookups see
+either the whole old dataset or the whole new one. --append adds rows to
+the live tables instead. Either way the app's ZIP lookup index
+(zip_index.py) is rebuilt afterwards.
+
+    python load_suggestions.py crosswalk.csv
+    python load_suggestions.py suggestions.jsonl --chunk-size 20000
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import islice
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+SUGGESTION_TABLE = 'representative_suggestion'
+PHONE_TABLE = 'representative_suggestion_phone'
+STAGING_SUFFIX = '_staging'
+OLD_SUFFIX = '_old'
+SUGGESTION_COLUMNS = ('id', 'zip_code', 'first_name', 'last_name', 'position', 'state', 'district',
+                      'source', 'created_at')
+PHONE_COLUMNS = ('id', 'representative_suggestion_id', 'phone', 'extension', 'phone_type', 'created_at')
+SUGGESTION_KEY = ('zip_code', 'first_name', 'last_name', 'position', 'state', 'district', 'source')
+
+
+class LoadError(Exception):
+    """Raised when the input has more invalid rows than allowed"""
+
+
+def read_csv(path):
+    """Yield suggestion dicts from a CSV file, merging adjacent rows for the same suggestion"""
+    with open(path, newline='', encoding='utf-8') as f:
+        current = None
+        current_key = None
+        for row in csv.DictReader(f):
+            row = {key: (value or '').strip() for key, value in row.items() if key}
+            key = tuple(row.get(column, '') for column in SUGGESTION_KEY)
+            if key != current_key:
+                if current is not None:
+                    yield current
+                current = {column: row.get(column, '') for column in SUGGESTION_KEY}
+                current['phones'] = []
+                current_key = key
+            if row.get('phone'):
+                current['phones'].append({
+                    'phone': row['phone'],
+                    'extension': row.get('extension', ''),
+                    'phone_type': row.get('phone_type', '')
+                })
+        if current is not None:
+            yield current
+
+
+def read_jsonl(path):
+    """Yield suggestion dicts from a JSON Lines file"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def read_input(path, input_format=None):
+    input_format = input_format or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    if input_format == 'csv':
+        return read_csv(path)
+    if input_format == 'jsonl':
+        return read_jsonl(path)
+    raise ValueError(f"Unsupported input format: {input_format}")
+
+
+def validate_batch(batch):
+    """Validate a batch of suggestion dicts. Returns (valid suggestions, [(suggestion, error)])"""
+    from app import validate_phone_number
+
+    valid = []
+    invalid = []
+    for suggestion in batch:
+        zip_code = str(suggestion.get('zip_code', '')).strip()
+        # ZIP+4 rows are kept for split zips; lookups fall back to the 5-digit code
+        if not re.match(r'^\d{5}(-\d{4})?$', zip_code):
+            invalid.append((suggestion, f"Invalid zip code: {zip_code!r}"))
+            continue
+
+        missing = [field for field in ('first_name', 'last_name', 'position', 'state', 'source')
+                   if not str(suggestion.get(field) or '').strip()]
+        if missing:
+            invalid.append((suggestion, f"Missing required fields: {', '.join(missing)}"))
+            continue
+
+        phones = []
+        error = None
+        for phone in suggestion.get('phones') or []:
+            is_valid, result = validate_phone_number(phone.get('phone'))
+            if not is_valid:
+                error = f"{result}: {phone.get('phone')!r}"
+                break
+            phones.append({
+                'phone': result,
+                'extension': str(phone.get('extension') or '').strip(),
+                'phone_type': str(phone.get('phone_type') or '').strip() or 'Main'
+            })
+        if error:
+            invalid.append((suggestion, error))
+            continue
+
+        valid.append({
+            'zip_code': zip_code,
+            'first_name': str(suggestion['first_name']).strip()[:100],
+            'last_name': str(suggestion['last_name']).strip()[:100],
+            'position': str(suggestion['position']).strip()[:100],
+            'state': str(suggestion['state']).strip()[:50],
+            'district': str(suggestion.get('district') or '').strip()[:50],
+            'source': str(suggestion['source']).strip()[:50],
+            'phones': phones
+        })
+    return valid, invalid
+
+
+def database_path():
+    """Path of the app's SQLite database"""
+    from app import app, db
+
+    with app.app_context():
+        if db.engine.url.get_backend_name() != 'sqlite':
+            raise LoadError("The bulk suggestion loader only supports SQLite databases")
+        return db.engine.url.database
+
+
+def model_ddl():
+    """CREATE TABLE and CREATE INDEX statements for the two suggestion tables"""
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex, CreateTable
+    from app import RepresentativeSuggestion, RepresentativeSuggestionPhone
+
+    tables = []
+    indexes = []
+    for model in (RepresentativeSuggestion, RepresentativeSuggestionPhone):
+        table = model.__table__
+        tables.append(str(CreateTable(table).compile(dialect=sqlite.dialect())).strip())
+        indexes.extend(str(CreateIndex(index).compile(dialect=sqlite.dialect())).strip()
+                       for index in sorted(table.indexes, key=lambda index: index.name))
+    return tables, indexes
+
+
+def rename_tables(sql, suffix):
+    """Point DDL at the suffixed copies of the suggestion tables"""
+    return re.sub(rf'\b({SUGGESTION_TABLE}|{PHONE_TABLE})\b', rf'\g<1>{suffix}', sql)
+
+
+def load_suggestions(rows, chunk_size=5000, append=False, max_errors=100, log=print):
+    """
+    Load suggestion dicts into the database.
+
+    Returns a summary dict with counts and timings. Raises LoadError (and
+    leaves the live tables untouched) when more than max_errors rows are
+    invalid.
+    """
+    started = time.perf_counter()
+    conn = sqlite3.connect(database_path(), timeout=30, isolation_level=None)
+    conn.execute('PRAGMA busy_timeout=30000')
+    table_ddl, index_ddl = model_ddl()
+    suffix = '' if append else STAGING_SUFFIX
+    suggestion_table = SUGGESTION_TABLE + suffix
+    phone_table = PHONE_TABLE + suffix
+
+    if append:
+        for ddl in table_ddl + index_ddl:
+            conn.execute(ddl.replace('CREATE TABLE', 'CREATE TABLE IF NOT EXISTS', 1)
+                            .replace('CREATE INDEX', 'CREATE INDEX IF NOT EXISTS', 1))
+        next_suggestion_id = conn.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {suggestion_table}').fetchone()[0]
+        next_phone_id = conn.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {phone_table}').fetchone()[0]
+    else:
+        # Staging tables are loaded without indexes; they are built once at swap time
+        conn.execute(f'DROP TABLE IF EXISTS {phone_table}')
+        conn.execute(f'DROP TABLE IF EXISTS {suggestion_table}')
+        for ddl in table_ddl:
+            conn.execute(rename_tables(ddl, suffix))
+        next_suggestion_id = 1
+        next_phone_id = 1
+
+    suggestion_insert = (f"INSERT INTO {suggestion_table} ({', '.join(SUGGESTION_COLUMNS)}) "
+                         f"VALUES ({', '.join('?' for _ in SUGGESTION_COLUMNS)})")
+    phone_insert = (f"INSERT INTO {phone_table} ({', '.join(PHONE_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in PHONE_COLUMNS)})")
+
+    created_at = datetime.now(timezone.utc).replace(tzinfo=None).isoformat(sep=' ')
+    loaded = 0
+    phones_loaded = 0
+    errors = []
+    rows = iter(rows)
+
+    try:
+        while True:
+            batch = list(islice(rows, chunk_size))
+            if not batch:
+                break
+
+            valid, invalid = validate_batch(batch)
+            errors.extend(invalid)
+            if len(errors) > max_errors:
+                raise LoadError(f"Too many invalid rows ({len(errors)}); first error: {errors[0][1]}")
+
+            suggestion_rows = []
+            phone_rows = []
+            for suggestion in valid:
+                suggestion_rows.append((next_suggestion_id, suggestion['zip_code'], suggestion['first_name'],
+                                        suggestion['last_name'], suggestion['position'], suggestion['state'],
+                                        suggestion['district'], suggestion['source'], created_at))
+                for phone in suggestion['phones']:
+                    phone_rows.append((next_phone_id, next_suggestion_id, phone['phone'], phone['extension'],
+                                       phone['phone_type'], created_at))
+                    next_phone_id += 1
+                next_suggestion_id += 1
+
+            # One short transaction per chunk keeps the write lock brief
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(suggestion_insert, suggestion_rows)
+            conn.executemany(phone_insert, phone_rows)
+            conn.execute('COMMIT')
+
+            loaded += len(suggestion_rows)
+            phones_loaded += len(phone_rows)
+            log(f"   Loaded {loaded} suggestions ({phones_loaded} phones), {len(errors)} rejected")
+
+        if not append:
+            swap_staging_tables(conn, index_ddl)
+    except Exception:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        if not append:
+            conn.execute(f'DROP TABLE IF EXISTS {phone_table}')
+            conn.execute(f'DROP TABLE IF EXISTS {suggestion_table}')
+        raise
+    finally:
+        conn.close()
+
+    rebuild_index(log)
+
+    for suggestion, error in errors[:10]:
+        log(f"   Rejected {suggestion.get('zip_code')} {suggestion.get('first_name')} "
+            f"{suggestion.get('last_name')}: {error}")
+
+    return {
+        'suggestions': loaded,
+        'phones': phones_loaded,
+        'rejected': len(errors),
+        'mode': 'append' if append else 'replace',
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+
+
+def rebuild_index(log=print):
+    """Rebuild the app's ZIP lookup index so it matches the freshly loaded tables"""
+    from app import app, rebuild_suggestion_index, SUGGESTION_INDEX_PATH
+
+    if not SUGGESTION_INDEX_PATH:
+        return
+    with app.app_context():
+        stats = rebuild_suggestion_index()
+    log(f"   Rebuilt suggestion index: {stats['zip_codes']} zip codes, {stats['bytes']} bytes")
+
+
+def swap_staging_tables(conn, index_ddl):
+    """Replace the live suggestion tables with the staging copies in one transaction"""
+    conn.execute('BEGIN IMMEDIATE')
+    for table in (PHONE_TABLE, SUGGESTION_TABLE):
+        conn.execute(f'DROP TABLE IF EXISTS {table}{OLD_SUFFIX}')
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    # Rename order matters: SQLite rewrites foreign key references on rename
+    for table in (PHONE_TABLE, SUGGESTION_TABLE):
+        if table in existing:
+            conn.execute(f'ALTER TABLE {table} RENAME TO {table}{OLD_SUFFIX}')
+    for table in (SUGGESTION_TABLE, PHONE_TABLE):
+        conn.execute(f'ALTER TABLE {table}{STAGING_SUFFIX} RENAME TO {table}')
+    for table in (PHONE_TABLE, SUGGESTION_TABLE):
+        conn.execute(f'DROP TABLE IF EXISTS {table}{OLD_SUFFIX}')
+    for ddl in index_ddl:
+        conn.execute(ddl)
+    conn.execute(f'ANALYZE {SUGGESTION_TABLE}')
+    conn.execute(f'ANALYZE {PHONE_TABLE}')
+    conn.execute('COMMIT')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='CSV or JSON Lines file')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='input format (default: from file extension)')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='suggestions per transaction')
+    parser.add_argument('--append', action='store_true', help='add to the live tables instead of replacing them')
+    parser.add_argument('--max-errors', type=int, default=100, help='abort if more rows than this are invalid')
+    args = parser.parse_args()
+
+    print(f"📍 Loading suggestions from {args.path}...")
+    try:
+        summary = load_suggestions(read_input(args.path, args.format), chunk_size=args.chunk_size,
+                                   append=args.append, max_errors=args.max_errors)
+    except LoadError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Loaded {summary['suggestions']} suggestions and {summary['phones']} phones "
+          f"({summary['rejected']} rejected, {summary['mode']}) in {summary['seconds']}s")
+
+
+if __name__ == '__main__':
+    main()
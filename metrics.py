@@ -0,0 +1,325 @@
+"""
+Prometheus counters and histograms kept in process memory.
+
+Each metric keeps its series in a dict keyed by label values, guarded by one
+lock, so recording a sample is a dict lookup and a couple of additions.
+Registry.render() produces the Prometheus text exposition format (0.0.4).
+
+With a multiprocess directory every process writes its series to
+<dir>/<pid>-<random id>.json every few seconds (and at exit), and render()
+adds up the files of all processes. The random id keeps a restarted worker
+that reuses a pid from overwriting its predecessor's file. collect() folds
+the files of exited workers into <dir>/cumulative.json and deletes them, so
+counters never go backwards and the directory does not grow with every
+worker restart. Folding needs fcntl and os.kill(pid, 0), so on Windows the
+files are kept instead.
+"""
+
+import atexit
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CUMULATIVE_FILE = 'cumulative.json'
+LOCK_FILE = '.lock'
+
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names, values, extra=None):
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def file_pid(filename):
+    """The pid in a process file name (<pid>-<id>.json, or <pid>.json from older versions); None otherwise"""
+    try:
+        return int(filename[:-len('.json')].split('-', 1)[0])
+    except ValueError:
+        return None
+
+
+def write_json(directory, filename, data):
+    """Replace directory/filename atomically, so readers see the old or the new file"""
+    fd, tmp_path = tempfile.mkstemp(prefix='.metrics-', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, os.path.join(directory, filename))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._series)
+
+    @staticmethod
+    def merge(total, value):
+        return value if total is None else total + value
+
+    def render(self, series):
+        for labels, value in sorted(series.items()):
+            yield f'{self.name}{format_labels(self.labelnames, labels)} {value}'
+
+
+class Histogram:
+    """Bucketed observations per label combination; buckets are upper bounds in seconds"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        # bisect_left puts a value equal to a bound in that bound's bucket (le semantics)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # one count per bucket, the +Inf bucket, then the sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    @staticmethod
+    def merge(total, value):
+        return list(value) if total is None else [a + b for a, b in zip(total, value)]
+
+    def render(self, series):
+        bounds = self.buckets + (float('inf'),)
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                le = f'le="{format_bound(bound)}"'
+                yield f'{self.name}_bucket{format_labels(self.labelnames, labels, le)} {cumulative}'
+            label_text = format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{label_text} {values[-1]}'
+            yield f'{self.name}_count{label_text} {cumulative}'
+
+
+class Registry:
+    """The metrics of one process, optionally merged with other processes through a directory"""
+
+    def __init__(self, multiprocess_dir=None, flush_interval=5):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self.metrics = {}
+        self._flusher_pid = None
+        self._flusher_lock = threading.Lock()
+        self._process_pid = None
+        self._process_filename = None
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def _process_file(self):
+        """This process's file name, chosen again after a fork"""
+        if self._process_pid != os.getpid():
+            self._process_pid = os.getpid()
+            self._process_filename = f'{self._process_pid}-{uuid.uuid4().hex[:12]}.json'
+        return self._process_filename
+
+    def flush(self):
+        """Write this process's series to the multiprocess directory"""
+        if not self.multiprocess_dir:
+            return
+        data = {name: [[list(labels), value] for labels, value in series.items()]
+                for name, series in self.snapshot().items()}
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        write_json(self.multiprocess_dir, self._process_file(), data)
+
+    def ensure_flusher(self):
+        """Start the background flush thread in this process (once per pid, so forked workers get their own)"""
+        if not self.multiprocess_dir or self._flusher_pid == os.getpid():
+            return
+        with self._flusher_lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+            threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+            atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def collect(self):
+        """
+        Series of every metric: this process live, plus the last flush of every
+        other process and the cumulative totals of exited ones
+        """
+        totals = {name: {} for name in self.metrics}
+
+        def add(name, labels, value):
+            metric = self.metrics.get(name)
+            if metric is not None:
+                series = totals[name]
+                series[labels] = metric.merge(series.get(labels), value)
+
+        for name, series in self.snapshot().items():
+            for labels, value in series.items():
+                add(name, labels, value)
+        if self.multiprocess_dir and os.path.isdir(self.multiprocess_dir):
+            for data in self._read_other_processes():
+                for name, series in data.items():
+                    for labels, value in series:
+                        add(name, tuple(labels), value)
+        return totals
+
+    def _read_other_processes(self):
+        """Series of the other processes' files, after folding exited workers into the cumulative file"""
+        if fcntl is None:
+            return self._read_files(self._other_files())
+        # Readers and the folding both hold the lock, so no reader sees an exited
+        # worker both in its own file and in the cumulative file
+        with open(os.path.join(self.multiprocess_dir, LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._fold_exited()
+                return self._read_files(self._other_files())
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _other_files(self):
+        own_file = self._process_file()
+        return [filename for filename in os.listdir(self.multiprocess_dir)
+                if filename.endswith('.json') and filename not in (own_file, CUMULATIVE_FILE)]
+
+    def _read_files(self, filenames):
+        results = []
+        skip = set()
+        cumulative = self._read_json(CUMULATIVE_FILE)
+        if cumulative is not None:
+            results.append(cumulative['series'])
+            skip.update(cumulative['merged'])
+        for filename in filenames:
+            if filename in skip:
+                continue
+            data = self._read_json(filename)
+            if data is not None:
+                results.append(data)
+        return results
+
+    def _read_json(self, filename):
+        try:
+            with open(os.path.join(self.multiprocess_dir, filename)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _fold_exited(self):
+        """Add the files of exited processes to the cumulative file and delete them (lock held)"""
+        exited = [filename for filename in self._other_files()
+                  if file_pid(filename) is not None and not process_alive(file_pid(filename))]
+        if not exited:
+            return
+        cumulative = self._read_json(CUMULATIVE_FILE) or {'merged': [], 'series': {}}
+        # 'merged' names files already added whose deletion may not have happened (a crash in
+        # between), so they are not added twice
+        merged = set(cumulative['merged'])
+        totals = {name: {tuple(labels): value for labels, value in series}
+                  for name, series in cumulative['series'].items()}
+        for filename in exited:
+            if filename in merged:
+                continue
+            data = self._read_json(filename)
+            if data is None:
+                continue
+            for name, series in data.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                target = totals.setdefault(name, {})
+                for labels, value in series:
+                    target[tuple(labels)] = metric.merge(target.get(tuple(labels)), value)
+        series = {name: [[list(labels), value] for labels, value in values.items()]
+                  for name, values in totals.items()}
+        write_json(self.multiprocess_dir, CUMULATIVE_FILE, {'merged': sorted(merged.union(exited)), 'series': series})
+        for filename in exited:
+            try:
+                os.unlink(os.path.join(self.multiprocess_dir, filename))
+            except FileNotFoundError:
+                pass
+        # Every file named in 'merged' is gone now, so the list can start over
+        write_json(self.multiprocess_dir, CUMULATIVE_FILE, {'merged': [], 'series': series})
+
+    def render(self):
+        lines = []
+        for name, series in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            lines.extend(metric.render(series))
+        return '\n'.join(lines) + '\n'
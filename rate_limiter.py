@@ -0,0 +1,179 @@
+"""
+Rate limiter backends for the rate_limit decorator in app.py.
+
+Both backends implement a sliding-window counter: the window is split into a
+fixed number of buckets, each key keeps one counter per bucket, and a hit is
+allowed while the sum of the live buckets stays under the limit. Memory per
+key is bounded by the bucket count regardless of traffic.
+
+- MemoryRateLimiter keeps counters in process memory (one gunicorn worker).
+- SQLiteRateLimiter keeps counters in a local SQLite file so every worker on
+  the host shares the same limit.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_BUCKET_COUNT = 12
+DEFAULT_MAX_KEYS = 100000
+DEFAULT_SWEEP_INTERVAL = 60
+
+
+class MemoryRateLimiter:
+    """Sliding-window limiter kept in process memory"""
+
+    def __init__(self, bucket_count=DEFAULT_BUCKET_COUNT, max_keys=DEFAULT_MAX_KEYS,
+                 sweep_interval=DEFAULT_SWEEP_INTERVAL):
+        self.bucket_count = bucket_count
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        # key -> [window, {bucket_index: count}], ordered by last hit
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+
+    def hit(self, key, limit, window, now=None):
+        """Record a hit for key. Returns (allowed, remaining, retry_after)"""
+        now = time.time() if now is None else now
+        bucket_width = window / self.bucket_count
+        current = int(now // bucket_width)
+        oldest = current - self.bucket_count + 1
+
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+
+            entry = self._keys.get(key)
+            if entry is None:
+                entry = [window, {}]
+                self._keys[key] = entry
+                if len(self._keys) > self.max_keys:
+                    self._keys.popitem(last=False)
+            else:
+                self._keys.move_to_end(key)
+
+            buckets = entry[1]
+            for index in [i for i in buckets if i < oldest]:
+                del buckets[index]
+
+            used = sum(buckets.values())
+            if used >= limit:
+                retry_after = (min(buckets) + self.bucket_count) * bucket_width - now
+                return False, 0, max(retry_after, 0)
+
+            buckets[current] = buckets.get(current, 0) + 1
+            return True, limit - used - 1, 0
+
+    def _sweep(self, now):
+        """Evict keys that have not been hit within their window"""
+        self._last_sweep = now
+        stale = []
+        for key, (window, buckets) in self._keys.items():
+            bucket_width = window / self.bucket_count
+            if not buckets or (max(buckets) + self.bucket_count) * bucket_width <= now:
+                stale.append(key)
+        for key in stale:
+            del self._keys[key]
+
+    def key_count(self):
+        with self._lock:
+            return len(self._keys)
+
+
+class SQLiteRateLimiter:
+    """Sliding-window limiter shared across worker processes via a SQLite file"""
+
+    def __init__(self, path, bucket_count=DEFAULT_BUCKET_COUNT,
+                 sweep_interval=DEFAULT_SWEEP_INTERVAL, busy_timeout=5000):
+        self.path = path
+        self.bucket_count = bucket_count
+        self.sweep_interval = sweep_interval
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._last_sweep = time.time()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_bucket ('
+            ' key TEXT NOT NULL,'
+            ' bucket INTEGER NOT NULL,'
+            ' expires_at REAL NOT NULL,'
+            ' count INTEGER NOT NULL,'
+            ' PRIMARY KEY (key, bucket)'
+            ') WITHOUT ROWID'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS ix_rate_limit_bucket_expires_at '
+            'ON rate_limit_bucket (expires_at)'
+        )
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout / 1000,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout)}')
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, limit, window, now=None):
+        """Record a hit for key. Returns (allowed, remaining, retry_after)"""
+        now = time.time() if now is None else now
+        bucket_width = window / self.bucket_count
+        current = int(now // bucket_width)
+        oldest = current - self.bucket_count + 1
+
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if now - self._last_sweep >= self.sweep_interval:
+                # Idle keys: every bucket has aged out of its window
+                self._last_sweep = now
+                conn.execute('DELETE FROM rate_limit_bucket WHERE expires_at <= ?', (now,))
+
+            used, first = conn.execute(
+                'SELECT COALESCE(SUM(count), 0), MIN(bucket) FROM rate_limit_bucket '
+                'WHERE key = ? AND bucket >= ?',
+                (key, oldest)
+            ).fetchone()
+
+            if used >= limit:
+                conn.execute('COMMIT')
+                retry_after = (first + self.bucket_count) * bucket_width - now
+                return False, 0, max(retry_after, 0)
+
+            conn.execute(
+                'INSERT INTO rate_limit_bucket (key, bucket, expires_at, count) VALUES (?, ?, ?, 1) '
+                'ON CONFLICT (key, bucket) DO UPDATE SET count = count + 1',
+                (key, current, (current + self.bucket_count) * bucket_width)
+            )
+            conn.execute('COMMIT')
+            return True, limit - used - 1, 0
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def key_count(self):
+        row = self._connection().execute(
+            'SELECT COUNT(DISTINCT key) FROM rate_limit_bucket WHERE expires_at > ?',
+            (time.time(),)
+        ).fetchone()
+        return row[0]
+
+
+def create_rate_limiter(backend, storage_path=None, **kwargs):
+    """Build a limiter for the configured backend name ('memory' or 'sqlite')"""
+    if backend == 'memory':
+        return MemoryRateLimiter(**kwargs)
+    if backend == 'sqlite':
+        if not storage_path:
+            raise ValueError("SQLite rate limiter requires a storage path")
+        return SQLiteRateLimiter(storage_path, **kwargs)
+    raise ValueError(f"Unknown rate limiter backend: {backend}")
@@ -0,0 +1,134 @@
+"""
+Per-request profiling for diagnosing slow requests.
+
+A RequestProfile runs one request under cProfile and records every SQL
+statement the request's thread issues, with its duration. write() saves a
+text report (total, SQL and Python time, the query list, repeated
+statements and the top functions by cumulative time) plus the raw cProfile
+stats, which `python -m pstats` or snakeviz can open.
+
+install_sql_timing() adds the engine hooks once. They only record while a
+profile is active on the current thread, so other requests and background
+jobs are not affected. Statement parameters are not recorded because they
+hold call notes and phone numbers.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+STATEMENT_MAX_LENGTH = 500
+
+_active = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_active, 'profile', None) is not None and context is not None:
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = getattr(_active, 'profile', None)
+    started = getattr(context, '_profile_started', None)
+    if profile is not None and started is not None:
+        profile.queries.append((' '.join(statement.split()), time.perf_counter() - started, executemany))
+
+
+def install_sql_timing(engine):
+    """Record statements issued on engine while a profile is active (idempotent)"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+class RequestProfile:
+    """cProfile run and SQL statement log for one request"""
+
+    def __init__(self, method, path):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now(timezone.utc)
+        self.status = None
+        self.error = None
+        self.elapsed = None
+        # (statement, seconds, executemany)
+        self.queries = []
+        self._profiler = cProfile.Profile()
+        self._start = None
+
+    def start(self):
+        """Start profiling the current thread. False when another profiler is already running"""
+        try:
+            self._profiler.enable()
+        except ValueError:
+            return False
+        self._start = time.perf_counter()
+        _active.profile = self
+        return True
+
+    def stop(self):
+        self._profiler.disable()
+        self.elapsed = time.perf_counter() - self._start
+        if getattr(_active, 'profile', None) is self:
+            _active.profile = None
+
+    @property
+    def sql_seconds(self):
+        return sum(seconds for _, seconds, _ in self.queries)
+
+    def report(self, top=40):
+        elapsed_ms = self.elapsed * 1000
+        sql_ms = self.sql_seconds * 1000
+        share = sql_ms / elapsed_ms * 100 if elapsed_ms else 0
+        lines = [
+            f"{self.method} {self.path} -> {self.status if self.status is not None else 'no response'}",
+            f"profile {self.id} at {self.started_at.isoformat()}",
+        ]
+        if self.error:
+            lines.append(f"error: {self.error}")
+        lines += [
+            '',
+            f"total   {elapsed_ms:10.2f} ms",
+            f"SQL     {sql_ms:10.2f} ms  ({share:.0f}%, {len(self.queries)} statements)",
+            f"Python  {elapsed_ms - sql_ms:10.2f} ms",
+            '',
+            'Queries (in order)',
+        ]
+        for number, (statement, seconds, executemany) in enumerate(self.queries, 1):
+            text = statement if len(statement) <= STATEMENT_MAX_LENGTH else statement[:STATEMENT_MAX_LENGTH] + '...'
+            lines.append(f"{number:4d} {seconds * 1000:9.2f} ms  {'[many] ' if executemany else ''}{text}")
+        if not self.queries:
+            lines.append('   none')
+
+        repeated = [(statement, count) for statement, count in
+                    Counter(statement for statement, _, _ in self.queries).most_common() if count > 1]
+        if repeated:
+            lines += ['', 'Repeated statements']
+            for statement, count in repeated:
+                lines.append(f"{count:4d}x  {statement[:STATEMENT_MAX_LENGTH]}")
+
+        stream = io.StringIO()
+        pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+        lines += ['', f"Top {top} functions by cumulative time", stream.getvalue().strip('\n')]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory, top=40):
+        """Write <name>.txt and <name>.prof to directory. Returns the report path"""
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', self.path.split('?')[0]).strip('_')[:60] or 'root'
+        name = f"{self.started_at:%Y%m%dT%H%M%S}-{self.method}-{slug}-{self.id}"
+        path = os.path.join(directory, f'{name}.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.report(top))
+        self._profiler.dump_stats(os.path.join(directory, f'{name}.prof'))
+        return path
@@ -0,0 +1,215 @@
+"""
+Read-through cache for serialized API responses.
+
+ResponseCache keeps an in-process LRU with a TTL. When a shared path is
+configured it also keeps a SQLite layer that every worker on the host can
+read: values written by one worker warm the others, and invalidations bump a
+per-key version so stale local copies in other workers are discarded on
+their next read. Without the shared layer, invalidations only reach the
+current worker, so it is only safe with a single worker process.
+
+The shared database is opened (and its table created) on first use, not
+when the cache is constructed, so importing a module that builds a cache
+does no I/O. Connections are per thread and per process: a worker forked
+from a master that already used the cache opens its own.
+
+Read-through callers use lookup() and pass the version it returned to
+set(). set() then stores nothing if the key was invalidated while the
+value was being computed, so a slow read cannot write back a stale value.
+
+Shared rows are deleted one TTL after they expire (or after the
+invalidation that emptied them), when a process first opens the shared
+layer and then every `purge_every` sets, so the file does not grow with
+every key ever looked up. The grace period keeps an invalidation's version
+around for longer than any read-through that started before it.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """LRU + TTL cache of serialized values with an optional cross-worker layer"""
+
+    def __init__(self, max_entries=1024, ttl=300, shared_path=None, busy_timeout=5000, purge_every=1000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.shared_path = shared_path
+        self.busy_timeout = busy_timeout
+        self.purge_every = purge_every
+        self._sets_since_purge = 0
+        # key -> (value, expires_at, version)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Local-only versions: bumped per key by invalidate() and for every key by clear()
+        self._key_versions = {}
+        self._clear_version = 0
+        self._schema_pid = None
+
+    def _connection(self):
+        """This thread's connection to the shared layer, reopened after a fork"""
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            # A connection copied from the parent by fork is kept referenced but never used:
+            # garbage-collecting it would close SQLite state the parent still relies on
+            self._local.inherited = getattr(self._local, 'conn', None)
+            if self._schema_pid != pid:
+                os.makedirs(os.path.dirname(os.path.abspath(self.shared_path)), exist_ok=True)
+            conn = sqlite3.connect(self.shared_path, timeout=self.busy_timeout / 1000,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if self._schema_pid != pid:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS cache_entry ('
+                    ' key TEXT PRIMARY KEY,'
+                    ' version INTEGER NOT NULL DEFAULT 0,'
+                    ' value TEXT,'
+                    ' expires_at REAL'
+                    ')'
+                )
+                self._schema_pid = pid
+                self._purge_expired(conn)
+            self._local.conn = conn
+            self._local.pid = pid
+        return self._local.conn
+
+    def _purge_expired(self, conn):
+        """Delete shared rows that expired, or were invalidated, more than one TTL ago"""
+        # NULL expiries are invalidation markers written before they were timestamped
+        conn.execute('DELETE FROM cache_entry WHERE expires_at < ? OR expires_at IS NULL',
+                     (time.time() - self.ttl,))
+
+    def _shared_row(self, key):
+        row = self._connection().execute(
+            'SELECT version, value, expires_at FROM cache_entry WHERE key = ?', (key,)
+        ).fetchone()
+        return row if row else (0, None, None)
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        return self.lookup(key)[0]
+
+    def lookup(self, key):
+        """(value or None, version); pass the version to set() when filling a miss"""
+        now = time.time()
+        if self.shared_path:
+            version, shared_value, shared_expires = self._shared_row(key)
+        else:
+            with self._lock:
+                version = (self._clear_version, self._key_versions.get(key, 0))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, entry_version = entry
+                if expires_at > now and entry_version == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, version
+                del self._entries[key]
+
+        if self.shared_path and shared_value is not None and shared_expires > now:
+            self._store_local(key, shared_value, shared_expires, version)
+            with self._lock:
+                self.shared_hits += 1
+            return shared_value, version
+
+        with self._lock:
+            self.misses += 1
+        return None, version
+
+    def set(self, key, value, version=None):
+        """
+        Store value for key in the local layer and, if enabled, the shared
+        layer. With the version from lookup(), nothing is stored if key has
+        been invalidated since.
+        """
+        expires_at = time.time() + self.ttl
+        if self.shared_path:
+            if version is None:
+                version = self._shared_row(key)[0]
+            # A row with a newer version means an invalidation happened after the lookup
+            stored = self._connection().execute(
+                'INSERT INTO cache_entry (key, version, value, expires_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at '
+                'WHERE cache_entry.version = excluded.version',
+                (key, version, value, expires_at)
+            ).rowcount
+            if stored:
+                self._store_local(key, value, expires_at, version)
+            with self._lock:
+                self._sets_since_purge += 1
+                purge = self._sets_since_purge >= self.purge_every
+                if purge:
+                    self._sets_since_purge = 0
+            if purge:
+                self._purge_expired(self._connection())
+            return
+        with self._lock:
+            current = (self._clear_version, self._key_versions.get(key, 0))
+            if version is not None and version != current:
+                return
+        self._store_local(key, value, expires_at, current)
+
+    def _store_local(self, key, value, expires_at, version):
+        with self._lock:
+            self._entries[key] = (value, expires_at, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop key here and mark it stale for every other worker"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._key_versions[key] = self._key_versions.get(key, 0) + 1
+            self.invalidations += 1
+        if self.shared_path:
+            # expires_at on an empty row is the invalidation time, used only to purge it. A new
+            # row starts at a millisecond timestamp rather than 1, so a key whose row was purged
+            # never gets back a version that a read-through still in flight is holding
+            now = time.time()
+            self._connection().execute(
+                'INSERT INTO cache_entry (key, version, value, expires_at) VALUES (?, ?, NULL, ?) '
+                'ON CONFLICT (key) DO UPDATE SET version = version + 1, value = NULL, expires_at = excluded.expires_at',
+                (key, int(now * 1000), now)
+            )
+
+    def clear(self):
+        """Drop every entry here and mark all shared entries stale"""
+        with self._lock:
+            self._entries.clear()
+            self._key_versions.clear()
+            self._clear_version += 1
+            self.invalidations += 1
+        if self.shared_path:
+            self._connection().execute(
+                'UPDATE cache_entry SET version = version + 1, value = NULL, expires_at = ?', (time.time(),)
+            )
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'shared': bool(self.shared_path),
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0
+            }
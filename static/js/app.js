@@ -2218,6 +2218,12 @@ function openGenerateScriptModal() {
     modal.show();
 }
 
+// Server settings rendered into <meta> tags of index.html
+function pageSetting(name) {
+    const meta = document.querySelector(`meta[name="${name}"]`);
+    return meta ? meta.content : null;
+}
+
 function generateAIScript() {
     const notes = document.getElementById('aiNotes').value.trim();
     
@@ -2231,15 +2237,23 @@ function generateAIScript() {
     document.getElementById('aiScriptStep').style.display = 'none';
     document.getElementById('aiLoadingStep').style.display = 'block';
     
-    // Call the API
-    fetch('/api/generate-script', {
+    // Call the API - streams the script as it is written when the server's workers allow it,
+    // otherwise starts a background job and polls it
+    const streaming = pageSetting('script-streaming') === 'true';
+    fetch(streaming ? '/api/generate-script/stream' : '/api/generate-script', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
         body: JSON.stringify({ notes: notes })
     })
-    .then(response => response.json())
+    .then(response => {
+        const contentType = response.headers.get('Content-Type') || '';
+        if (contentType.startsWith('text/event-stream')) {
+            return readScriptStream(response);
+        }
+        return response.json().then(data => data.mode === 'job' ? pollScriptJob(data.status_url) : data);
+    })
     .then(data => {
         if (data.success) {
             if (data.mode === 'local') {
@@ -2272,6 +2286,80 @@ function generateAIScript() {
     });
 }
 
+// Render a streamed script as it arrives; resolves with the final payload
+async function readScriptStream(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const contentField = document.getElementById('generatedScriptContent');
+    const titleField = document.getElementById('generatedScriptTitle');
+    let buffer = '';
+    let started = false;
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let eventName = 'message';
+            let eventData = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) {
+                    eventName = line.slice(7);
+                } else if (line.startsWith('data: ')) {
+                    eventData += line.slice(6);
+                }
+            });
+            const payload = eventData ? JSON.parse(eventData) : {};
+            
+            if (eventName === 'token') {
+                if (!started) {
+                    // First words are here - show the script step and fill it in as we go
+                    started = true;
+                    contentField.value = '';
+                    document.getElementById('aiNotesStep').style.display = 'none';
+                    document.getElementById('aiScriptStep').style.display = 'block';
+                    document.getElementById('aiLoadingStep').style.display = 'none';
+                }
+                contentField.value += payload.text;
+                contentField.scrollTop = contentField.scrollHeight;
+            } else if (eventName === 'title') {
+                titleField.value = payload.title;
+            } else if (eventName === 'done' || eventName === 'error') {
+                return payload;
+            }
+        }
+    }
+    
+    return { success: false, error: 'Script stream ended unexpectedly' };
+}
+
+// Poll a background script generation job until it has finished
+async function pollScriptJob(statusUrl) {
+    // A little past the server's SCRIPT_JOB_TIMEOUT, so its timed-out result (the external-tool prompt) arrives
+    const jobTimeout = parseInt(pageSetting('script-job-timeout'), 10) || 180;
+    const deadline = Date.now() + (jobTimeout + 10) * 1000;
+    let delay = 500;
+    
+    while (Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, delay));
+        const response = await fetch(statusUrl);
+        const data = await response.json();
+        if (response.status !== 202) {
+            return data;
+        }
+        delay = Math.min(delay * 1.5, 2000);
+    }
+    
+    return { success: false, error: 'Script generation timed out' };
+}
+
 function showExternalAIPrompt(prompt, userNotes) {
     // Create the external AI prompt step
     const modalBody = document.querySelector('#generateScriptModal .modal-body');
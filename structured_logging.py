@@ -0,0 +1,142 @@
+"""
+Logging that never writes to disk on the calling thread.
+
+QueueLogging installs one QueueHandler on the root logger. It only merges
+the message arguments and puts the record on a bounded in-memory queue, and
+a single background QueueListener thread writes the records to the real
+handlers (a rotating file and the console). If the disk stalls long enough
+to fill the queue, new records are dropped and counted instead of blocking
+requests, and a warning with the count is logged once there is room again.
+JsonFormatter renders one JSON object per line, including any `extra=`
+fields such as request IDs and timings.
+
+A forked child (a gunicorn worker started from a preloaded app) does not
+inherit the listener thread, so it gets a fresh queue and listener.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue as queue_module
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` or a filter
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, extra fields and any traceback"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        if record.stack_info:
+            entry['stack_info'] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Add fields from `context()` (e.g. the current request ID) to every record that lacks them"""
+
+    def __init__(self, context):
+        super().__init__()
+        self.context = context
+
+    def filter(self, record):
+        for key, value in self.context().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        """Drop the record rather than block when the listener has fallen behind"""
+        try:
+            self.queue.put_nowait(record)
+        except queue_module.Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            warning = logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': f'Dropped {dropped} log records: the log queue was full'})
+            try:
+                self.queue.put_nowait(self.prepare(warning))
+            except queue_module.Full:
+                self.dropped += dropped
+
+    def prepare(self, record):
+        """
+        Merge the message arguments now, since they may change once the call
+        returns, but leave formatting to the listener's handlers. Unlike the
+        stdlib version the traceback stays in exc_text rather than being
+        folded into the message, so JSON output keeps it as a separate field.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class QueueLogging:
+    """Root QueueHandler plus the listener thread that feeds `handlers`"""
+
+    def __init__(self, handlers, level=logging.INFO, filters=(), max_queued=10000):
+        self.max_queued = max_queued
+        self.queue = queue_module.Queue(max_queued)
+        self.handlers = list(handlers)
+        self.handler = QueueHandler(self.queue)
+        for log_filter in filters:
+            self.handler.addFilter(log_filter)
+        self.level = level
+        self.listener = None
+
+    def start(self):
+        root = logging.getLogger()
+        root.setLevel(self.level)
+        root.addHandler(self.handler)
+        self._start_listener()
+        atexit.register(self.stop)
+        os.register_at_fork(after_in_child=self._restart_in_child)
+        return self
+
+    def _start_listener(self):
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def _restart_in_child(self):
+        # Records queued before the fork are the parent's to write, and the
+        # inherited queue's lock may have been held by a thread that no longer exists
+        self.queue = self.handler.queue = queue_module.Queue(self.max_queued)
+        self._start_listener()
+
+    def stop(self):
+        """Write out everything queued so far and stop the listener"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
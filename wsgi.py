@@ -6,8 +6,9 @@ path = '/home/willtroppe/callrep'
 if path not in sys.path:
     sys.path.append(path)
 
-# Import the Flask app
-from app import app as application
+# Build the Flask app
+from app import create_app
+application = create_app()
 
 # For debugging
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+"""
+Compact ZIP -> representative index for suggestion lookups.
+
+The index is a single binary file that is opened with mmap, so every worker
+on the host shares one copy through the page cache and a lookup never
+touches the database. Layout (native byte order, 4-byte unsigned ints):
+
+    header        magic, byte-order check, section counts and blob sizes
+    keys          sorted ZIP keys (ZIP5 << 14 | plus4, or | 0x3FFF for a ZIP5)
+    offsets       key i owns entries offsets[i] .. offsets[i + 1]
+    entry_ids     suggestion id of each entry
+    entry_records record index of each entry
+    entry_times   timestamp index of each entry's created_at
+    phone_offs    entry i's phones are phones phone_offs[i] .. phone_offs[i + 1]
+    phone_ids     id of each phone, in the order of its record's phone_numbers
+    phone_times   timestamp index of each phone's created_at
+    record_offs   record j is blob[record_offs[j] .. record_offs[j + 1]]
+    time_offs     timestamp t is times[time_offs[t] .. time_offs[t + 1]]
+    blob          JSON representative records, deduplicated
+    times         created_at strings, deduplicated (bulk loads share a handful)
+
+Sorting ZIP+4 keys next to their ZIP5 lets a ZIP+4 lookup fall back to the
+5-digit code when there is no exact match. Files are rebuilt into a
+temporary file and renamed into place, so open maps keep reading the old
+copy until their owner notices the new one.
+"""
+
+import array
+import bisect
+import functools
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+
+MAGIC = b'ZIPIDX02'
+BYTE_ORDER_CHECK = 0x01020304
+HEADER = struct.Struct('=8s8I')
+PLUS4_BITS = 14
+NO_PLUS4 = (1 << PLUS4_BITS) - 1
+ZIP_PATTERN = re.compile(r'^(\d{5})(?:-(\d{4}))?$')
+NO_TIME = 0xFFFFFFFF  # created_at is None
+
+# Per-row fields that are kept out of the shared records and stored per entry
+ROW_FIELDS = ('id', 'zip_code', 'created_at')
+PHONE_ROW_FIELDS = ('id', 'representative_suggestion_id', 'created_at')
+
+
+def zip_key(zip5, plus4=None):
+    """Sortable integer key for a ZIP5 or ZIP+4 code"""
+    return (int(zip5) << PLUS4_BITS) | (NO_PLUS4 if plus4 is None else int(plus4))
+
+
+def parse_zip(zip_code):
+    """Split a ZIP5 or ZIP+4 string into (zip5, plus4); None if malformed"""
+    match = ZIP_PATTERN.match(str(zip_code).strip())
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
+def format_key(key):
+    zip5 = f'{key >> PLUS4_BITS:05d}'
+    plus4 = key & NO_PLUS4
+    return zip5 if plus4 == NO_PLUS4 else f'{zip5}-{plus4:04d}'
+
+
+def representative_record(suggestion):
+    """Shared part of a suggestion dict (RepresentativeSuggestion.to_dict())"""
+    record = {key: value for key, value in suggestion.items() if key not in ROW_FIELDS}
+    record['phone_numbers'] = [
+        {key: value for key, value in phone.items() if key not in PHONE_ROW_FIELDS}
+        for phone in suggestion.get('phone_numbers', [])
+    ]
+    return record
+
+
+def build(path, suggestions):
+    """
+    Write an index for suggestion dicts to path, replacing any existing file.
+    Returns (written, skipped) counts; suggestions with malformed ZIPs are skipped.
+    """
+    entries = []
+    records = {}
+    times = {}
+    skipped = 0
+
+    def time_index(value):
+        return NO_TIME if value is None else times.setdefault(value.encode('utf-8'), len(times))
+
+    for suggestion in suggestions:
+        parsed = parse_zip(suggestion.get('zip_code', ''))
+        if parsed is None:
+            skipped += 1
+            continue
+        body = json.dumps(representative_record(suggestion), separators=(',', ':')).encode('utf-8')
+        record = records.setdefault(body, len(records))
+        phones = tuple((phone['id'], time_index(phone.get('created_at')))
+                       for phone in suggestion.get('phone_numbers', []))
+        entries.append((zip_key(*parsed), suggestion['id'], record,
+                        time_index(suggestion.get('created_at')), phones))
+    entries.sort()
+
+    keys = array.array('I')
+    offsets = array.array('I')
+    for position, (key, *_) in enumerate(entries):
+        if not keys or keys[-1] != key:
+            keys.append(key)
+            offsets.append(position)
+    offsets.append(len(entries))
+    entry_ids = array.array('I', (entry[1] for entry in entries))
+    entry_records = array.array('I', (entry[2] for entry in entries))
+    entry_times = array.array('I', (entry[3] for entry in entries))
+    phone_offsets = array.array('I', [0])
+    phone_ids = array.array('I')
+    phone_times = array.array('I')
+    for entry in entries:
+        for phone_id, phone_time in entry[4]:
+            phone_ids.append(phone_id)
+            phone_times.append(phone_time)
+        phone_offsets.append(len(phone_ids))
+
+    record_offsets = array.array('I', [0])
+    for body in records:
+        record_offsets.append(record_offsets[-1] + len(body))
+    time_offsets = array.array('I', [0])
+    for value in times:
+        time_offsets.append(time_offsets[-1] + len(value))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.suggestion_index-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, BYTE_ORDER_CHECK, len(keys), len(entries), len(records),
+                                record_offsets[-1], len(phone_ids), len(times), time_offsets[-1]))
+            for section in (keys, offsets, entry_ids, entry_records, entry_times, phone_offsets,
+                            phone_ids, phone_times, record_offsets, time_offsets):
+                section.tofile(f)
+            for body in records:
+                f.write(body)
+            for value in times:
+                f.write(value)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(entries), skipped
+
+
+class ZipIndex:
+    """Read-only view of an index file"""
+
+    def __init__(self, path, record_cache_size=4096):
+        self.path = path
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Identifies the file this map was opened from, to detect rebuilds
+        self.signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a suggestion index")
+        magic, check, key_count, entry_count, record_count, blob_size, phone_count, time_count, times_size = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC or check != BYTE_ORDER_CHECK:
+            raise ValueError(f"{path} is not a suggestion index for this platform (or was built by an older version)")
+
+        view = memoryview(self._map)
+        position = HEADER.size
+        sections = []
+        for count in (key_count, key_count + 1, entry_count, entry_count, entry_count, entry_count + 1,
+                      phone_count, phone_count, record_count + 1, time_count + 1):
+            sections.append(view[position:position + 4 * count].cast('I'))
+            position += 4 * count
+        (self._keys, self._offsets, self._entry_ids, self._entry_records, self._entry_times,
+         self._phone_offsets, self._phone_ids, self._phone_times, self._record_offsets, self._time_offsets) = sections
+        self._blob = view[position:position + blob_size]
+        position += blob_size
+        self._times = view[position:position + times_size]
+        self.section_bytes = {
+            'keys': self._keys.nbytes,
+            'offsets': self._offsets.nbytes,
+            'entries': self._entry_ids.nbytes + self._entry_records.nbytes + self._entry_times.nbytes,
+            'phones': self._phone_offsets.nbytes + self._phone_ids.nbytes + self._phone_times.nbytes,
+            'record_offsets': self._record_offsets.nbytes,
+            'records': blob_size,
+            'timestamps': self._time_offsets.nbytes + times_size
+        }
+        # Records are shared by many zips (a state's senators), so decoded ones are kept
+        self._record = functools.lru_cache(maxsize=record_cache_size)(self._decode_record)
+        self._time = functools.lru_cache(maxsize=record_cache_size)(self._decode_time)
+
+    def _decode_record(self, record):
+        return json.loads(bytes(self._blob[self._record_offsets[record]:self._record_offsets[record + 1]]))
+
+    def _decode_time(self, index):
+        if index == NO_TIME:
+            return None
+        return bytes(self._times[self._time_offsets[index]:self._time_offsets[index + 1]]).decode('utf-8')
+
+    def _find(self, key):
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return position
+        return None
+
+    def lookup(self, zip_code):
+        """
+        Suggestion dicts (as RepresentativeSuggestion.to_dict()) for a ZIP5 or
+        ZIP+4 code. A ZIP+4 without an exact entry falls back to its 5-digit
+        code. Returns [] when nothing matches.
+        """
+        parsed = parse_zip(zip_code)
+        if parsed is None:
+            return []
+        zip5, plus4 = parsed
+        position = None
+        if plus4 is not None:
+            position = self._find(zip_key(zip5, plus4))
+        if position is None:
+            position = self._find(zip_key(zip5))
+        if position is None:
+            return []
+
+        matched_zip = format_key(self._keys[position])
+        results = []
+        for entry in range(self._offsets[position], self._offsets[position + 1]):
+            record = self._record(self._entry_records[entry])
+            suggestion = {'id': self._entry_ids[entry], 'zip_code': matched_zip}
+            suggestion.update(record)
+            # The decoded record is shared between lookups, so its phones are copied
+            first_phone = self._phone_offsets[entry]
+            suggestion['phone_numbers'] = [
+                {'id': self._phone_ids[first_phone + n], **phone,
+                 'created_at': self._time(self._phone_times[first_phone + n])}
+                for n, phone in enumerate(record['phone_numbers'])
+            ]
+            suggestion['created_at'] = self._time(self._entry_times[entry])
+            results.append(suggestion)
+        return results
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'zip_codes': len(self._keys),
+            'suggestions': len(self._entry_ids),
+            'records': len(self._record_offsets) - 1,
+            'bytes': len(self._map),
+            'section_bytes': self.section_bytes
+        }